@@ -0,0 +1,526 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+End-to-end latency benchmark of the HTTP API.
+
+Starts the API with the scripted model, the fake Places API and the fake
+Airbnb MCP server, then drives /chat, /chat/stream and /mcp-airbnb with
+concurrent multi-turn conversations from eval/data and the fake model scripts.
+Reports throughput, latency and time-to-first-token percentiles, and the
+memory of each worker, and writes them as JSON to compare builds:
+
+    python -m benchmarks.http_api --workers 2 --concurrency 16 --output results.json
+    python -m benchmarks.http_api --baseline results.json
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import datetime
+import itertools
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from travel_concierge.shared_libraries.fake_llm import SCRIPT_PATH, load_script
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EVAL_DATA = os.path.join(ROOT, "eval", "data")
+AIRBNB_SCRIPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "airbnb_script.json")
+# The profile the recorded in-trip and pre-trip conversations were run against
+SEATTLE_PROFILE = "itinerary_seattle_example"
+
+
+@dataclasses.dataclass(frozen=True)
+class Scenario:
+    """A scripted conversation, replayed turn by turn in one session."""
+
+    name: str
+    messages: List[str]
+    profile_id: Optional[str] = None
+
+
+def _scenario(name: str, path: str, profile_id: Optional[str] = None) -> Scenario:
+    return Scenario(name, [turn["user"] for turn in load_script(path).turns.values()], profile_id)
+
+
+def load_scenarios() -> Dict[str, Scenario]:
+    """Returns the benchmark conversations by name; their scripts are what the fake model replays."""
+    return {
+        scenario.name: scenario
+        for scenario in (
+            _scenario("inspiration", os.path.join(EVAL_DATA, "inspire.test.json")),
+            _scenario("planning_booking", SCRIPT_PATH),
+            _scenario("pre_trip", os.path.join(EVAL_DATA, "pretrip.test.json"), SEATTLE_PROFILE),
+            _scenario("in_trip", os.path.join(EVAL_DATA, "intrip.test.json"), SEATTLE_PROFILE),
+            _scenario("airbnb", AIRBNB_SCRIPT_PATH),
+        )
+    }
+
+
+SCRIPTS = [
+    SCRIPT_PATH,
+    AIRBNB_SCRIPT_PATH,
+    os.path.join(EVAL_DATA, "inspire.test.json"),
+    os.path.join(EVAL_DATA, "pretrip.test.json"),
+    os.path.join(EVAL_DATA, "intrip.test.json"),
+]
+
+# The scenarios each endpoint is driven with by default
+ENDPOINT_SCENARIOS = {
+    "chat": ["inspiration", "planning_booking", "pre_trip", "in_trip"],
+    "chat/stream": ["inspiration", "planning_booking", "pre_trip", "in_trip"],
+    "mcp-airbnb": ["airbnb"],
+    "mcp-airbnb/stream": ["airbnb"],
+}
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """The q-th percentile (0-100) of `values`, interpolating between ranks; None if empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    """Count, mean, p50/p95/p99 and max of latencies in seconds."""
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else None,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else None,
+    }
+
+
+@dataclasses.dataclass
+class TurnResult:
+    scenario: str
+    latency: float
+    ttft: Optional[float] = None
+    error: Optional[str] = None
+
+
+async def run_turn(
+    client: httpx.AsyncClient, endpoint: str, scenario: Scenario, message: str, ids: Dict[str, str]
+) -> TurnResult:
+    """Sends one message, continuing the conversation in `ids`, and times it."""
+    body = {"message": message, "profile_id": scenario.profile_id, **ids}
+    started = time.perf_counter()
+    try:
+        if not endpoint.endswith("/stream"):
+            response = await client.post(f"/{endpoint}", json=body)
+            latency = time.perf_counter() - started
+            if response.status_code != 200:
+                return TurnResult(scenario.name, latency, error=f"HTTP {response.status_code}")
+            data = response.json()
+            ids.update(user_id=data["user_id"], session_id=data["session_id"])
+            return TurnResult(scenario.name, latency)
+
+        ttft, error = None, None
+        async with client.stream("POST", f"/{endpoint}", params={"format": "ndjson"}, json=body) as response:
+            if response.status_code != 200:
+                return TurnResult(scenario.name, time.perf_counter() - started, error=f"HTTP {response.status_code}")
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                payload = json.loads(line)
+                if payload["type"] == "text" and ttft is None:
+                    ttft = time.perf_counter() - started
+                elif payload["type"] == "done":
+                    ids["session_id"] = payload["session_id"]
+                elif payload["type"] == "error":
+                    error = payload["detail"]
+        return TurnResult(scenario.name, time.perf_counter() - started, ttft, error)
+    except httpx.HTTPError as e:
+        return TurnResult(scenario.name, time.perf_counter() - started, error=f"{type(e).__name__}: {e}")
+
+
+async def run_conversation(client: httpx.AsyncClient, endpoint: str, scenario: Scenario) -> List[TurnResult]:
+    """Replays a scenario in a new session, stopping at the first failed turn."""
+    # Streaming endpoints only return the session, so the user is chosen up front.
+    ids = {"user_id": f"bench_{os.urandom(4).hex()}"}
+    results = []
+    for message in scenario.messages:
+        result = await run_turn(client, endpoint, scenario, message, ids)
+        results.append(result)
+        if result.error:
+            break
+    return results
+
+
+async def run_phase(
+    base_url: str,
+    endpoint: str,
+    scenarios: List[Scenario],
+    conversations: int,
+    concurrency: int,
+    warmup: int = 1,
+    timeout: float = 120,
+) -> Dict[str, Any]:
+    """Runs `conversations` conversations, `concurrency` at a time, cycling through `scenarios`."""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        for scenario in scenarios[:warmup] if warmup else []:
+            await run_conversation(client, endpoint, scenario)
+
+        queue = itertools.islice(itertools.cycle(scenarios), conversations)
+        results: List[TurnResult] = []
+
+        async def user():
+            for scenario in queue:
+                results.extend(await run_conversation(client, endpoint, scenario))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    def report(turns: List[TurnResult]) -> Dict[str, Any]:
+        ok = [turn for turn in turns if not turn.error]
+        return {
+            "turns": len(turns),
+            "errors": len(turns) - len(ok),
+            "latency": summarize([turn.latency for turn in ok]),
+            "ttft": summarize([turn.ttft for turn in ok if turn.ttft is not None]),
+        }
+
+    errors = sorted({turn.error for turn in results if turn.error})
+    return {
+        "endpoint": endpoint,
+        "conversations": conversations,
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "throughput": len([turn for turn in results if not turn.error]) / elapsed if elapsed else None,
+        **report(results),
+        "scenarios": {
+            scenario.name: report([turn for turn in results if turn.scenario == scenario.name])
+            for scenario in scenarios
+        },
+        "error_samples": errors[:5],
+    }
+
+
+def _proc_children() -> Dict[int, List[int]]:
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as file:
+                ppid = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def _rss_mb(pid: int) -> Optional[float]:
+    try:
+        with open(f"/proc/{pid}/status") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _cmdline(pid: int) -> bytes:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as file:
+            return file.read()
+    except OSError:
+        return b""
+
+
+def worker_rss(server_pid: int) -> Dict[int, Dict[str, float]]:
+    """
+    The resident memory in MB of each worker of the server, Linux only.
+
+    Workers are the server's children forked (gunicorn) or spawned (uvicorn)
+    as workers, or the server itself if it has none; `children_rss_mb` is the
+    memory of a worker's own subprocesses, e.g. MCP servers.
+    """
+    tree = _proc_children()
+    server_cmdline = _cmdline(server_pid)
+    workers = [
+        pid for pid in tree.get(server_pid, [])
+        if _cmdline(pid) == server_cmdline or b"multiprocessing.spawn" in _cmdline(pid)
+    ] or [server_pid]
+    usage = {}
+    for pid in workers:
+        rss = _rss_mb(pid)
+        if rss is None:
+            continue
+        descendants, stack = 0.0, list(tree.get(pid, []))
+        while stack:
+            child = stack.pop()
+            descendants += _rss_mb(child) or 0.0
+            stack.extend(tree.get(child, []))
+        usage[pid] = {"rss_mb": rss, "children_rss_mb": descendants}
+    return usage
+
+
+class RssSampler:
+    """Samples worker memory in the background, keeping each worker's peak."""
+
+    def __init__(self, server_pid: Optional[int], interval: float = 0.5):
+        self.server_pid = server_pid
+        self.interval = interval
+        self.peak: Dict[int, Dict[str, float]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def sample(self):
+        if self.server_pid is None or not os.path.isdir("/proc"):
+            return
+        for pid, usage in worker_rss(self.server_pid).items():
+            peak = self.peak.setdefault(pid, dict(usage))
+            for key, value in usage.items():
+                peak[key] = max(peak[key], value)
+
+    async def _run(self):
+        while True:
+            self.sample()
+            await asyncio.sleep(self.interval)
+
+    async def __aenter__(self) -> "RssSampler":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self.sample()
+
+    def report(self) -> Dict[str, Any]:
+        workers = [{"pid": pid, **usage} for pid, usage in sorted(self.peak.items())]
+        return {"workers": workers, "peak_rss_mb": max((worker["rss_mb"] for worker in workers), default=None)}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Process:
+    """A stand-in or the API under test, run as a subprocess until it answers on `ready_path`."""
+
+    def __init__(self, name: str, args: List[str], port: int, env: Dict[str, str], ready_path: str = "/"):
+        self.name = name
+        self.args = args
+        self.port = port
+        self.env = env
+        self.ready_path = ready_path
+        self.popen: Optional[subprocess.Popen] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self, timeout: float = 120) -> "Process":
+        self.popen = subprocess.Popen(self.args, env=self.env, cwd=ROOT)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.popen.poll() is not None:
+                raise RuntimeError(f"{self.name} exited with {self.popen.returncode}")
+            try:
+                if httpx.get(self.base_url + self.ready_path, timeout=1).status_code < 500:
+                    return self
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        self.stop()
+        raise RuntimeError(f"{self.name} did not start within {timeout}s")
+
+    def stop(self):
+        if self.popen is not None and self.popen.poll() is None:
+            self.popen.terminate()
+            try:
+                self.popen.wait(30)
+            except subprocess.TimeoutExpired:
+                self.popen.kill()
+
+
+def stand_in_env(args: argparse.Namespace, places_url: str) -> Dict[str, str]:
+    """The environment running the API on the scripted model and the local stand-ins."""
+    return {
+        **os.environ,
+        "TRAVEL_CONCIERGE_MODEL": "fake",
+        "FAKE_LLM_SCRIPTS": os.pathsep.join(SCRIPTS),
+        "FAKE_LLM_FIRST_TOKEN_LATENCY": str(args.first_token_latency),
+        "FAKE_LLM_TOKEN_LATENCY": str(args.token_latency),
+        "PLACES_BASE_URL": places_url,
+        "GOOGLE_PLACES_API_KEY": os.getenv("GOOGLE_PLACES_API_KEY", "fake"),
+        "MCP_AIRBNB_COMMAND": f"{sys.executable} -m travel_concierge.tools.fake_airbnb_mcp",
+        "FAKE_AIRBNB_LATENCY": str(args.tool_latency),
+        "MCP_POOL_SIZE": str(args.mcp_pool_size),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(args: argparse.Namespace, base_url: str, server_pid: Optional[int]) -> Dict[str, Any]:
+    scenarios = load_scenarios()
+    phases = []
+    for endpoint in args.endpoints:
+        names = args.scenarios or ENDPOINT_SCENARIOS[endpoint]
+        async with RssSampler(server_pid) as sampler:
+            phase = await run_phase(
+                base_url,
+                endpoint,
+                [scenarios[name] for name in names],
+                args.conversations,
+                args.concurrency,
+                args.warmup,
+            )
+        phase["memory"] = sampler.report()
+        phases.append(phase)
+        print(format_phase(phase), flush=True)
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "url": base_url,
+            "workers": args.workers,
+            "first_token_latency": args.first_token_latency,
+            "token_latency": args.token_latency,
+            "tool_latency": args.tool_latency,
+        },
+        "phases": phases,
+    }
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.0f}ms"
+
+
+def format_phase(phase: Dict[str, Any]) -> str:
+    latency, ttft = phase["latency"], phase["ttft"]
+    lines = [
+        f"/{phase['endpoint']}: {phase['turns']} turns, {phase['errors']} errors, "
+        f"{phase['throughput'] or 0:.1f} turns/s, "
+        f"latency p50 {_ms(latency['p50'])} p95 {_ms(latency['p95'])} p99 {_ms(latency['p99'])}, "
+        f"ttft p50 {_ms(ttft['p50'])} p95 {_ms(ttft['p95'])}, "
+        f"peak worker RSS {phase['memory']['peak_rss_mb'] or 0:.0f}MB"
+    ]
+    for error in phase["error_samples"]:
+        lines.append(f"  error: {error}")
+    return "\n".join(lines)
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Lines comparing the throughput and latency of each endpoint with a baseline run."""
+    before = {phase["endpoint"]: phase for phase in baseline["phases"]}
+    lines = []
+    for phase in results["phases"]:
+        old = before.get(phase["endpoint"])
+        if old is None:
+            continue
+        changes = []
+        for label, new_value, old_value in (
+            ("throughput", phase["throughput"], old["throughput"]),
+            ("p50", phase["latency"]["p50"], old["latency"]["p50"]),
+            ("p95", phase["latency"]["p95"], old["latency"]["p95"]),
+            ("p99", phase["latency"]["p99"], old["latency"]["p99"]),
+            ("ttft p50", phase["ttft"]["p50"], old["ttft"]["p50"]),
+            ("peak RSS", phase["memory"]["peak_rss_mb"], old["memory"]["peak_rss_mb"]),
+        ):
+            if new_value is not None and old_value:
+                changes.append(f"{label} {(new_value - old_value) / old_value:+.1%}")
+        lines.append(f"/{phase['endpoint']} vs {baseline['meta'].get('commit') or 'baseline'}: {', '.join(changes)}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="benchmark a running server instead of starting one on the stand-ins")
+    parser.add_argument("--pid", type=int, help="with --url, the server process whose workers' memory to sample")
+    parser.add_argument("--endpoints", default="chat,chat/stream,mcp-airbnb", type=lambda value: value.split(","))
+    parser.add_argument("--scenarios", type=lambda value: value.split(","), help="default: per endpoint")
+    parser.add_argument("--conversations", type=int, default=40, help="conversations per endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="conversations at once")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed conversations per endpoint first")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--first-token-latency", type=float, default=0.2, help="seconds, of the fake model")
+    parser.add_argument("--token-latency", type=float, default=0.005, help="seconds per token, of the fake model")
+    parser.add_argument("--tool-latency", type=float, default=0.05, help="seconds, of the fake Places and Airbnb APIs")
+    parser.add_argument("--mcp-pool-size", type=int, default=2)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="results JSON of an earlier run to compare with")
+    args = parser.parse_args()
+
+    processes: List[Process] = []
+    try:
+        if args.url:
+            base_url, server_pid = args.url.rstrip("/"), args.pid
+        else:
+            places_port, api_port = free_port(), free_port()
+            places = Process(
+                "fake Places API",
+                [sys.executable, "-m", "travel_concierge.tools.fake_places",
+                 "--port", str(places_port), "--latency", str(args.tool_latency)],
+                places_port,
+                dict(os.environ),
+                ready_path="/_stats",
+            )
+            processes.append(places.start())
+            api = Process(
+                "API server",
+                [sys.executable, "-m", "uvicorn", "travel_concierge.api:app",
+                 "--port", str(api_port), "--workers", str(args.workers), "--log-level", "warning"],
+                api_port,
+                stand_in_env(args, places.base_url),
+            )
+            processes.append(api.start())
+            base_url, server_pid = api.base_url, api.popen.pid
+
+        results = asyncio.run(run_benchmark(args, base_url, server_pid))
+    finally:
+        for process in reversed(processes):
+            process.stop()
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            print("\n".join(compare(results, json.load(file))))
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,7 @@ from absl import app, flags
 from dotenv import load_dotenv
 
 from travel_concierge.agent import root_agent
+from travel_concierge.shared_libraries.agent_registry import AgentRegistry
 
 from google.adk.sessions import VertexAiSessionService
 
@@ -50,6 +51,9 @@ flags.mark_bool_flags_as_mutual_exclusive(["create", "delete", "quicktest"])
 def create(env_vars: dict[str, str]) -> None:
     """Creates a new deployment."""
     print(env_vars)
+    # Fails on duplicate agent names before anything is uploaded.
+    registry = AgentRegistry(root_agent)
+    print(f"Deploying {len(registry)} agents under {registry.root.name}")
     app = AdkApp(
         agent=root_agent,
         enable_tracing=True,
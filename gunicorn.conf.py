@@ -1,26 +1,45 @@
 # Gunicorn configuration file for Render deployment
+import glob
 import multiprocessing
+import os
+import tempfile
 
 # Server socket
 bind = "0.0.0.0:10000"
 backlog = 2048
 
 # Worker processes
-workers = multiprocessing.cpu_count() * 2 + 1
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
 worker_class = "uvicorn.workers.UvicornWorker"
 worker_connections = 1000
 timeout = 30
 keepalive = 2
 
-# Restart workers after this many requests, to help prevent memory leaks
-max_requests = 1000
-max_requests_jitter = 50
-
 # Logging
 accesslog = "-"
 errorlog = "-"
 loglevel = "info"
 
+# Metrics: each worker writes its samples to files in this directory, and /metrics
+# on any worker renders all of them; it must be set before the workers import the app
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "travel-concierge-metrics"))
+
+
+def on_starting(server):
+    """Starts the metrics afresh, without the samples of an earlier run."""
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    os.makedirs(path, exist_ok=True)
+    for name in glob.glob(os.path.join(path, "*.db")):
+        os.remove(name)
+
+
+def child_exit(server, worker):
+    """Drops the live gauges of a worker that exited; its counters and histograms still count."""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
 # Process naming
 proc_name = "travel-concierge-api"
 
@@ -21,10 +21,11 @@ from dotenv import load_dotenv
 from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
-from google.adk.tools.agent_tool import AgentTool
 from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
 from google.genai import types
 from travel_concierge.agent import root_agent
+from travel_concierge.shared_libraries.agent_graph import with_extra_tools
+from travel_concierge.shared_libraries.agent_registry import AgentRegistry
 
 
 load_dotenv()
@@ -43,35 +44,13 @@ async def get_tools_async():
     return tools, exit_stack
 
 
-def find_agent(agent, targat_name):
-    """A convenient function to find an agent from an existing agent graph."""
-    result = None
-    print("Matching...", agent.name)
-    if agent.name == targat_name:
-        return agent
-    for sub_agent in agent.sub_agents:
-        result = find_agent(sub_agent, targat_name)
-        if result:
-            break
-    for tool in agent.tools:
-        if isinstance(tool, AgentTool):
-            result = find_agent(tool.agent, targat_name)
-            if result:
-                break
-    return result
-
-
 async def get_agent_async():
     """Creates an ADK Agent with tools from MCP Server."""
     tools, exit_stack = await get_tools_async()
     print("\nInserting Airbnb MCP tools into Travel-Concierge...")
-    planner = find_agent(root_agent, "planning_agent")
-    if planner:
-        print("FOUND", planner.name)
-        planner.tools.extend(tools)
-    else:
-        print("NOT FOUND")
-    return root_agent, exit_stack
+    registry = AgentRegistry(root_agent)
+    print("FOUND", registry.get("planning_agent").name)
+    return with_extra_tools(registry.root, "planning_agent", tools), exit_stack
 
 
 async def async_main(question):
@@ -0,0 +1,63 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for building tool-extended copies of the agent graph."""
+
+import unittest
+
+from travel_concierge.agent import root_agent
+from travel_concierge.shared_libraries.agent_graph import AgentGraphCache, with_extra_tools
+from travel_concierge.shared_libraries.agent_registry import AgentRegistry
+from travel_concierge.sub_agents.planning.agent import planning_agent
+
+
+def airbnb_search(location: str):
+    """Stands in for an Airbnb MCP tool."""
+    return {"location": location}
+
+
+class FakeToolset:
+    """Stands in for the MCP toolset that owns the tools."""
+
+
+class TestAgentGraph(unittest.TestCase):
+    """Test cases for with_extra_tools and AgentGraphCache."""
+
+    def test_original_tree_is_untouched(self):
+        tool_count = len(planning_agent.tools)
+        graph = with_extra_tools(root_agent, "planning_agent", [airbnb_search])
+
+        self.assertIsNot(graph, root_agent)
+        self.assertEqual(len(planning_agent.tools), tool_count)
+        self.assertIs(planning_agent.parent_agent, root_agent)
+
+        planner = next(a for a in graph.sub_agents if a.name == "planning_agent")
+        self.assertEqual(planner.tools[-1], airbnb_search)
+        self.assertEqual(len(planner.tools), tool_count + 1)
+        self.assertTrue(all(a.parent_agent is graph for a in graph.sub_agents))
+
+    def test_unknown_agent(self):
+        with self.assertRaises(ValueError):
+            with_extra_tools(root_agent, "no_such_agent", [airbnb_search])
+
+    def test_cache_is_keyed_by_toolset(self):
+        cache = AgentGraphCache(AgentRegistry(root_agent), "planning_agent")
+        first, second = FakeToolset(), FakeToolset()
+
+        graph = cache.get(first, [airbnb_search])
+        self.assertIs(cache.get(first, [airbnb_search]), graph)
+        self.assertIsNot(cache.get(second, [airbnb_search]), graph)
+
+        del first
+        self.assertEqual(len(cache), 1)
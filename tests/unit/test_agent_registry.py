@@ -0,0 +1,63 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the agent registry."""
+
+import unittest
+
+from google.adk.agents import Agent
+from google.adk.tools.agent_tool import AgentTool
+
+from travel_concierge.agent import root_agent
+from travel_concierge.shared_libraries.agent_registry import AgentRegistry, DuplicateAgentError
+
+
+class TestAgentRegistry(unittest.TestCase):
+    """Test cases for AgentRegistry."""
+
+    def setUp(self):
+        super().setUp()
+        self.registry = AgentRegistry(root_agent)
+
+    def test_indexes_sub_agents_and_agent_tools(self):
+        self.assertIs(self.registry.get("root_agent"), root_agent)
+        self.assertIn("planning_agent", self.registry)
+        self.assertIn("flight_search_agent", self.registry)
+        self.assertIn("google_search_grounding", self.registry)
+
+    def test_parent_and_agent_tool(self):
+        self.assertIsNone(self.registry.parent("root_agent"))
+        self.assertEqual(self.registry.parent("planning_agent").name, "root_agent")
+        self.assertIsNone(self.registry.agent_tool("planning_agent"))
+
+        tool = self.registry.agent_tool("flight_search_agent")
+        self.assertIsInstance(tool, AgentTool)
+        self.assertEqual(tool.agent.name, "flight_search_agent")
+
+    def test_path_to_root(self):
+        path = [agent.name for agent in self.registry.path_to_root("day_of_agent")]
+        self.assertEqual(path, ["day_of_agent", "in_trip_agent", "root_agent"])
+
+    def test_unknown_agent(self):
+        with self.assertRaises(KeyError):
+            self.registry.get("no_such_agent")
+
+    def test_duplicate_names(self):
+        graph = Agent(
+            name="root",
+            sub_agents=[Agent(name="twin")],
+            tools=[AgentTool(agent=Agent(name="twin"))],
+        )
+        with self.assertRaises(DuplicateAgentError):
+            AgentRegistry(graph)
@@ -0,0 +1,68 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the HTTP API benchmark harness."""
+
+import os
+import unittest
+
+from benchmarks.http_api import SCRIPTS, compare, load_scenarios, percentile, summarize, worker_rss
+from travel_concierge.shared_libraries.fake_llm import load_scripts
+
+
+def phase(endpoint, throughput, p50, rss):
+    latency = {"p50": p50, "p95": p50 * 2, "p99": p50 * 3}
+    return {
+        "endpoint": endpoint,
+        "throughput": throughput,
+        "latency": latency,
+        "ttft": {"p50": None},
+        "memory": {"peak_rss_mb": rss},
+    }
+
+
+class TestBenchmark(unittest.TestCase):
+    """Test cases for the benchmark's scenarios and statistics."""
+
+    def test_percentiles_interpolate(self):
+        values = [0.4, 0.1, 0.3, 0.2, 0.5]
+        self.assertAlmostEqual(percentile(values, 50), 0.3)
+        self.assertAlmostEqual(percentile(values, 95), 0.48)
+        self.assertIsNone(percentile([], 50))
+        self.assertEqual(summarize([]), {"count": 0, "mean": None, "p50": None, "p95": None, "p99": None, "max": None})
+        self.assertAlmostEqual(summarize(values)["mean"], 0.3)
+
+    def test_every_scenario_turn_is_scripted(self):
+        scenarios = load_scenarios()
+        self.assertEqual(set(scenarios), {"inspiration", "planning_booking", "pre_trip", "in_trip", "airbnb"})
+        self.assertEqual(scenarios["in_trip"].profile_id, "itinerary_seattle_example")
+        script = load_scripts(tuple(SCRIPTS))
+        for scenario in scenarios.values():
+            self.assertTrue(scenario.messages)
+            for message in scenario.messages:
+                self.assertIsNotNone(script.find_turn(message), message)
+
+    def test_compare_with_baseline(self):
+        baseline = {"meta": {"commit": "abc123"}, "phases": [phase("chat", 10.0, 0.2, 100.0)]}
+        results = {"phases": [phase("chat", 12.0, 0.1, 110.0), phase("mcp-airbnb", 1.0, 1.0, 1.0)]}
+        self.assertEqual(
+            compare(results, baseline),
+            ["/chat vs abc123: throughput +20.0%, p50 -50.0%, p95 -50.0%, p99 -50.0%, peak RSS +10.0%"],
+        )
+
+    @unittest.skipUnless(os.path.isdir("/proc"), "reads /proc")
+    def test_worker_rss_of_single_process_server(self):
+        usage = worker_rss(os.getpid())
+        self.assertEqual(list(usage), [os.getpid()])
+        self.assertGreater(usage[os.getpid()]["rss_mb"], 0)
@@ -0,0 +1,172 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the scripted stand-in model."""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from google.adk.agents import Agent
+from google.adk.models import LLMRegistry, LlmRequest
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types as genai_types
+
+from travel_concierge.shared_libraries import types
+from travel_concierge.shared_libraries.fake_llm import FakeLlm, _json_schema, load_script, synthesize
+from travel_concierge.shared_libraries.models import MODEL
+from travel_concierge.tools.memory import memorize
+
+EVAL_SET_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "eval", "data", "inspire.test.json")
+
+SCRIPT = {
+    "turns": [
+        {
+            "user": "Find me flights to Seattle",
+            "tool_uses": [
+                {"name": "transfer_to_agent", "args": {"agent_name": "planner"}},
+                {"name": "memorize", "args": {"key": "destination", "value": "Seattle"}},
+                {"name": "flight_search_agent", "args": {"request": "Flights to Seattle"}},
+            ],
+            "final_response": "Here are your flights.",
+        }
+    ],
+    "outputs": {},
+}
+
+
+def user_message(text: str) -> genai_types.Content:
+    return genai_types.Content(role="user", parts=[genai_types.Part(text=text)])
+
+
+class TestFakeLlm(unittest.IsolatedAsyncioTestCase):
+    """Test cases for FakeLlm and its scripts."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.script_path = os.path.join(self.dir.name, "script.json")
+        with open(self.script_path, "w") as file:
+            json.dump(SCRIPT, file)
+        self.model = FakeLlm(model="fake", scripts=[self.script_path])
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_fake_model_names_resolve(self):
+        self.assertIs(LLMRegistry.resolve("fake"), FakeLlm)
+        self.assertIs(LLMRegistry.resolve("fake/gemini-2.5-flash"), FakeLlm)
+        self.assertEqual(MODEL, os.getenv("TRAVEL_CONCIERGE_MODEL", "gemini-2.5-flash"))
+
+    def test_synthesized_outputs_are_valid(self):
+        for schema in (
+            types.DestinationIdeas,
+            types.POISuggestions,
+            types.FlightsSelection,
+            types.SeatsSelection,
+            types.HotelsSelection,
+            types.RoomsSelection,
+            types.Itinerary,
+            types.PackingList,
+        ):
+            output = synthesize(_json_schema(schema))
+            schema.model_validate_json(json.dumps(output))
+
+        itinerary = synthesize(_json_schema(types.Itinerary))
+        self.assertEqual(itinerary["start_date"], "2025-06-15")
+        self.assertEqual(itinerary["days"][0]["events"][0]["event_type"], "flight")
+        self.assertEqual(itinerary["days"][0]["events"][0]["departure_time"], "16:00")
+
+    def test_loads_eval_sets(self):
+        turn = load_script(EVAL_SET_PATH).find_turn("  inspire me about the Americas")
+        self.assertEqual(
+            [tool_use["name"] for tool_use in turn["tool_uses"]],
+            ["transfer_to_agent", "place_agent"],
+        )
+        self.assertTrue(turn["final_response"].startswith("Okay, I have a few ideas"))
+
+    async def test_replays_a_turn_across_agents(self):
+        flight_search_agent = Agent(
+            model=self.model,
+            name="flight_search_agent",
+            instruction="",
+            output_schema=types.FlightsSelection,
+            output_key="flight",
+        )
+        planner = Agent(
+            model=self.model,
+            name="planner",
+            instruction="",
+            tools=[AgentTool(agent=flight_search_agent), memorize],
+        )
+        root = Agent(model=self.model, name="root", instruction="", sub_agents=[planner])
+        session_service = InMemorySessionService()
+        session = await session_service.create_session(app_name="Travel_Concierge", user_id="traveler0115")
+        runner = Runner(agent=root, app_name="Travel_Concierge", session_service=session_service)
+
+        calls, texts = [], []
+        async for event in runner.run_async(
+            user_id="traveler0115", session_id=session.id, new_message=user_message("find me flights  to Seattle")
+        ):
+            for part in event.content.parts if event.content else []:
+                if part.function_call:
+                    calls.append((event.author, part.function_call.name))
+                elif part.text:
+                    texts.append((event.author, part.text))
+
+        self.assertEqual(
+            calls,
+            [("root", "transfer_to_agent"), ("planner", "memorize"), ("planner", "flight_search_agent")],
+        )
+        self.assertEqual(texts, [("planner", "Here are your flights.")])
+        session = await session_service.get_session(
+            app_name="Travel_Concierge", user_id="traveler0115", session_id=session.id
+        )
+        self.assertEqual(session.state["destination"], "Seattle")
+        types.FlightsSelection.model_validate(session.state["flight"])
+
+    async def test_unscripted_message_gets_default_response(self):
+        request = LlmRequest(
+            contents=[user_message("What's the weather like?")],
+            config=genai_types.GenerateContentConfig(system_instruction='Your internal name is "root".'),
+        )
+        responses = [response async for response in self.model.generate_content_async(request)]
+        self.assertEqual(len(responses), 1)
+        self.assertEqual(responses[0].content.parts[0].text, "I'm root. How can I help with your trip?")
+
+    async def test_streams_with_token_latency(self):
+        model = FakeLlm(model="fake", scripts=[self.script_path], first_token_latency=0.05, token_latency=0.01)
+        request = LlmRequest(
+            contents=[user_message("Find me flights to Seattle")],
+            config=genai_types.GenerateContentConfig(system_instruction='Your internal name is "planner".'),
+        )
+
+        started = time.perf_counter()
+        responses = [response async for response in model.generate_content_async(request, stream=True)]
+        elapsed = time.perf_counter() - started
+
+        partials, final = responses[:-1], responses[-1]
+        self.assertTrue(partials)
+        self.assertTrue(all(response.partial for response in partials))
+        self.assertEqual("".join(response.content.parts[0].text for response in partials), "Here are your flights.")
+        self.assertFalse(final.partial)
+        self.assertEqual(final.usage_metadata.candidates_token_count, 5)
+        self.assertGreaterEqual(elapsed, 0.05 + 0.01 * 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
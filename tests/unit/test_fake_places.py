@@ -0,0 +1,70 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the local stand-in for the Places API."""
+
+import time
+import unittest
+
+import httpx
+
+from travel_concierge.shared_libraries.http_client import ResilientHttpClient
+from travel_concierge.tools.fake_places import FakePlacesConfig, FakePlacesServer
+from travel_concierge.tools.places import PlacesService
+
+
+class TestFakePlacesServer(unittest.TestCase):
+    """Test cases for FakePlacesServer with PlacesService pointed at it."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.config = FakePlacesConfig(seed=7)
+        cls.server = FakePlacesServer(cls.config)
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        super().setUp()
+        self.config.latency = self.config.error_rate = 0.0
+        self.config.synthesize_unknown = True
+        self.service = PlacesService(http=ResilientHttpClient(max_retries=0), base_url=self.server.base_url)
+
+    def test_fixtures_and_photos(self):
+        result = self.service.find_place_from_text("Space Needle, 400 Broad St, Seattle")
+        self.assertEqual(result["place_id"], "fixture-space-needle")
+        self.assertEqual(result["lat"], "47.6205063")
+
+        photo = httpx.get(result["photos"][0])
+        self.assertEqual(photo.headers["content-type"], "image/png")
+
+    def test_unknown_places(self):
+        first = self.service.find_place_from_text("Corner Cafe, Anytown")
+        self.assertTrue(first["place_id"].startswith("synthetic-"))
+        self.assertEqual(self.service.find_place_from_text("Corner Cafe, Anytown"), first)
+
+        self.config.synthesize_unknown = False
+        self.assertEqual(self.service.find_place_from_text("Corner Cafe, Anytown"), {"error": "No places found."})
+
+    def test_latency_and_errors(self):
+        httpx.post(f"{self.server.base_url}/_config", json={"latency": 0.1})
+        started = time.monotonic()
+        self.service.find_place_from_text("Eiffel Tower, Paris")
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+
+        self.config.latency, self.config.error_rate = 0.0, 1.0
+        self.assertIn("503", self.service.find_place_from_text("Eiffel Tower, Paris")["error"])
+        self.assertGreaterEqual(httpx.get(f"{self.server.base_url}/_stats").json()["errors"], 1)
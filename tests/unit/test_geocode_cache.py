@@ -0,0 +1,156 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the Places lookup cache."""
+
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from travel_concierge.tools.geocode_cache import NOT_FOUND, GeocodeCache
+from travel_concierge.tools.places import PlacesService
+
+CANDIDATES = {
+    "candidates": [
+        {
+            "place_id": "ChIJ-bfVTh8VkFQRDZLQnmioK9s",
+            "name": "Space Needle",
+            "formatted_address": "400 Broad St, Seattle, WA 98109",
+            "photos": [{"photo_reference": "ref-1"}],
+            "geometry": {"location": {"lat": 47.62, "lng": -122.35}},
+        }
+    ]
+}
+SPACE_NEEDLE = {"place_id": "ChIJ-bfVTh8VkFQRDZLQnmioK9s", "place_name": "Space Needle", "lat": "47.62", "lng": "-122.35"}
+
+
+class FakeClock:
+    """A clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingPlacesService(PlacesService):
+    """PlacesService answering from a dict instead of the Places API."""
+
+    def __init__(self, places, cache):
+        super().__init__(cache=cache)
+        self.places = places
+        self.fetches = 0
+
+    def _fetch_place(self, query):
+        self.fetches += 1
+        return self.places.get(query, dict(NOT_FOUND))
+
+
+class TestGeocodeCache(unittest.TestCase):
+    """Test cases for GeocodeCache."""
+
+    def setUp(self):
+        super().setUp()
+        self.clock = FakeClock()
+
+    def test_repeat_lookups_skip_the_api(self):
+        cache = GeocodeCache(path="", clock=self.clock)
+        service = CountingPlacesService({"Space Needle, Seattle": SPACE_NEEDLE}, cache)
+
+        service.find_place_from_text("Space Needle, Seattle")
+        result = service.find_place_from_text("  space needle,SEATTLE ")
+        self.assertEqual(result, SPACE_NEEDLE)
+        self.assertEqual(service.fetches, 1)
+        self.assertEqual(cache.stats(), {"entries": 1, "misses": 1, "stores": 1, "memory_hits": 1})
+
+    def test_negative_results_expire_sooner(self):
+        cache = GeocodeCache(ttl=100, negative_ttl=10, path="", clock=self.clock)
+        service = CountingPlacesService({"Space Needle, Seattle": SPACE_NEEDLE}, cache)
+
+        self.assertEqual(service.find_place_from_text("Atlantis, Ocean"), NOT_FOUND)
+        service.find_place_from_text("Space Needle, Seattle")
+        self.clock.now += 50
+        service.find_place_from_text("Atlantis, Ocean")
+        service.find_place_from_text("Space Needle, Seattle")
+        self.assertEqual(service.fetches, 3)
+
+    def test_errors_are_not_cached(self):
+        cache = GeocodeCache(path="", clock=self.clock)
+        cache.put("Space Needle, Seattle", {"error": "Error fetching place data: timeout"})
+        self.assertIsNone(cache.get("Space Needle, Seattle"))
+
+    def test_only_zero_results_are_cached_as_not_found(self):
+        cache = GeocodeCache(path="", clock=self.clock)
+        service = PlacesService(cache=cache)
+        answers = {
+            "Atlantis, Ocean": {"candidates": [], "status": "ZERO_RESULTS"},
+            "Space Needle, Seattle": {
+                "candidates": [],
+                "status": "OVER_QUERY_LIMIT",
+                "error_message": "You have exceeded your daily request quota for this API.",
+            },
+        }
+        with mock.patch.object(service, "_fetch_place", side_effect=lambda query: service._parse_place(answers[query])):
+            self.assertEqual(service.find_place_from_text("Atlantis, Ocean"), NOT_FOUND)
+            over_limit = service.find_place_from_text("Space Needle, Seattle")
+
+        self.assertEqual(
+            over_limit,
+            {"error": "Places API status OVER_QUERY_LIMIT: You have exceeded your daily request quota for this API."},
+        )
+        self.assertEqual(cache.get("Atlantis, Ocean", namespace=service.base_url), NOT_FOUND)
+        self.assertIsNone(cache.get("Space Needle, Seattle", namespace=service.base_url))
+
+    def test_lru_and_shared_disk_tier(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "geocodes.db")
+            cache = GeocodeCache(max_entries=1, path=path, clock=self.clock)
+            cache.put("Space Needle, Seattle", SPACE_NEEDLE)
+            cache.put("Machu Picchu, Peru", {"place_id": "ChIJVVVViV-abZERJxqgpA43EDo"})
+            self.assertEqual(cache.stats()["evictions"], 1)
+
+            other_worker = GeocodeCache(path=path, clock=self.clock)
+            self.assertEqual(other_worker.get("Space Needle, Seattle"), SPACE_NEEDLE)
+            self.assertEqual(other_worker.get("Space Needle, Seattle"), SPACE_NEEDLE)
+            self.assertEqual(other_worker.stats()["disk_hits"], 1)
+            self.assertEqual(other_worker.stats()["memory_hits"], 1)
+
+    def test_photo_urls_are_built_on_read(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "geocodes.db")
+            cache = GeocodeCache(path=path, clock=self.clock)
+            service = PlacesService(cache=cache, base_url="https://places.example/api")
+            with mock.patch.dict(os.environ, {"GOOGLE_PLACES_API_KEY": "secret"}):
+                with mock.patch.object(service, "_fetch_place", return_value=service._parse_place(CANDIDATES)):
+                    fetched = service.find_place_from_text("Space Needle, Seattle")
+                cached = service.find_place_from_text("Space Needle, Seattle")
+
+            photo = "https://places.example/api/photo?maxwidth=400&photoreference=ref-1&key=secret"
+            self.assertEqual(fetched["photos"], [photo])
+            self.assertEqual(cached, fetched)
+            (stored,) = sqlite3.connect(path).execute("SELECT result FROM geocodes").fetchone()
+            self.assertNotIn("secret", stored)
+            self.assertEqual(json.loads(stored)["photo_references"], ["ref-1"])
+
+    def test_answers_are_kept_per_base_url(self):
+        cache = GeocodeCache(path="", clock=self.clock)
+        cache.put("Space Needle, Seattle", SPACE_NEEDLE, namespace="https://maps.googleapis.com/maps/api/place")
+        self.assertEqual(
+            cache.get("Space Needle, Seattle", namespace="https://maps.googleapis.com/maps/api/place"), SPACE_NEEDLE
+        )
+        self.assertIsNone(cache.get("Space Needle, Seattle", namespace="http://127.0.0.1:8099"))
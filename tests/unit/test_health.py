@@ -0,0 +1,137 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the readiness checks and request metrics."""
+
+import asyncio
+import os
+import tempfile
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from travel_concierge.shared_libraries import metrics
+from travel_concierge.shared_libraries.health import (
+    ModelCheck,
+    RequestMetricsMiddleware,
+    check_mcp_pool,
+    check_session_store,
+    readiness,
+)
+from travel_concierge.shared_libraries.sqlite_session_service import SqliteSessionService
+from travel_concierge.tools.mcp_pool import MCPToolsetPool
+
+
+class FakeToolset:
+    """Stands in for an MCPToolset backed by a stdio server process."""
+
+    def __init__(self, connection_params):
+        pass
+
+    async def get_tools(self):
+        return ["airbnb_search"]
+
+    async def close(self):
+        pass
+
+
+class TestReadiness(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the readiness checks."""
+
+    async def test_mcp_pool_is_ready_once_started(self):
+        pool = MCPToolsetPool(connection_params=lambda: None, size=2, probe_interval=3600, toolset_factory=FakeToolset)
+        check = check_mcp_pool(pool)
+        self.assertFalse((await check())["ok"])
+
+        await pool.start()
+        try:
+            self.assertEqual(await check(), {"ok": True, "size": 2, "idle": 2, "alive": 2, "respawns": 0})
+            self.assertEqual([server["alive"] for server in pool.servers()], [True, True])
+        finally:
+            await pool.stop()
+
+        self.assertTrue((await check_mcp_pool(MCPToolsetPool(size=0))())["ok"])
+
+    async def test_session_store_is_pinged(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SqliteSessionService(db_path=os.path.join(tmp, "sessions.db"))
+            try:
+                self.assertEqual(await check_session_store(store)(), {"ok": True, "backend": "SqliteSessionService"})
+                self.assertEqual(store.stats()["live_sessions"], 0)
+            finally:
+                await store.close()
+
+    async def test_model_check_reuses_its_result(self):
+        now = [0.0]
+        check = ModelCheck("fake", interval=60, clock=lambda: now[0])
+        first = await check()
+        self.assertEqual(first, {"ok": True, "model": "fake", "remote": False})
+        self.assertIs(await check(), first)
+        now[0] = 61
+        self.assertIsNot(await check(), first)
+
+    async def test_failing_and_slow_checks_make_the_worker_unready(self):
+        async def passing():
+            return {"ok": True}
+
+        async def failing():
+            raise ConnectionError("database is locked")
+
+        async def slow():
+            await asyncio.sleep(10)
+            return {"ok": True}
+
+        ok, results = await readiness({"passing": passing}, timeout=0.05)
+        self.assertTrue(ok)
+
+        ok, results = await readiness({"passing": passing, "failing": failing, "slow": slow}, timeout=0.05)
+        self.assertFalse(ok)
+        self.assertEqual(results["passing"], {"ok": True})
+        self.assertIn("database is locked", results["failing"]["error"])
+        self.assertIn("timed out", results["slow"]["error"])
+
+
+class TestRequestMetricsMiddleware(unittest.TestCase):
+    """Test cases for RequestMetricsMiddleware."""
+
+    def test_counts_requests_by_route_template(self):
+        app = FastAPI()
+        app.add_middleware(RequestMetricsMiddleware)
+
+        @app.get("/trips/{trip_id}")
+        async def trip(trip_id: str):
+            return {"trip_id": trip_id}
+
+        def served(route, status):
+            return metrics.value("travel_concierge_http_requests_total", method="GET", route=route, status=status)
+
+        def timed(route):
+            return metrics.value("travel_concierge_http_request_duration_seconds_count", method="GET", route=route)
+
+        ok, unmatched, timed_ok = served("/trips/{trip_id}", "200"), served("unmatched", "404"), timed("/trips/{trip_id}")
+
+        client = TestClient(app)
+        client.get("/trips/1")
+        client.get("/trips/2")
+        client.get("/nowhere")
+
+        self.assertEqual(served("/trips/{trip_id}", "200"), ok + 2)
+        self.assertEqual(served("unmatched", "404"), unmatched + 1)
+        self.assertEqual(timed("/trips/{trip_id}"), timed_ok + 2)
+        self.assertEqual(metrics.value("travel_concierge_http_requests_in_flight"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the pooled HTTP client used by the Places API wrapper."""
+
+import asyncio
+import threading
+import unittest
+
+import httpx
+
+from travel_concierge.shared_libraries.http_client import CircuitBreaker, CircuitOpenError, ResilientHttpClient
+from travel_concierge.tools.places import PlacesService
+
+PLACES_URL = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
+
+MACHU_PICCHU = {
+    "candidates": [
+        {
+            "place_id": "ChIJVVVViV-abZERJxqgpA43EDo",
+            "name": "Machu Picchu",
+            "formatted_address": "08680, Peru",
+            "geometry": {"location": {"lat": -13.16, "lng": -72.54}},
+        }
+    ]
+}
+
+
+class FakeClock:
+    """A clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ScriptedTransport(httpx.MockTransport):
+    """Answers requests with the given status codes in turn, then with 200."""
+
+    def __init__(self, statuses=(), body=MACHU_PICCHU):
+        self.statuses = list(statuses)
+        self.requests = 0
+        super().__init__(self._handle)
+        self.body = body
+
+    def _handle(self, request):
+        self.requests += 1
+        if self.statuses:
+            status = self.statuses.pop(0)
+            if status == "timeout":
+                raise httpx.ReadTimeout("timed out", request=request)
+            return httpx.Response(status, headers={"Retry-After": "0"})
+        return httpx.Response(200, json=self.body)
+
+
+class StalledTransport(httpx.MockTransport):
+    """Never answers async requests."""
+
+    def __init__(self):
+        super().__init__(self._handle)
+
+    async def _handle(self, request):
+        await asyncio.Event().wait()
+
+
+class TestResilientHttpClient(unittest.IsolatedAsyncioTestCase):
+    """Test cases for ResilientHttpClient and CircuitBreaker."""
+
+    def setUp(self):
+        super().setUp()
+        self.clock = FakeClock()
+
+    def _client(self, transport, threshold=5):
+        return ResilientHttpClient(
+            max_retries=2, backoff=0, breaker=CircuitBreaker(threshold, 30, clock=self.clock), transport=transport
+        )
+
+    def test_retries_rate_limits_and_server_errors(self):
+        transport = ScriptedTransport([429, "timeout"])
+        response = self._client(transport).get(PLACES_URL)
+        self.assertEqual(response.json(), MACHU_PICCHU)
+        self.assertEqual(transport.requests, 3)
+
+    def test_gives_up_after_max_retries(self):
+        transport = ScriptedTransport([503, 503, 503])
+        with self.assertRaises(httpx.HTTPStatusError):
+            self._client(transport).get(PLACES_URL)
+        self.assertEqual(transport.requests, 3)
+
+    def test_client_errors_are_not_retried(self):
+        transport = ScriptedTransport([400])
+        with self.assertRaises(httpx.HTTPStatusError):
+            self._client(transport).get(PLACES_URL)
+        self.assertEqual(transport.requests, 1)
+
+    async def test_breaker_fails_fast_then_recovers(self):
+        transport = ScriptedTransport([503] * 6)
+        client = self._client(transport, threshold=2)
+        for _ in range(2):
+            with self.assertRaises(httpx.HTTPStatusError):
+                await client.aget(PLACES_URL)
+        self.assertEqual(client.breaker.state, "open")
+
+        with self.assertRaises(CircuitOpenError):
+            await client.aget(PLACES_URL)
+        self.assertEqual(transport.requests, 6)
+
+        self.clock.now = 31
+        self.assertEqual(client.breaker.state, "half_open")
+        response = await client.aget(PLACES_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.breaker.state, "closed")
+        await client.aclose()
+
+    async def test_cancelled_requests_do_not_count_against_the_breaker(self):
+        client = self._client(StalledTransport(), threshold=1)
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.aget(PLACES_URL), 0.01)
+        self.assertEqual(client.breaker.failures, 0)
+        self.assertEqual(client.breaker.state, "closed")
+        await client.aclose()
+
+    async def test_one_async_client_per_event_loop(self):
+        client = self._client(ScriptedTransport())
+        await client.aget(PLACES_URL)
+        (own,) = client._async_clients.values()
+
+        other_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=other_loop.run_forever)
+        thread.start()
+        try:
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aget(PLACES_URL), other_loop))
+            self.assertIs(client._async_clients[asyncio.get_running_loop()], own)
+            self.assertEqual(len(client._async_clients), 2)
+            clients = list(client._async_clients.values())
+
+            await client.aclose()
+        finally:
+            other_loop.call_soon_threadsafe(other_loop.stop)
+            thread.join()
+            other_loop.close()
+        self.assertTrue(all(c.is_closed for c in clients))
+        self.assertEqual(client._async_clients, {})
+
+    def test_places_service_reports_errors_without_raising(self):
+        service = PlacesService(http=self._client(ScriptedTransport([503, 503, 503])))
+        self.assertIn("error", service.find_place_from_text("Machu Picchu, Peru"))
+
+        service = PlacesService(http=self._client(ScriptedTransport()))
+        self.assertEqual(service.find_place_from_text("Machu Picchu, Peru")["lat"], "-13.16")
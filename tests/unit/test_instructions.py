@@ -0,0 +1,154 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the memoized instruction providers."""
+
+import copy
+import os
+import unittest
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.events import Event, EventActions
+from google.adk.sessions import InMemorySessionService
+from google.adk.utils.instructions_utils import inject_session_state
+
+from travel_concierge.agent import root_agent
+from travel_concierge.shared_libraries import constants, metrics
+from travel_concierge.shared_libraries.instructions import (
+    memoized_instruction,
+    template_instruction,
+    template_keys,
+)
+from travel_concierge.shared_libraries.layered_session_service import ProfileLayeredSessionService
+from travel_concierge.shared_libraries.state_fingerprints import fingerprint_key
+from travel_concierge.sub_agents.in_trip import prompt as in_trip_prompt
+from travel_concierge.sub_agents.in_trip.tools import transit_coordination
+from travel_concierge.tools.memory import load_scenario
+
+SEATTLE_PROFILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "travel_concierge", "profiles", "itinerary_seattle_example.json"
+)
+
+
+def renders(instruction, result):
+    return metrics.value("travel_concierge_instruction_renders_total", instruction=instruction, result=result)
+
+
+class TestInstructions(unittest.IsolatedAsyncioTestCase):
+    """Test cases for memoized instructions."""
+
+    async def asyncSetUp(self):
+        session_service = InMemorySessionService()
+        state = dict(load_scenario(SEATTLE_PROFILE)["state"])
+        state[constants.ITIN_DATETIME] = "2025-06-15 10:00:00"
+        self.session = await session_service.create_session(
+            app_name="Travel_Concierge", user_id="traveler0115", state=state
+        )
+        self.context = ReadonlyContext(
+            InvocationContext(
+                session_service=session_service,
+                invocation_id="ABCD",
+                agent=root_agent,
+                session=self.session,
+            )
+        )
+
+    def test_template_keys(self):
+        self.assertEqual(
+            template_keys('Trip {origin} to {destination?}, {user:home} {"json": 1} {{origin}} {not a key}'),
+            ("origin", "destination", "user:home"),
+        )
+        self.assertIsNone(template_keys("Notes: {artifact.notes}"))
+        self.assertEqual(template_instruction("No placeholders", "plain"), "No placeholders")
+
+    async def test_template_renders_as_adk_would(self):
+        instruction = template_instruction(in_trip_prompt.TRIP_MONITOR_INSTR, "test_trip_monitor")
+        expected = await inject_session_state(in_trip_prompt.TRIP_MONITOR_INSTR, self.context)
+
+        misses = renders("test_trip_monitor", "miss")
+        hits = renders("test_trip_monitor", "hit")
+        self.assertEqual(await instruction(self.context), expected)
+        self.assertEqual(await instruction(self.context), expected)
+        self.assertEqual(renders("test_trip_monitor", "miss"), misses + 1)
+        self.assertEqual(renders("test_trip_monitor", "hit"), hits + 1)
+
+    async def test_rerenders_when_a_key_changes(self):
+        renders = []
+
+        @memoized_instruction(constants.ITIN_KEY, constants.ITIN_DATETIME)
+        def instruction(readonly_context):
+            renders.append(readonly_context.state[constants.ITIN_DATETIME])
+            return f"Now: {readonly_context.state[constants.ITIN_DATETIME]}"
+
+        state = self.session.state
+        self.assertEqual(await instruction(self.context), "Now: 2025-06-15 10:00:00")
+        state["unrelated"] = "changed"
+        await instruction(self.context)
+        self.assertEqual(len(renders), 1)
+
+        state[constants.ITIN_DATETIME] = "2025-06-16 10:00:00"
+        self.assertEqual(await instruction(self.context), "Now: 2025-06-16 10:00:00")
+        # A copy has the same content, and a changed itinerary written without a fingerprint is hashed.
+        state[constants.ITIN_KEY] = copy.deepcopy(state[constants.ITIN_KEY])
+        await instruction(self.context)
+        self.assertEqual(len(renders), 2)
+        state[constants.ITIN_KEY] = {**state[constants.ITIN_KEY], "trip_name": "Changed"}
+        del state[fingerprint_key(constants.ITIN_KEY)]
+        await instruction(self.context)
+        del state[constants.ITIN_DATETIME]
+        with self.assertRaises(KeyError):
+            await instruction(self.context)
+        self.assertEqual(len(renders), 3)
+
+    async def test_reused_across_turns_by_fingerprint(self):
+        session_service = ProfileLayeredSessionService(InMemorySessionService(), lambda state: {})
+        session = await session_service.create_session(
+            app_name="Travel_Concierge", user_id="traveler0115", state=dict(self.session.state)
+        )
+        instruction = template_instruction("Trip: {itinerary}", "test_fingerprint")
+
+        async def render():
+            # Every turn loads a new copy of the session, as the runner does.
+            loaded = await session_service.get_session(
+                app_name="Travel_Concierge", user_id="traveler0115", session_id=session.id
+            )
+            context = ReadonlyContext(
+                InvocationContext(
+                    session_service=session_service, invocation_id="ABCD", agent=root_agent, session=loaded
+                )
+            )
+            return await instruction(context), loaded
+
+        misses = renders("test_fingerprint", "miss")
+        first, loaded = await render()
+        second, _ = await render()
+        self.assertEqual(second, first)
+        self.assertEqual(renders("test_fingerprint", "miss"), misses + 1)
+
+        changed = {**loaded.state[constants.ITIN_KEY], "trip_name": "Changed"}
+        event = Event(author="user", actions=EventActions(state_delta={constants.ITIN_KEY: changed}))
+        await session_service.append_event(loaded, event)
+        self.assertIn(fingerprint_key(constants.ITIN_KEY), event.actions.state_delta)
+        self.assertIn("Changed", (await render())[0])
+        self.assertEqual(renders("test_fingerprint", "miss"), misses + 2)
+
+    async def test_transit_coordination_is_memoized(self):
+        first = await transit_coordination(self.context)
+        self.assertIn("Visit Pike Place Market", first)
+        self.assertIs(await transit_coordination(self.context), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the profile-layered session service."""
+
+import unittest
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.tools import ToolContext
+
+from travel_concierge.agent import root_agent
+from travel_concierge.shared_libraries import constants
+from travel_concierge.shared_libraries.layered_session_service import ProfileLayeredSessionService
+from travel_concierge.shared_libraries.profile_catalog import profile_catalog
+from travel_concierge.shared_libraries.session_store import BoundedInMemorySessionService
+from travel_concierge.tools.memory import _load_precreated_itinerary, memorize_list, profile_state
+
+
+class TestProfileLayeredSessionService(unittest.IsolatedAsyncioTestCase):
+    """Test cases for ProfileLayeredSessionService."""
+
+    async def asyncSetUp(self):
+        self.store = BoundedInMemorySessionService()
+        self.service = ProfileLayeredSessionService(self.store, profile_state)
+        self.profile = profile_catalog.get("itinerary_seattle_example")
+
+    async def _get(self, session_id):
+        return await self.service.get_session(
+            app_name="travel-concierge", user_id="traveler0115", session_id=session_id
+        )
+
+    def _stored_state(self, session_id):
+        return self.store.sessions["travel-concierge"]["traveler0115"][session_id].state
+
+    async def _run_callback_and_tool(self, session):
+        """Seeds the session and memorizes one value, as a first turn would."""
+        invoc_context = InvocationContext(
+            session_service=self.service,
+            invocation_id="ABCD",
+            agent=root_agent,
+            session=session,
+        )
+        callback_context = CallbackContext(invoc_context)
+        _load_precreated_itinerary(callback_context)
+        await self.service.append_event(
+            session, Event(author="root_agent", actions=callback_context._event_actions)
+        )
+
+        tool_context = ToolContext(invocation_context=invoc_context)
+        memorize_list("likes", "ramen", tool_context)
+        await self.service.append_event(
+            session, Event(author="root_agent", actions=tool_context.actions)
+        )
+
+    async def test_stores_only_the_overlay(self):
+        session = await self.service.create_session(
+            app_name="travel-concierge",
+            user_id="traveler0115",
+            state={constants.PROFILE_ID: "itinerary_seattle_example"},
+        )
+        self.assertIs(session.state[constants.PROF_KEY], self.profile.state[constants.PROF_KEY])
+
+        await self._run_callback_and_tool(session)
+
+        stored = self._stored_state(session.id)
+        self.assertNotIn(constants.PROF_KEY, stored)
+        self.assertNotIn(constants.ITIN_KEY, stored)
+        self.assertEqual(stored["likes"], ["ramen"])
+        self.assertEqual(
+            stored[constants.ITIN_START_DATE], self.profile.state[constants.ITIN_KEY][constants.START_DATE]
+        )
+
+        loaded = await self._get(session.id)
+        self.assertEqual(loaded.state["likes"], ["ramen"])
+        self.assertIs(loaded.state[constants.ITIN_KEY], self.profile.state[constants.ITIN_KEY])
+        self.assertTrue(loaded.state[constants.ITIN_INITIALIZED])
+
+    async def test_overlay_wins_over_profile(self):
+        session = await self.service.create_session(
+            app_name="travel-concierge",
+            user_id="traveler0115",
+            state={constants.PROFILE_ID: "itinerary_seattle_example"},
+        )
+        event = Event(author="root_agent", actions=EventActions(state_delta={constants.ITIN_KEY: {}}))
+        await self.service.append_event(session, event)
+
+        loaded = await self._get(session.id)
+        self.assertEqual(loaded.state[constants.ITIN_KEY], {})
+        self.assertTrue(self.profile.state[constants.ITIN_KEY])
+        self.assertIsNone(await self._get("missing"))
+
+    async def test_flush_is_optional_for_the_store(self):
+        class UnbufferedStore:
+            """A store without flush, as in ADK releases whose BaseSessionService lacks it."""
+
+        await ProfileLayeredSessionService(UnbufferedStore(), profile_state).flush()
+
+        flushed = []
+
+        class BufferedStore:
+            async def flush(self):
+                flushed.append(True)
+
+        await ProfileLayeredSessionService(BufferedStore(), profile_state).flush()
+        self.assertEqual(flushed, [True])
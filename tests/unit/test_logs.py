@@ -0,0 +1,101 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the logging setup."""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import unittest
+
+from travel_concierge.shared_libraries import constants
+from travel_concierge.shared_libraries.logs import SamplingFilter, configure_logging, stop_logging
+from travel_concierge.sub_agents.in_trip.tools import find_segment
+from travel_concierge.tools.memory import load_scenario
+
+SEATTLE_PROFILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "travel_concierge", "profiles", "itinerary_seattle_example.json"
+)
+
+
+class TestLogging(unittest.TestCase):
+    """Test cases for configure_logging."""
+
+    def setUp(self):
+        root = logging.getLogger()
+        self.saved = (list(root.handlers), root.level)
+        self.levels = {name: logging.getLogger(name).level for name in ("travel_concierge", "travel_concierge.sub_agents")}
+        self.stream = io.StringIO()
+
+    def tearDown(self):
+        stop_logging()
+        root = logging.getLogger()
+        root.handlers[:] = self.saved[0]
+        root.setLevel(self.saved[1])
+        for name, level in self.levels.items():
+            logging.getLogger(name).setLevel(level)
+
+    def lines(self):
+        stop_logging()
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_writes_json_lines_with_extra_fields(self):
+        configure_logging(level="INFO", stream=self.stream)
+        logger = logging.getLogger("travel_concierge.test")
+        logger.info("Checked %s", "AA1234", extra={"trip": "Seattle"})
+        try:
+            raise ValueError("closed")
+        except ValueError:
+            logger.exception("Check failed")
+
+        checked, failed = self.lines()
+        self.assertEqual(checked["message"], "Checked AA1234")
+        self.assertEqual(checked["level"], "INFO")
+        self.assertEqual(checked["logger"], "travel_concierge.test")
+        self.assertEqual(checked["trip"], "Seattle")
+        self.assertIn("ValueError: closed", failed["exception"])
+
+    def test_per_module_levels(self):
+        configure_logging(level="WARNING", levels="travel_concierge.sub_agents=DEBUG", stream=self.stream)
+        logging.getLogger("travel_concierge.tools").debug("Loaded %s", "tools")
+        logging.getLogger("travel_concierge.sub_agents.in_trip").debug("Loaded %s", "in_trip")
+
+        self.assertEqual([line["message"] for line in self.lines()], ["Loaded in_trip"])
+
+    def test_sampling_keeps_warnings(self):
+        draws = iter([0.05, 0.5, 0.5])
+        sampling = SamplingFilter({"travel_concierge": 0.5, "travel_concierge.sub_agents": 0.1}, rng=lambda: next(draws))
+
+        def record(name, level):
+            return logging.LogRecord(name, level, __file__, 0, "message", None, None)
+
+        self.assertTrue(sampling.filter(record("travel_concierge.sub_agents.in_trip", logging.DEBUG)))
+        self.assertFalse(sampling.filter(record("travel_concierge.sub_agents.in_trip", logging.DEBUG)))
+        self.assertFalse(sampling.filter(record("travel_concierge.tools", logging.INFO)))
+        self.assertTrue(sampling.filter(record("travel_concierge.tools", logging.WARNING)))
+        self.assertTrue(sampling.filter(record("google_adk", logging.DEBUG)))
+
+    def test_itinerary_tools_do_not_print(self):
+        state = load_scenario(SEATTLE_PROFILE)["state"]
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            segment = find_segment(state[constants.PROF_KEY], state[constants.ITIN_KEY], "2025-06-15 10:00:00")
+        self.assertEqual(len(segment), 4)
+        self.assertEqual(stdout.getvalue(), "")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the pool of pre-warmed MCP servers."""
+
+import asyncio
+import json
+import sys
+import unittest
+
+from google.adk.tools.mcp_tool.mcp_toolset import StdioServerParameters
+
+from travel_concierge.tools.mcp_pool import MCPPoolError, MCPToolsetPool
+
+
+class FakeToolset:
+    """Stands in for an MCPToolset backed by a stdio server process."""
+
+    instances = []
+
+    def __init__(self, connection_params):
+        self.connection_params = connection_params
+        self.dead = False
+        self.closed = False
+        FakeToolset.instances.append(self)
+
+    async def get_tools(self):
+        if self.dead:
+            raise ConnectionError("server exited")
+        return [f"airbnb_search_{len(FakeToolset.instances)}"]
+
+    async def close(self):
+        self.closed = True
+
+
+class TestMCPToolsetPool(unittest.IsolatedAsyncioTestCase):
+    """Test cases for MCPToolsetPool."""
+
+    async def asyncSetUp(self):
+        FakeToolset.instances = []
+        self.pool = MCPToolsetPool(
+            connection_params=lambda: None,
+            size=2,
+            probe_interval=3600,
+            probe_timeout=1,
+            toolset_factory=FakeToolset,
+        )
+        await self.pool.start()
+
+    async def asyncTearDown(self):
+        await self.pool.stop()
+
+    async def _until_idle(self, count):
+        while self.pool.stats()["idle"] < count:
+            await asyncio.sleep(0.01)
+
+    async def test_prewarms_every_slot(self):
+        self.assertEqual(len(FakeToolset.instances), 2)
+        self.assertEqual(self.pool.stats()["alive"], 2)
+
+    async def test_checkout_is_bounded(self):
+        async with self.pool.checkout():
+            async with self.pool.checkout():
+                with self.assertRaises(MCPPoolError):
+                    async with self.pool.checkout(timeout=0.01):
+                        pass
+        self.assertEqual(self.pool.stats()["idle"], 2)
+
+    async def test_failed_request_respawns_dead_server(self):
+        with self.assertRaises(ConnectionError):
+            async with self.pool.checkout() as member:
+                member.toolset.dead = True
+                raise ConnectionError("broken pipe")
+        await asyncio.wait_for(self._until_idle(2), timeout=1)
+        self.assertEqual(self.pool.respawns, 1)
+        self.assertEqual(self.pool.stats(), {"size": 2, "idle": 2, "alive": 2, "respawns": 1})
+
+    async def test_stop_closes_servers(self):
+        await self.pool.stop()
+        self.assertTrue(all(toolset.closed for toolset in FakeToolset.instances))
+
+
+class TestFakeAirbnbServer(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the local Airbnb MCP stand-in, run by the pool."""
+
+    async def test_serves_airbnb_tools(self):
+        pool = MCPToolsetPool(
+            connection_params=lambda: StdioServerParameters(
+                command=sys.executable, args=["-m", "travel_concierge.tools.fake_airbnb_mcp"]
+            ),
+            size=1,
+            probe_interval=3600,
+        )
+        await pool.start()
+        try:
+            async with pool.checkout() as member:
+                tools = {tool.name: tool for tool in member.tools}
+                self.assertEqual(set(tools), {"airbnb_search", "airbnb_listing_details"})
+                result = await tools["airbnb_search"].run_async(args={"location": "San Diego"}, tool_context=None)
+        finally:
+            await pool.stop()
+
+        search = json.loads(result["content"][0]["text"])
+        self.assertEqual(len(search["searchResults"]), 5)
+        self.assertTrue(search["searchResults"][0]["url"].startswith("https://www.airbnb.com/rooms/"))
@@ -0,0 +1,120 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for concurrent Places lookups in map_tool."""
+
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools import ToolContext
+
+from travel_concierge.agent import root_agent
+from travel_concierge.shared_libraries.http_client import ResilientHttpClient
+from travel_concierge.tools import places
+from travel_concierge.tools.places import PlacesService, map_tool
+
+
+class SlowPlacesService(PlacesService):
+    """PlacesService answering after a delay, without calling the Places API."""
+
+    def __init__(self, delay=0.2, failing=(), stalled=()):
+        super().__init__()
+        self.delay = delay
+        self.failing = failing
+        self.stalled = stalled
+        self.running = 0
+        self.max_running = 0
+
+    async def _fetch_place_async(self, query):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(60 if query in self.stalled else self.delay)
+            if query in self.failing:
+                raise RuntimeError("connection reset")
+            return {"place_id": query, "map_url": f"https://maps/{query}", "lat": "1", "lng": "2"}
+        finally:
+            self.running -= 1
+
+
+class TestMapTool(unittest.IsolatedAsyncioTestCase):
+    """Test cases for map_tool with several POIs."""
+
+    def setUp(self):
+        super().setUp()
+        session_service = InMemorySessionService()
+        session = session_service.create_session_sync(app_name="Travel_Concierge", user_id="traveler0115")
+        self.tool_context = ToolContext(
+            invocation_context=InvocationContext(
+                session_service=session_service,
+                invocation_id="ABCD",
+                agent=root_agent,
+                session=session,
+            )
+        )
+        self.tool_context.state["poi"] = {
+            "places": [{"place_name": f"Place {i}", "address": "Seattle"} for i in range(5)]
+        }
+
+    async def test_lookups_run_concurrently(self):
+        service = SlowPlacesService()
+        with mock.patch.object(places, "places_service", service):
+            started = time.monotonic()
+            result = await map_tool(key="poi", tool_context=self.tool_context)
+            elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(service.max_running, 5)
+        self.assertEqual(
+            [poi["place_id"] for poi in self.tool_context.state["poi"]["places"]],
+            [f"Place {i}, Seattle" for i in range(5)],
+        )
+        self.assertEqual(result["places"][0]["long"], "2")
+
+    async def test_concurrency_limit(self):
+        service = SlowPlacesService(delay=0.01)
+        results = await service.find_places_from_text([f"Place {i}" for i in range(6)], concurrency=2)
+        self.assertEqual(service.max_running, 2)
+        self.assertEqual(len(results), 6)
+
+    async def test_partial_failures_keep_resolved_places(self):
+        service = SlowPlacesService(delay=0.01, failing={"Place 1, Seattle"}, stalled={"Place 2, Seattle"})
+        results = await service.find_places_from_text(
+            ["Place 0, Seattle", "Place 1, Seattle", "Place 2, Seattle"], timeout=0.1
+        )
+        self.assertEqual(results[0]["place_id"], "Place 0, Seattle")
+        self.assertIn("connection reset", results[1]["error"])
+        self.assertIn("Timed out", results[2]["error"])
+
+        service.stalled = ()
+        service.failing = {"Place 1, Seattle", "Place 2, Seattle"}
+        self.tool_context.state["poi"]["places"][2]["place_id"] = "from an earlier lookup"
+        with mock.patch.object(places, "places_service", service):
+            await map_tool(key="poi", tool_context=self.tool_context)
+
+        pois = self.tool_context.state["poi"]["places"]
+        self.assertEqual([poi["place_id"] for poi in pois[:3]], ["Place 0, Seattle", None, "from an earlier lookup"])
+        self.assertEqual(pois[4]["lat"], "1")
+
+    async def test_lookups_finish_within_the_worker_timeout(self):
+        self.assertLess(places.PLACES_LOOKUP_TIMEOUT, 30)
+
+        service = SlowPlacesService(stalled={"Place 0, Seattle"})
+        service.http = ResilientHttpClient(connect_timeout=0.02, read_timeout=0.03, max_retries=1, max_backoff=0.02)
+        results = await service.find_places_from_text(["Place 0, Seattle"], timeout=None)
+        self.assertEqual(results[0]["error"], "Timed out fetching place data after 0.12s")
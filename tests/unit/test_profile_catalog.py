@@ -0,0 +1,87 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the profile catalog and seeding sessions from it."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools import ToolContext
+
+from travel_concierge.agent import root_agent
+from travel_concierge.shared_libraries import constants
+from travel_concierge.shared_libraries.profile_catalog import PROFILES_DIR, ProfileCatalog, profile_catalog
+from travel_concierge.tools.memory import _load_precreated_itinerary, forget, memorize_list
+
+
+class TestProfileCatalog(unittest.TestCase):
+    """Test cases for ProfileCatalog."""
+
+    def test_indexes_directories(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with open(os.path.join(tmp, "traveler0115.json"), "w") as file:
+                json.dump({"state": {"user_profile": {"home": "Seattle"}}}, file)
+            catalog = ProfileCatalog([PROFILES_DIR, tmp])
+
+        self.assertIn("itinerary_seattle_example", catalog)
+        self.assertIn("traveler0115", catalog.ids())
+        self.assertEqual(catalog.get("traveler0115").state["user_profile"], {"home": "Seattle"})
+        with self.assertRaises(TypeError):
+            catalog.get("traveler0115").state["user_profile"] = {}
+        with self.assertRaises(KeyError):
+            catalog.get("nobody")
+
+
+class TestProfileSeeding(unittest.TestCase):
+    """Test cases for sessions seeded from a catalog profile."""
+
+    def setUp(self):
+        super().setUp()
+        session_service = InMemorySessionService()
+        session = session_service.create_session_sync(
+            app_name="Travel_Concierge",
+            user_id="traveler0115",
+            state={constants.PROFILE_ID: "itinerary_seattle_example"},
+        )
+        self.invoc_context = InvocationContext(
+            session_service=session_service,
+            invocation_id="ABCD",
+            agent=root_agent,
+            session=session,
+        )
+
+    def test_seeds_from_profile_without_modifying_it(self):
+        profile = profile_catalog.get("itinerary_seattle_example")
+
+        callback_context = CallbackContext(self.invoc_context)
+        _load_precreated_itinerary(callback_context)
+        self.assertEqual(callback_context.state[constants.ITIN_KEY], profile.state[constants.ITIN_KEY])
+        self.assertEqual(
+            callback_context.state[constants.ITIN_START_DATE],
+            profile.state[constants.ITIN_KEY][constants.START_DATE],
+        )
+
+        tool_context = ToolContext(invocation_context=self.invoc_context)
+        tool_context.state["likes"] = profile.state["user_profile"]["likes"]
+        memorize_list("likes", "ramen", tool_context)
+        memorize_list("likes", "jazz", tool_context)
+        forget("likes", "ramen", tool_context)
+
+        self.assertEqual(tool_context.state["likes"], ["jazz"])
+        self.assertEqual(profile.state["user_profile"]["likes"], [])
@@ -0,0 +1,106 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the bounded in-memory session service."""
+
+import unittest
+
+from google.adk.events import Event, EventActions
+
+from travel_concierge.shared_libraries.session_store import BoundedInMemorySessionService, untouched_sessions
+
+
+class FakeClock:
+    """A clock advanced by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBoundedInMemorySessionService(unittest.IsolatedAsyncioTestCase):
+    """Test cases for BoundedInMemorySessionService."""
+
+    def setUp(self):
+        super().setUp()
+        self.clock = FakeClock()
+
+    async def _create(self, service, session_id, state=None):
+        return await service.create_session(
+            app_name="travel-concierge", user_id="traveler0115", session_id=session_id, state=state
+        )
+
+    async def _get(self, service, session_id):
+        return await service.get_session(
+            app_name="travel-concierge", user_id="traveler0115", session_id=session_id
+        )
+
+    async def test_evicts_least_recently_used(self):
+        service = BoundedInMemorySessionService(max_sessions=2, idle_ttl=0, clock=self.clock)
+        await self._create(service, "a")
+        await self._create(service, "b")
+        await self._get(service, "a")
+        await self._create(service, "c")
+
+        self.assertIsNotNone(await self._get(service, "a"))
+        self.assertIsNone(await self._get(service, "b"))
+        self.assertIsNotNone(await self._get(service, "c"))
+        self.assertEqual(service.stats()["live_sessions"], 2)
+        self.assertEqual(service.stats()["evictions"], {"count": 1})
+
+    async def test_evicts_idle_sessions(self):
+        service = BoundedInMemorySessionService(max_sessions=0, idle_ttl=60, clock=self.clock)
+        await self._create(service, "a")
+        self.clock.now = 30
+        await self._create(service, "b")
+        self.clock.now = 61
+
+        self.assertIsNone(await self._get(service, "a"))
+        self.assertIsNotNone(await self._get(service, "b"))
+        self.assertEqual(service.stats()["evictions"], {"idle": 1})
+        self.assertEqual(service.sessions["travel-concierge"]["traveler0115"].keys(), {"b"})
+
+    async def test_untouched_access_keeps_sessions_idle(self):
+        service = BoundedInMemorySessionService(max_sessions=0, idle_ttl=60, clock=self.clock)
+        evicted = []
+        service.add_eviction_listener(lambda key, reason: evicted.append((key[2], reason)))
+        session = await self._create(service, "a")
+        self.clock.now = 50
+        with untouched_sessions():
+            session = await self._get(service, "a")
+            await service.append_event(session, Event(author="user", actions=EventActions(state_delta={"k": 1})))
+        self.clock.now = 61
+
+        self.assertIsNone(await self._get(service, "a"))
+        self.assertEqual(evicted, [("a", "idle")])
+
+    async def test_size_accounting(self):
+        service = BoundedInMemorySessionService(max_sessions=0, idle_ttl=0, max_bytes=4000, clock=self.clock)
+        session = await self._create(service, "a", state={"itinerary": "x" * 1000})
+        initial = service.total_bytes
+        self.assertGreater(initial, 1000)
+
+        event = Event(author="root_agent", actions=EventActions(state_delta={"itinerary": "y" * 1000}))
+        await service.append_event(session, event)
+        self.assertGreater(service.total_bytes, initial + 1000)
+
+        await self._create(service, "b", state={"itinerary": "z" * 2000})
+        self.assertIsNone(await self._get(service, "a"))
+        self.assertEqual(service.stats()["evictions"], {"size": 1})
+
+        await service.delete_session(app_name="travel-concierge", user_id="traveler0115", session_id="b")
+        self.assertEqual(service.stats()["live_sessions"], 0)
+        self.assertEqual(service.total_bytes, 0)
@@ -0,0 +1,171 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the SQLite session service."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions.base_session_service import GetSessionConfig
+from google.genai.types import Content, Part
+
+from travel_concierge import api
+from travel_concierge.shared_libraries.layered_session_service import ProfileLayeredSessionService
+from travel_concierge.shared_libraries.sqlite_session_service import SqliteSessionService
+
+
+class TestSqliteSessionService(unittest.IsolatedAsyncioTestCase):
+    """Test cases for SqliteSessionService."""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "sessions.db")
+        self.service = SqliteSessionService(self.db_path)
+
+    async def asyncTearDown(self):
+        await self.service.close()
+        self.tmp.cleanup()
+
+    async def _turn(self, session, text, state_delta=None, final=False):
+        """Appends a tool event, optionally followed by a final model response."""
+        tool_response = Content(role="user", parts=[Part.from_function_response(name="memorize", response={})])
+        await self.service.append_event(
+            session,
+            Event(author="root_agent", content=tool_response, actions=EventActions(state_delta=state_delta or {})),
+        )
+        if final:
+            await self.service.append_event(
+                session, Event(author="root_agent", content=Content(role="model", parts=[Part(text=text)]))
+            )
+
+    async def test_sessions_survive_a_new_service(self):
+        session = await self.service.create_session(
+            app_name="travel-concierge",
+            user_id="traveler0115",
+            state={"user_profile": {"home": "Seattle"}, "user:name": "Jenny", "temp:scratch": 1},
+        )
+        await self._turn(session, "Booked.", {"itinerary": {"trip_name": "Seattle"}, "app:version": 2}, final=True)
+
+        other_worker = SqliteSessionService(self.db_path)
+        loaded = await other_worker.get_session(
+            app_name="travel-concierge", user_id="traveler0115", session_id=session.id
+        )
+        await other_worker.close()
+
+        self.assertEqual(loaded.state["user_profile"], {"home": "Seattle"})
+        self.assertEqual(loaded.state["itinerary"], {"trip_name": "Seattle"})
+        self.assertEqual(loaded.state["user:name"], "Jenny")
+        self.assertEqual(loaded.state["app:version"], 2)
+        self.assertNotIn("temp:scratch", loaded.state)
+        self.assertEqual(len(loaded.events), 2)
+        self.assertEqual(loaded.events[-1].content.parts[0].text, "Booked.")
+
+    async def test_writes_are_batched_per_turn(self):
+        session = await self.service.create_session(app_name="travel-concierge", user_id="traveler0115")
+        await self._turn(session, "", {"poi": {"places": []}})
+        await self.service.count_sessions()
+        self.assertEqual(self.service.stats(), {"live_sessions": 1, "pending_events": 1})
+
+        await self._turn(session, "Here you go.", final=True)
+        self.assertEqual(self.service.stats(), {"live_sessions": 1, "pending_events": 0})
+
+    async def test_sessions_are_counted_off_the_loop(self):
+        other_worker = SqliteSessionService(self.db_path, count_interval=0)
+        await self.service.create_session(app_name="travel-concierge", user_id="traveler0115")
+
+        # The count of the last scrape is returned while a new one runs on a thread.
+        self.assertEqual(other_worker.stats()["live_sessions"], 0)
+        await other_worker._counting
+        self.assertEqual(other_worker.stats()["live_sessions"], 1)
+        self.assertEqual(self.service.stats()["live_sessions"], 0)
+        await other_worker.close()
+
+    async def test_recent_events_only(self):
+        session = await self.service.create_session(app_name="travel-concierge", user_id="traveler0115")
+        for i in range(3):
+            await self._turn(session, f"turn {i}", final=True)
+
+        loaded = await self.service.get_session(
+            app_name="travel-concierge",
+            user_id="traveler0115",
+            session_id=session.id,
+            config=GetSessionConfig(num_recent_events=1),
+        )
+        self.assertEqual([e.content.parts[0].text for e in loaded.events], ["turn 2"])
+
+    async def test_list_and_delete(self):
+        session = await self.service.create_session(
+            app_name="travel-concierge", user_id="traveler0115", session_id="s1"
+        )
+        with self.assertRaises(ValueError):
+            await self.service.create_session(app_name="travel-concierge", user_id="traveler0115", session_id="s1")
+
+        listed = await self.service.list_sessions(app_name="travel-concierge", user_id="traveler0115")
+        self.assertEqual([s.id for s in listed.sessions], ["s1"])
+
+        await self.service.delete_session(app_name="travel-concierge", user_id="traveler0115", session_id=session.id)
+        self.assertIsNone(
+            await self.service.get_session(app_name="travel-concierge", user_id="traveler0115", session_id="s1")
+        )
+
+
+class _FailingRunner:
+    """A runner whose turn records a tool call, then fails before its final response."""
+
+    def __init__(self, service):
+        self.service = service
+
+    async def run_async(self, *, user_id, session_id, new_message, run_config=None):
+        session = await self.service.get_session(app_name=api.APP_NAME, user_id=user_id, session_id=session_id)
+        tool_response = Content(role="user", parts=[Part.from_function_response(name="memorize", response={})])
+        event = Event(
+            author="root_agent", content=tool_response, actions=EventActions(state_delta={"origin": "Seattle"})
+        )
+        yield await self.service.append_event(session, event)
+        raise RuntimeError("model unavailable")
+
+
+class TestTurnsThatFail(unittest.IsolatedAsyncioTestCase):
+    """The API writes a turn's buffered events however the turn ends."""
+
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "sessions.db")
+        self.store = SqliteSessionService(self.db_path)
+        self.service = ProfileLayeredSessionService(self.store, lambda state: {})
+
+    async def asyncTearDown(self):
+        await self.store.close()
+        self.tmp.cleanup()
+
+    async def test_events_before_an_error_are_written(self):
+        session = await self.service.create_session(app_name=api.APP_NAME, user_id="traveler0115")
+        content = Content(role="user", parts=[Part(text="Plan a trip from Seattle")])
+
+        with mock.patch.object(api, "session_service", self.service):
+            with self.assertRaises(RuntimeError):
+                async for _ in api._run_turn(_FailingRunner(self.service), "traveler0115", session.id, content):
+                    pass
+
+        self.assertEqual(self.store.stats()["pending_events"], 0)
+        other_worker = SqliteSessionService(self.db_path)
+        loaded = await other_worker.get_session(
+            app_name=api.APP_NAME, user_id="traveler0115", session_id=session.id
+        )
+        await other_worker.close()
+        self.assertEqual(len(loaded.events), 1)
+        self.assertEqual(loaded.state["origin"], "Seattle")
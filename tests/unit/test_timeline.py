@@ -0,0 +1,142 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the itinerary timeline index."""
+
+import copy
+import os
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from travel_concierge.shared_libraries import constants, state_fingerprints
+from travel_concierge.shared_libraries.state_fingerprints import add_fingerprints
+from travel_concierge.sub_agents.in_trip import timeline as timeline_module
+from travel_concierge.sub_agents.in_trip.timeline import Timeline, timeline_for, timeline_key
+from travel_concierge.sub_agents.in_trip.tools import find_segment
+from travel_concierge.tools.memory import load_scenario
+
+SEATTLE_PROFILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "travel_concierge", "profiles", "itinerary_seattle_example.json"
+)
+
+HOME = {"event_type": "home", "address": "San Diego", "local_prefer_mode": "drive"}
+
+
+def visit(description, start_time=None):
+    event = {"event_type": "visit", "description": description, "address": "Seattle"}
+    if start_time:
+        event["start_time"] = start_time
+    return event
+
+
+class TestTimeline(unittest.TestCase):
+    """Test cases for Timeline and find_segment."""
+
+    def setUp(self):
+        state = load_scenario(SEATTLE_PROFILE)["state"]
+        self.profile = state[constants.PROF_KEY]
+        self.itinerary = state[constants.ITIN_KEY]
+
+    def test_finds_next_event_on_a_later_day(self):
+        # The next event, on the 16th at 09:00, is earlier in the day than now.
+        travel_from, travel_to, leave_by, arrive_by = find_segment(
+            self.profile, self.itinerary, "2025-06-15 10:00:00"
+        )
+        self.assertEqual(travel_from, "SEA Airport")
+        self.assertTrue(travel_to.startswith("Visit Pike Place Market"))
+        self.assertEqual(arrive_by, "09:00")
+
+    def test_finds_segments_through_the_trip(self):
+        _, travel_to, _, arrive_by = find_segment(self.profile, self.itinerary, "2025-06-15 00:00")
+        self.assertEqual((travel_to, arrive_by), ("SAN Airport", "An hour before 07:30"))
+
+        travel_from, travel_to, _, _ = find_segment(self.profile, self.itinerary, "2025-06-16 13:00")
+        self.assertTrue(travel_from.startswith("Lunch at Ivar's"))
+        self.assertTrue(travel_to.startswith("Visit the Space Needle"))
+
+        # After the last event the traveler stays on the last segment.
+        _, travel_to, _, _ = find_segment(self.profile, self.itinerary, "2025-06-18 12:00")
+        self.assertEqual(travel_to, "SEA Airport")
+
+    def test_events_after_midnight_and_without_times(self):
+        itinerary = {
+            "days": [
+                {
+                    "date": "2025-06-16",
+                    "events": [visit("Dinner", "21:00"), visit("Night market"), visit("Late show", "00:30")],
+                },
+                {"date": "not a date", "events": [visit("Lost", "10:00")]},
+                {"date": "2025-06-17", "events": [visit("Museum", "10:00")]},
+            ]
+        }
+        timeline = Timeline(HOME, itinerary)
+        self.assertEqual(
+            [(segment.destination["description"], segment.arrive_by) for segment in timeline.segments],
+            [
+                ("Dinner", datetime(2025, 6, 16, 21, 0)),
+                ("Night market", datetime(2025, 6, 16, 21, 0)),
+                ("Late show", datetime(2025, 6, 17, 0, 30)),
+                ("Museum", datetime(2025, 6, 17, 10, 0)),
+            ],
+        )
+        self.assertEqual(timeline.next_segment(datetime(2025, 6, 16, 23, 0)).destination["description"], "Late show")
+        self.assertEqual(timeline.next_segment(datetime(2025, 6, 16, 23, 0)).origin["description"], "Night market")
+        self.assertEqual(timeline.segments[0].origin, HOME)
+        self.assertEqual(
+            [s.destination["description"] for s in timeline.segments_between(datetime(2025, 6, 17), datetime(2025, 6, 18))],
+            ["Late show", "Museum"],
+        )
+
+        _, travel_to, _, arrive_by = find_segment({"home": HOME}, itinerary, "2025-06-16 20:00")
+        self.assertEqual((travel_to, arrive_by), ("Dinner Seattle", "21:00"))
+        _, travel_to, _, arrive_by = find_segment({"home": HOME}, {"days": []}, "2025-06-16 20:00")
+        self.assertEqual((travel_to, arrive_by), ("drive to San Diego", "any time"))
+
+    def test_index_is_rebuilt_only_when_the_itinerary_changes(self):
+        home = self.profile["home"]
+        timeline = timeline_for(home, self.itinerary)
+        self.assertIs(timeline_for(home, self.itinerary), timeline)
+        # A session store's copy of the same itinerary shares the index.
+        self.assertIs(timeline_for(copy.deepcopy(home), copy.deepcopy(self.itinerary)), timeline)
+
+        changed = copy.deepcopy(self.itinerary)
+        changed["days"][1]["events"][0]["start_time"] = "08:00"
+        changed_timeline = timeline_for(home, changed)
+        self.assertIsNot(changed_timeline, timeline)
+        self.assertEqual(changed_timeline.segments[1].arrive_by, datetime(2025, 6, 16, 8, 0))
+
+    def test_index_is_found_by_the_stored_fingerprints(self):
+        state = add_fingerprints({constants.PROF_KEY: self.profile, constants.ITIN_KEY: self.itinerary})
+        timeline = timeline_for(self.profile["home"], self.itinerary, timeline_key(state))
+
+        # A later turn's copy of the session is not hashed again.
+        copied = copy.deepcopy(state)
+        hashed = AssertionError("hashed")
+        with mock.patch.object(timeline_module, "fingerprint", side_effect=hashed), mock.patch.object(
+            state_fingerprints, "fingerprint", side_effect=hashed
+        ):
+            self.assertIs(
+                timeline_for(copied[constants.PROF_KEY]["home"], copied[constants.ITIN_KEY], timeline_key(copied)),
+                timeline,
+            )
+
+        changed = add_fingerprints(
+            {constants.PROF_KEY: self.profile, constants.ITIN_KEY: {**self.itinerary, "days": self.itinerary["days"][:1]}}
+        )
+        self.assertIsNot(timeline_for(self.profile["home"], changed[constants.ITIN_KEY], timeline_key(changed)), timeline)
+
+
+if __name__ == "__main__":
+    unittest.main()
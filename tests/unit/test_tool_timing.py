@@ -0,0 +1,132 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for timing how long function tools hold the event loop."""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from google.adk.agents import Agent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools import FunctionTool, ToolContext
+
+from travel_concierge.shared_libraries.tool_timing import (
+    add_blocking_observer,
+    remove_blocking_observer,
+    time_function_tools,
+    timed,
+)
+from travel_concierge.sub_agents.in_trip import tools as in_trip_tools
+from travel_concierge.tools.memory import memorize, memorize_list
+
+
+def slow_lookup(city: str, tool_context: ToolContext):
+    """
+    Looks up a city slowly.
+
+    Args:
+        city: The city to look up.
+        tool_context: The ADK tool context.
+    """
+    time.sleep(0.05)
+    tool_context.state["looked_up"] = city
+    return {"city": city, "thread": threading.current_thread().name}
+
+
+async def busy_lookup(city: str):
+    """Looks up a city, hogging the event loop for a while before and after awaiting."""
+    time.sleep(0.05)
+    await asyncio.sleep(0.2)
+    time.sleep(0.05)
+    return {"city": city}
+
+
+class TestToolTiming(unittest.IsolatedAsyncioTestCase):
+    """Test cases for timed and time_function_tools."""
+
+    async def asyncSetUp(self):
+        self.reports = []
+        add_blocking_observer(self._observe)
+        session_service = InMemorySessionService()
+        session = await session_service.create_session(app_name="Travel_Concierge", user_id="traveler0115")
+        self.agent = Agent(
+            model="gemini-2.5-flash",
+            name="test_agent",
+            instruction="",
+            tools=[slow_lookup, FunctionTool(busy_lookup), memorize],
+        )
+        self.tool_context = ToolContext(
+            invocation_context=InvocationContext(
+                session_service=session_service,
+                invocation_id="ABCD",
+                agent=self.agent,
+                session=session,
+            )
+        )
+
+    async def asyncTearDown(self):
+        remove_blocking_observer(self._observe)
+
+    def _observe(self, tool_name, blocked):
+        self.reports.append((tool_name, blocked))
+
+    async def test_sync_tools_run_on_the_loop_and_are_timed(self):
+        tool = FunctionTool(timed(slow_lookup))
+        self.assertEqual(tool._get_declaration(), FunctionTool(slow_lookup)._get_declaration())
+
+        result = await tool.run_async(args={"city": "Seattle"}, tool_context=self.tool_context)
+        self.assertEqual(result["thread"], threading.current_thread().name)
+        ((name, blocked),) = self.reports
+        self.assertEqual(name, "slow_lookup")
+        self.assertGreaterEqual(blocked, 0.05)
+
+    async def test_state_tools_do_not_race(self):
+        # memorize_list reads, modifies and writes state; concurrent calls must not race on threads.
+        tool = FunctionTool(timed(memorize_list))
+        await asyncio.gather(
+            *(
+                tool.run_async(args={"key": "destinations", "value": city}, tool_context=self.tool_context)
+                for city in ("Seattle", "Lima", "Cusco")
+            )
+        )
+        self.assertEqual(self.tool_context.state["destinations"], ["Seattle", "Lima", "Cusco"])
+        self.assertEqual([name for name, _ in self.reports], ["memorize_list"] * 3)
+
+    async def test_async_tools_report_loop_blocking_time(self):
+        result = await timed(busy_lookup)(city="Seattle")
+        self.assertEqual(result, {"city": "Seattle"})
+        ((name, blocked),) = self.reports
+        self.assertEqual(name, "busy_lookup")
+        self.assertGreaterEqual(blocked, 0.1)
+        self.assertLess(blocked, 0.2)
+
+    async def test_trip_checks_are_timed_where_they_are_defined(self):
+        self.assertIs(timed(in_trip_tools.flight_status_check), in_trip_tools.flight_status_check)
+        await in_trip_tools.trip_status_check(
+            events=[{"event_name": "Space Needle", "event_date": "2025-06-15", "event_location": "Seattle"}]
+        )
+        self.assertEqual([name for name, _ in self.reports], ["event_booking_check"])
+
+    def test_time_function_tools_is_idempotent(self):
+        time_function_tools([self.agent])
+        tools = list(self.agent.tools)
+        time_function_tools([self.agent])
+
+        self.assertEqual(self.agent.tools, tools)
+        self.assertTrue(tools[0]._timed)
+        self.assertTrue(tools[1].func._timed)
+        self.assertEqual(tools[2].__name__, "memorize")
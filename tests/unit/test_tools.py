@@ -14,17 +14,25 @@
 
 """Basic tests for individual tools."""
 
+import asyncio
+import json
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 from dotenv import load_dotenv
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.sessions import InMemorySessionService
 from google.adk.tools import ToolContext
 import pytest
 from travel_concierge.agent import root_agent
-from travel_concierge.tools.memory import memorize
-from travel_concierge.tools.places import map_tool
+from travel_concierge.tools.memory import _load_precreated_itinerary, load_scenario, memorize
+from travel_concierge.tools import places
+from travel_concierge.tools.fake_places import FakePlacesServer
+from travel_concierge.tools.places import PlacesService, map_tool
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -68,11 +76,39 @@ class TestAgents(unittest.TestCase):
             self.tool_context.state["itinerary_datetime"], "12/31/2025 11:59:59"
         )
 
+    def test_load_scenario_cached_until_changed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "scenario.json")
+            with open(path, "w") as file:
+                json.dump({"state": {"user_profile": {"passport_nationality": "US"}}}, file)
+
+            first = load_scenario(path)
+            self.assertIs(load_scenario(path), first)
+
+            with open(path, "w") as file:
+                json.dump({"state": {"user_profile": {"passport_nationality": "CA"}}}, file)
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+            self.assertEqual(load_scenario(path)["state"]["user_profile"]["passport_nationality"], "CA")
+
+    def test_initial_state_loaded_once(self):
+        callback_context = CallbackContext(self.invoc_context)
+        _load_precreated_itinerary(callback_context)
+        self.assertTrue(callback_context.state["_itin_initialized"])
+        self.assertIn("user_profile", callback_context.state)
+
+        callback_context.state["user_profile"] = {}
+        _load_precreated_itinerary(callback_context)
+        self.assertEqual(callback_context.state["user_profile"], {})
+
     def test_places(self):
         self.tool_context.state["poi"] = {
             "places": [{"place_name": "Machu Picchu", "address": "Machu Picchu, Peru"}]
         }
-        result = map_tool(key="poi", tool_context=self.tool_context)
+        # Served by the local stand-in for the Places API, so the test runs offline.
+        with FakePlacesServer() as server, mock.patch.object(
+            places, "places_service", PlacesService(base_url=server.base_url)
+        ):
+            result = asyncio.run(map_tool(key="poi", tool_context=self.tool_context))
         print(result)
         self.assertIn("place_id", result["places"][0])
         self.assertEqual(
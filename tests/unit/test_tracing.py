@@ -0,0 +1,190 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for agent tracing and the metrics it records."""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from google.adk.agents import Agent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types as genai_types
+from prometheus_client import multiprocess
+
+from travel_concierge.shared_libraries import metrics, types
+from travel_concierge.shared_libraries.agent_registry import AgentRegistry
+from travel_concierge.shared_libraries.fake_llm import FakeLlm
+from travel_concierge.shared_libraries.tracing import (
+    AgentTracer,
+    JsonTraceExporter,
+    instrument_agents,
+)
+from travel_concierge.tools.memory import memorize
+
+SCRIPT = {
+    "turns": [
+        {
+            "user": "Find me flights to Seattle",
+            "tool_uses": [
+                {"name": "transfer_to_agent", "args": {"agent_name": "tracing_planner"}},
+                {"name": "memorize", "args": {"key": "destination", "value": "Seattle"}},
+                {"name": "tracing_flight_search", "args": {"request": "Flights to Seattle"}},
+            ],
+            "final_response": "Here are your flights.",
+        }
+    ],
+    "outputs": {},
+}
+
+
+def own_callback(callback_context):
+    callback_context.state["own_callback_ran"] = True
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for metrics aggregated across worker processes."""
+
+    def run_worker(self, code, multiproc_dir):
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": multiproc_dir}
+        return subprocess.run(
+            [sys.executable, "-c", code], env=env, check=True, capture_output=True, text=True
+        ).stdout
+
+    def test_any_worker_renders_every_worker(self):
+        serve = (
+            "from travel_concierge.shared_libraries.health import http_in_flight, http_requests\n"
+            "http_requests.labels(method='GET', route='/chat', status='200').inc()\n"
+            "http_in_flight.inc()\n"
+            "import os; print(os.getpid())\n"
+        )
+        render = "from travel_concierge.shared_libraries import metrics\nprint(metrics.render().decode())"
+        with tempfile.TemporaryDirectory() as multiproc_dir:
+            first = int(self.run_worker(serve, multiproc_dir))
+            self.run_worker(serve, multiproc_dir)
+            lines = self.run_worker(render, multiproc_dir).splitlines()
+            self.assertIn('travel_concierge_http_requests_total{method="GET",route="/chat",status="200"} 2.0', lines)
+            self.assertIn("travel_concierge_http_requests_in_flight 2.0", lines)
+
+            # What gunicorn.conf.py's child_exit does: the gauges of the worker go, its counters stay.
+            multiprocess.mark_process_dead(first, multiproc_dir)
+            lines = self.run_worker(render, multiproc_dir).splitlines()
+            self.assertIn('travel_concierge_http_requests_total{method="GET",route="/chat",status="200"} 2.0', lines)
+            self.assertIn("travel_concierge_http_requests_in_flight 1.0", lines)
+
+
+class TestAgentTracer(unittest.IsolatedAsyncioTestCase):
+    """Test cases for AgentTracer on a scripted agent graph."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        script_path = os.path.join(self.dir.name, "script.json")
+        with open(script_path, "w") as file:
+            json.dump(SCRIPT, file)
+        model = FakeLlm(model="fake", scripts=[script_path])
+
+        flight_search = Agent(
+            model=model,
+            name="tracing_flight_search",
+            instruction="",
+            output_schema=types.FlightsSelection,
+            output_key="flight",
+        )
+        planner = Agent(
+            model=model, name="tracing_planner", instruction="", tools=[AgentTool(agent=flight_search), memorize]
+        )
+        self.root = Agent(
+            model=model, name="tracing_root", instruction="", sub_agents=[planner], before_agent_callback=own_callback
+        )
+
+        self.trace_path = os.path.join(self.dir.name, "traces.json")
+        self.exporter = JsonTraceExporter(self.trace_path)
+        self.tracer = AgentTracer([self.exporter])
+        instrument_agents(AgentRegistry(self.root), self.tracer)
+        instrument_agents(AgentRegistry(self.root), self.tracer)
+
+    def tearDown(self):
+        self.exporter.close()
+        self.dir.cleanup()
+
+    async def run_turn(self, text: str):
+        session_service = InMemorySessionService()
+        session = await session_service.create_session(app_name="Travel_Concierge", user_id="traveler0115")
+        runner = Runner(agent=self.root, app_name="Travel_Concierge", session_service=session_service)
+        message = genai_types.Content(role="user", parts=[genai_types.Part(text=text)])
+        async for _ in runner.run_async(user_id="traveler0115", session_id=session.id, new_message=message):
+            pass
+        return await session_service.get_session(
+            app_name="Travel_Concierge", user_id="traveler0115", session_id=session.id
+        )
+
+    async def test_spans_nest_like_the_calls(self):
+        def counts():
+            return (
+                metrics.value(
+                    "travel_concierge_tool_duration_seconds_count", agent="tracing_planner", tool="tracing_flight_search"
+                ),
+                metrics.value("travel_concierge_tool_args_bytes_count", tool="memorize"),
+                metrics.value("travel_concierge_model_tokens_total", agent="tracing_flight_search", direction="prompt"),
+            )
+
+        tool_calls, args_sizes, prompt_tokens = counts()
+
+        session = await self.run_turn("find me flights to Seattle")
+
+        self.assertTrue(session.state["own_callback_ran"])
+        self.assertEqual(self.tracer.open_spans(), [])
+        self.exporter.close()
+        with open(self.trace_path) as file:
+            events = json.loads(file.read().rstrip(",\n") + "]")
+        by_id = {event["args"]["span_id"]: event for event in events}
+
+        def path(event):
+            names = []
+            while event:
+                names.append(f"{event['cat']}:{event['name']}")
+                event = by_id.get(event["args"]["parent_id"])
+            return list(reversed(names))
+
+        paths = [path(event) for event in events if event["cat"] != "model"]
+        self.assertIn(["agent:tracing_root"], paths)
+        self.assertIn(["agent:tracing_root", "agent:tracing_planner", "tool:memorize"], paths)
+        self.assertIn(
+            [
+                "agent:tracing_root",
+                "agent:tracing_planner",
+                "tool:tracing_flight_search",
+                "agent:tracing_flight_search",
+            ],
+            paths,
+        )
+        nested = next(event for event in events if event["cat"] == "agent" and event["name"] == "tracing_flight_search")
+        self.assertEqual(nested["args"]["depth"], 3)
+        self.assertTrue(all(event["args"]["error"] is None for event in events))
+        self.assertEqual(len({event["tid"] for event in events}), 1)
+
+        self.assertEqual(counts()[:2], (tool_calls + 1, args_sizes + 1))
+        self.assertGreater(counts()[2], prompt_tokens)
+        rendered = metrics.render().decode()
+        self.assertIn('travel_concierge_tool_duration_seconds_count{agent="tracing_planner",tool="memorize"}', rendered)
+        self.assertIn('travel_concierge_agent_duration_seconds_bucket{agent="tracing_root",le="+Inf"}', rendered)
+
+
+if __name__ == "__main__":
+    unittest.main()
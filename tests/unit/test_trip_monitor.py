@@ -0,0 +1,258 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the batched and background trip monitor checks."""
+
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from google.adk.agents import Agent
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.adk.tools import FunctionTool
+from google.genai import types as genai_types
+
+from travel_concierge.shared_libraries import constants
+from travel_concierge.shared_libraries.fake_llm import FakeLlm
+from travel_concierge.shared_libraries.session_store import BoundedInMemorySessionService
+from travel_concierge.shared_libraries.sqlite_session_service import SqliteSessionService
+from travel_concierge.shared_libraries.types import FlightCheck
+from travel_concierge.sub_agents.in_trip import monitor, tools
+from travel_concierge.sub_agents.in_trip.agent import trip_monitor_agent
+from travel_concierge.sub_agents.in_trip.monitor import TripMonitor
+from travel_concierge.sub_agents.in_trip.tools import trip_status_check
+from travel_concierge.tools.memory import load_scenario
+
+SEATTLE_PROFILE = os.path.join(
+    os.path.dirname(__file__), "..", "..", "travel_concierge", "profiles", "itinerary_seattle_example.json"
+)
+INTRIP_EVAL_SET = os.path.join(os.path.dirname(__file__), "..", "..", "eval", "data", "intrip.test.json")
+
+FLIGHTS = [
+    {"flight_number": "AA1234", "flight_date": "2025-06-15", "checkin_time": "07:30", "departure_time": "08:00"},
+    {"flight_number": "UA5678", "flight_date": "2025-06-17", "checkin_time": "15:30", "departure_time": "16:00"},
+]
+EVENTS = [{"event_name": "Space Needle", "event_date": "2025-06-16", "event_location": "Space Needle"}]
+ACTIVITIES = [
+    {"activity_name": "Visit Pike Place Market", "activity_date": "2025-06-16", "activity_location": "Pike Place Market"}
+]
+
+
+class TestTripStatusCheck(unittest.IsolatedAsyncioTestCase):
+    """Test cases for trip_status_check."""
+
+    async def test_reports_every_item_in_order(self):
+        report = await trip_status_check(
+            flights=[FLIGHTS[0], FlightCheck(**FLIGHTS[1])], events=EVENTS, activities=ACTIVITIES
+        )
+
+        self.assertEqual(
+            [result["status"] for result in report["flights"]],
+            ["Flight AA1234 is on time.", "Flight UA5678 is on time."],
+        )
+        self.assertEqual(report["flights"][1]["checkin_time"], "15:30")
+        self.assertEqual(report["events"][0]["status"], "Space Needle is closed.")
+        self.assertEqual(report["activities"][0]["activity_location"], "Pike Place Market")
+        self.assertEqual(report["summary"], {"checked": 4, "failed": 0})
+        self.assertEqual((await trip_status_check())["summary"], {"checked": 0, "failed": 0})
+
+    async def test_failed_and_malformed_checks_do_not_fail_the_batch(self):
+        def flight_status_check(**kwargs):
+            raise ConnectionError("feed unavailable")
+
+        with mock.patch.object(tools, "flight_status_check", flight_status_check):
+            report = await trip_status_check(flights=FLIGHTS[:1], events=[{"event_date": "2025-06-16"}])
+
+        self.assertEqual(report["flights"][0]["status"], "unknown")
+        self.assertEqual(report["flights"][0]["error"], "feed unavailable")
+        self.assertEqual(report["events"][0]["status"], "not checked")
+        self.assertIn("event_name", report["events"][0]["error"])
+        self.assertEqual(report["summary"], {"checked": 0, "failed": 2})
+
+    async def test_checks_one_call_per_monitor_turn(self):
+        # The agents replay the in-trip eval set: the monitor checks the whole trip in one call.
+        model = FakeLlm(model="fake", scripts=[INTRIP_EVAL_SET])
+        monitor = Agent(
+            model=model,
+            name="trip_monitor_agent",
+            instruction="",
+            tools=[FunctionTool(trip_status_check)],
+        )
+        agent = Agent(model=model, name="in_trip_agent", instruction="", sub_agents=[monitor])
+        self.assertEqual(
+            [tool.__name__ for tool in trip_monitor_agent.tools if callable(tool)], ["trip_status_check"]
+        )
+        session_service = InMemorySessionService()
+        session = await session_service.create_session(app_name="Travel_Concierge", user_id="traveler0115")
+        runner = Runner(agent=agent, app_name="Travel_Concierge", session_service=session_service)
+
+        calls, responses = [], []
+        message = genai_types.Content(role="user", parts=[genai_types.Part(text="monitor")])
+        async for event in runner.run_async(user_id="traveler0115", session_id=session.id, new_message=message):
+            for part in event.content.parts if event.content else []:
+                if part.function_call:
+                    calls.append((event.author, part.function_call.name))
+                elif part.function_response and part.function_response.name == "trip_status_check":
+                    responses.append(part.function_response.response)
+
+        self.assertEqual(
+            calls,
+            [
+                ("in_trip_agent", "transfer_to_agent"),
+                ("trip_monitor_agent", "trip_status_check"),
+                ("trip_monitor_agent", "transfer_to_agent"),
+            ],
+        )
+        self.assertEqual(len(responses[0]["flights"]), 2)
+        self.assertEqual(responses[0]["events"][0]["status"], "Space Needle is closed.")
+        self.assertEqual(responses[0]["summary"], {"checked": 7, "failed": 0})
+
+
+class TestTripMonitor(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the background TripMonitor."""
+
+    async def asyncSetUp(self):
+        self.session_service = InMemorySessionService()
+        self.clock = 0.0
+        self.trip_monitor = TripMonitor(
+            self.session_service,
+            "Travel_Concierge",
+            interval=60,
+            workers=2,
+            days=2,
+            session_ttl=3600,
+            clock=lambda: self.clock,
+            now=lambda: datetime(2026, 1, 1),
+            rng=lambda: 0.0,
+        )
+        state = dict(load_scenario(SEATTLE_PROFILE)["state"])
+        state[constants.ITIN_DATETIME] = "2025-06-16 08:00:00"
+        # Two travelers on the same trip, one session without an itinerary and one that is gone.
+        self.sessions = [
+            await self.session_service.create_session(app_name="Travel_Concierge", user_id=user_id, state=state)
+            for user_id in ("traveler0115", "traveler0116", "traveler0118")
+        ]
+        empty = await self.session_service.create_session(app_name="Travel_Concierge", user_id="traveler0117")
+        self.assertEqual([self.trip_monitor.track(session) for session in self.sessions], [True, True, True])
+        self.assertFalse(self.trip_monitor.track(empty))
+        deleted = self.sessions.pop()
+        await self.session_service.delete_session(
+            app_name="Travel_Concierge", user_id=deleted.user_id, session_id=deleted.id
+        )
+
+    async def daily_checks(self, session):
+        session = await self.session_service.get_session(
+            app_name="Travel_Concierge", user_id=session.user_id, session_id=session.id
+        )
+        return session.state.get(constants.DAILY_CHECKS)
+
+    async def test_checks_each_trip_once_and_stores_changes(self):
+        with mock.patch.object(monitor, "trip_status_check", wraps=trip_status_check) as check:
+            self.assertEqual(await self.trip_monitor.run_once(), {"trips": 1, "updated": 2})
+            self.assertEqual(check.call_count, 1)
+            # Only the events of the traveler's current day and the next are checked.
+            self.assertEqual([flight["flight_number"] for flight in check.call_args.kwargs["flights"]], ["UA5678"])
+
+        daily_checks = await self.daily_checks(self.sessions[0])
+        self.assertTrue(daily_checks.startswith("Checks of San Diego to Seattle Getaway from 2025-06-16 to 2025-06-17:"))
+        self.assertIn("- Space Needle on 2025-06-16: Space Needle is closed.", daily_checks)
+        self.assertIn("- Flight UA5678 on 2025-06-17: Flight UA5678 is on time.", daily_checks)
+        self.assertNotIn("AA1234", daily_checks)
+        self.assertEqual(await self.daily_checks(self.sessions[1]), daily_checks)
+        self.assertEqual(self.trip_monitor.stats(), {"sessions": 2, "cycles": 1})
+
+        # Unchanged results are not stored again.
+        self.assertEqual(await self.trip_monitor.run_once(), {"trips": 1, "updated": 0})
+        session = await self.session_service.get_session(
+            app_name="Travel_Concierge", user_id="traveler0115", session_id=self.sessions[0].id
+        )
+        self.assertEqual(len(session.events), 1)
+        self.assertEqual(session.events[0].author, "user")
+        self.assertIsNone(session.events[0].content)
+
+    async def test_stops_monitoring_idle_sessions(self):
+        self.clock = 1800.0
+        self.trip_monitor.track(self.sessions[0])
+        self.clock = 3700.0
+        self.assertEqual(await self.trip_monitor.run_once(), {"trips": 1, "updated": 1})
+        self.assertEqual(self.trip_monitor.stats()["sessions"], 1)
+        self.assertIsNone(await self.daily_checks(self.sessions[1]))
+
+    async def test_does_not_keep_sessions_alive(self):
+        store_clock = [0.0]
+        store = BoundedInMemorySessionService(idle_ttl=3600, clock=lambda: store_clock[0])
+        self.trip_monitor = TripMonitor(
+            store, "Travel_Concierge", session_ttl=0, max_sessions=2, now=lambda: datetime(2026, 1, 1)
+        )
+        store.add_eviction_listener(lambda key, reason: self.trip_monitor.untrack(key[1], key[2]))
+        state = dict(self.sessions[0].state)
+        sessions = [
+            await store.create_session(app_name="Travel_Concierge", user_id=f"traveler{i}", state=state)
+            for i in range(3)
+        ]
+        for session in sessions:
+            self.trip_monitor.track(session)
+        # Only the most recently tracked sessions are kept.
+        self.assertEqual(self.trip_monitor.stats()["sessions"], 2)
+
+        store_clock[0] = 3000.0
+        self.assertEqual(await self.trip_monitor.run_once(), {"trips": 1, "updated": 2})
+        # Reading and updating them was no activity: they are evicted an hour after they were created.
+        store_clock[0] = 3700.0
+        self.assertIsNone(
+            await store.get_session(app_name="Travel_Concierge", user_id="traveler2", session_id=sessions[2].id)
+        )
+        self.assertEqual(store.stats()["evictions"], {"idle": 3})
+        self.assertEqual(self.trip_monitor.stats()["sessions"], 0)
+
+    async def test_results_reach_other_workers_with_sqlite(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "sessions.db")
+            store, other_worker = SqliteSessionService(db_path), SqliteSessionService(db_path)
+            self.trip_monitor = TripMonitor(store, "Travel_Concierge", now=lambda: datetime(2026, 1, 1))
+            session = await store.create_session(
+                app_name="Travel_Concierge", user_id="traveler0115", state=dict(self.sessions[0].state)
+            )
+            self.trip_monitor.track(session)
+            try:
+                self.assertEqual(await self.trip_monitor.run_once(), {"trips": 1, "updated": 1})
+                self.assertEqual(store.stats()["pending_events"], 0)
+                loaded = await other_worker.get_session(
+                    app_name="Travel_Concierge", user_id="traveler0115", session_id=session.id
+                )
+                self.assertIn("Space Needle is closed.", loaded.state[constants.DAILY_CHECKS])
+            finally:
+                await store.close()
+                await other_worker.close()
+
+    async def test_runs_in_the_background(self):
+        await self.trip_monitor.start()
+        try:
+            for _ in range(100):
+                if self.trip_monitor.cycles:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await self.trip_monitor.stop()
+        self.assertFalse(self.trip_monitor.started)
+        self.assertEqual(self.trip_monitor.cycles, 1)
+        self.assertIsNotNone(await self.daily_checks(self.sessions[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
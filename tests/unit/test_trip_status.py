@@ -0,0 +1,124 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for the status providers behind the trip monitor checks."""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from travel_concierge.shared_libraries import metrics
+from travel_concierge.sub_agents.in_trip import tools
+from travel_concierge.sub_agents.in_trip.tools import trip_status_check
+from travel_concierge.tools.fake_status import SimulatedStatusConfig, SimulatedStatusProvider
+from travel_concierge.tools.trip_status import CachingStatusProvider, StatusProviderError
+
+
+class TestSimulatedStatusProvider(unittest.IsolatedAsyncioTestCase):
+    """Test cases for SimulatedStatusProvider."""
+
+    async def test_answers_are_stable_per_entity_and_date(self):
+        provider = SimulatedStatusProvider(SimulatedStatusConfig(disruption_rate=0.5, seed=7))
+        other = SimulatedStatusProvider(SimulatedStatusConfig(disruption_rate=0.5, seed=7))
+        for date in ("2025-06-15", "2025-06-16", "2025-06-17"):
+            self.assertEqual(
+                await provider.flight_status("AA1234", date), await other.flight_status("aa1234 ", date)
+            )
+            self.assertEqual(
+                await provider.weather_forecast("Pike Place Market", date),
+                await other.weather_forecast("Pike Place Market", date),
+            )
+        self.assertEqual(provider.calls, 6)
+
+    async def test_disruptions_and_faults(self):
+        provider = SimulatedStatusProvider(SimulatedStatusConfig(disruption_rate=1.0, closed_events=()))
+        self.assertIn((await provider.flight_status("AA1234", "2025-06-15"))["state"], ("delayed", "cancelled"))
+        self.assertEqual(await provider.event_status("MoPOP", "2025-06-17", "Seattle"), {"state": "closed"})
+        self.assertFalse((await provider.weather_forecast("Seattle", "2025-06-16"))["outdoor_ok"])
+
+        provider = SimulatedStatusProvider()
+        self.assertEqual(await provider.event_status("Space Needle", "2025-06-16", "Seattle"), {"state": "closed"})
+        self.assertEqual(await provider.event_status("MoPOP", "2025-06-17", "Seattle"), {"state": "open"})
+
+        provider.config.error_rate = 1.0
+        with self.assertRaises(StatusProviderError):
+            await provider.flight_status("AA1234", "2025-06-15")
+
+
+class TestCachingStatusProvider(unittest.IsolatedAsyncioTestCase):
+    """Test cases for CachingStatusProvider."""
+
+    def setUp(self):
+        self.clock = 0.0
+        self.provider = SimulatedStatusProvider(SimulatedStatusConfig(latency=0.02))
+        self.status = CachingStatusProvider(self.provider, ttl=300, timeout=1, clock=lambda: self.clock)
+
+    async def test_reuses_answers_by_entity_and_date(self):
+        hits = metrics.value("travel_concierge_status_lookups_total", kind="flight", result="hit")
+        answer = await self.status.flight_status("AA1234", "2025-06-15")
+        self.assertEqual(await self.status.flight_status(" aa1234", "2025-06-15"), answer)
+        await self.status.flight_status("AA1234", "2025-06-16")
+        self.assertEqual(self.provider.calls, 2)
+        self.assertEqual(metrics.value("travel_concierge_status_lookups_total", kind="flight", result="hit"), hits + 1)
+
+        self.clock = 301.0
+        await self.status.flight_status("AA1234", "2025-06-15")
+        self.assertEqual(self.provider.calls, 3)
+
+    async def test_coalesces_identical_lookups_in_progress(self):
+        answers = await asyncio.gather(
+            *(self.status.weather_forecast("Pike Place Market", "2025-06-16") for _ in range(5)),
+            self.status.weather_forecast("Pike Place Market", "2025-06-17"),
+        )
+        self.assertEqual(len({tuple(answer.items()) for answer in answers[:5]}), 1)
+        self.assertEqual(self.provider.calls, 2)
+
+        # A caller giving up does not cancel the lookup the others wait for.
+        self.status.cache_clear()
+        waiting = asyncio.ensure_future(self.status.event_status("MoPOP", "2025-06-17", "Seattle"))
+        await asyncio.sleep(0)
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(self.status.event_status("MoPOP", "2025-06-17", "Seattle"), 0.001)
+        self.assertEqual(await waiting, {"state": "open"})
+        self.assertEqual(self.provider.calls, 3)
+
+    async def test_failures_are_not_cached(self):
+        self.provider.config.error_rate = 1.0
+        with self.assertRaises(StatusProviderError):
+            await self.status.flight_status("AA1234", "2025-06-15")
+        self.provider.config.error_rate = 0.0
+        self.assertEqual((await self.status.flight_status("AA1234", "2025-06-15"))["state"], "on time")
+
+        self.status.timeout = 0.01
+        with self.assertRaisesRegex(StatusProviderError, "within 0.01s"):
+            await self.status.flight_status("UA5678", "2025-06-17")
+
+    async def test_trip_checks_share_lookups(self):
+        with mock.patch.object(tools, "status_service", self.status):
+            report = await trip_status_check(
+                events=[{"event_name": "Space Needle", "event_date": "2025-06-16", "event_location": "Space Needle"}],
+                activities=[
+                    {"activity_name": "Lunch", "activity_date": "2025-06-16", "activity_location": "Pike Place Market"},
+                    {"activity_name": "Walk", "activity_date": "2025-06-16", "activity_location": "pike place market"},
+                ],
+            )
+        self.assertEqual(report["events"][0]["status"], "Space Needle is closed.")
+        self.assertTrue(report["events"][0]["needs_attention"])
+        self.assertTrue(report["activities"][0]["status"].endswith("expected for Lunch."))
+        self.assertEqual(report["summary"], {"checked": 3, "failed": 0})
+        self.assertEqual(self.provider.calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
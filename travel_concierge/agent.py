@@ -17,6 +17,7 @@
 from google.adk.agents import Agent
 
 from travel_concierge import prompt
+from travel_concierge.shared_libraries.models import MODEL
 
 from travel_concierge.sub_agents.booking.agent import booking_agent
 from travel_concierge.sub_agents.in_trip.agent import in_trip_agent
@@ -29,7 +30,7 @@ from travel_concierge.tools.memory import _load_precreated_itinerary
 
 
 root_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="root_agent",
     description="A Travel Conceirge using the services of multiple sub-agents",
     instruction=prompt.ROOT_AGENT_INSTR,
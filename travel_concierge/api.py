@@ -4,27 +4,90 @@ import os
 import asyncio
 import uuid
 import json
-from typing import Dict, Any, Optional
+from contextlib import aclosing, asynccontextmanager, suppress
+from enum import Enum
+from typing import AsyncIterator, Dict, Any, Optional
 from pydantic import BaseModel
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from dotenv import load_dotenv
 from datetime import datetime
 
 from google.adk import Runner
-from google.adk.sessions import InMemorySessionService
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.artifacts.in_memory_artifact_service import InMemoryArtifactService
-from google.adk.tools.agent_tool import AgentTool
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
 from google.genai.types import Content, Part
 from travel_concierge.agent import root_agent
 from travel_concierge.sub_agents.booking.agent import booking_agent
-from travel_concierge.shared_libraries import constants
+from travel_concierge.shared_libraries import constants, metrics
+from travel_concierge.shared_libraries.agent_graph import AgentGraphCache
+from travel_concierge.shared_libraries.agent_registry import AgentRegistry
+from travel_concierge.shared_libraries.health import (
+    ModelCheck,
+    RequestMetricsMiddleware,
+    check_mcp_pool,
+    check_session_store,
+    readiness,
+)
+from travel_concierge.shared_libraries.models import MODEL
+from travel_concierge.shared_libraries.layered_session_service import ProfileLayeredSessionService
+from travel_concierge.shared_libraries.logs import configure_logging
+from travel_concierge.shared_libraries.profile_catalog import profile_catalog
+from travel_concierge.shared_libraries.session_store import BoundedInMemorySessionService
+from travel_concierge.shared_libraries.sqlite_session_service import SqliteSessionService
+from travel_concierge.shared_libraries.tool_timing import time_function_tools
+from travel_concierge.shared_libraries.tracing import instrument_agents
+from travel_concierge.sub_agents.in_trip.monitor import TripMonitor
+from travel_concierge.tools.mcp_pool import MCPPoolError, MCPToolsetPool
+from travel_concierge.tools.memory import preload_scenario, profile_state
+from travel_concierge.tools.places import places_service
 
 # Load environment variables
 load_dotenv()
 
-app = FastAPI()
+# JSON logs written off the event loop, see LOG_LEVEL, LOG_LEVELS and LOG_SAMPLING
+configure_logging()
+
+# Pre-warmed Airbnb MCP servers, started and stopped with the app
+mcp_pool = MCPToolsetPool()
+
+# Index of the agent graph; building it fails fast on duplicate agent names
+agent_registry = AgentRegistry(root_agent)
+
+# Time each function tool call holds the event loop, see TOOL_BLOCKING_WARN_SECONDS
+time_function_tools(agent_registry)
+
+# Every agent run, model call and tool call is timed, see /metrics and TRACE_EXPORTERS
+instrument_agents(agent_registry)
+
+# Read-only copies of root_agent with MCP tools added, one per MCP server
+mcp_agent_graphs = AgentGraphCache(agent_registry, "planning_agent")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Loads the scenario and starts the MCP server pool and trip monitor before serving; stops them and closes connections on exit."""
+    preload_scenario()
+    await mcp_pool.start()
+    await trip_monitor.start()
+    collecting = asyncio.create_task(metrics.collect_periodically()) if metrics.PROMETHEUS_MULTIPROC_DIR else None
+    try:
+        yield
+    finally:
+        if collecting is not None:
+            collecting.cancel()
+            with suppress(asyncio.CancelledError):
+                await collecting
+        await trip_monitor.stop()
+        await mcp_pool.stop()
+        await places_service.http.aclose()
+        if isinstance(session_store, SqliteSessionService):
+            await session_store.close()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS middleware setup (if needed)
 app.add_middleware(
@@ -35,90 +98,226 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Session and artifact services
-session_service = InMemorySessionService()
+# Request counts, latencies and requests in flight, see /metrics
+app.add_middleware(RequestMetricsMiddleware)
+
+APP_NAME = "travel-concierge"
+
+# Session and artifact services. The default in-memory sessions are per worker and
+# evicted when idle or over capacity; SESSION_BACKEND=sqlite shares durable sessions
+# between all workers through SESSION_DB_PATH. Either way only what a session changed
+# is stored; its profile's values are layered in when it is loaded.
+if os.getenv("SESSION_BACKEND", "memory") == "sqlite":
+    session_store = SqliteSessionService()
+else:
+    session_store = BoundedInMemorySessionService()
+session_service = ProfileLayeredSessionService(session_store, profile_state)
 artifact_service = InMemoryArtifactService()
 
+# Checks the trips of recently active sessions in the background, see MONITOR_INTERVAL;
+# the in-trip agent answers from the results stored in their daily_checks state
+trip_monitor = TripMonitor(session_service, APP_NAME)
+if isinstance(session_store, BoundedInMemorySessionService):
+    # Evicted sessions are no longer monitored; monitoring does not keep them alive either.
+    session_store.add_eviction_listener(lambda key, reason: trip_monitor.untrack(key[1], key[2]))
+
+# Dependencies /ready checks; none of them creates a session or runs an agent
+readiness_checks = {
+    "mcp_pool": check_mcp_pool(mcp_pool),
+    "session_store": check_session_store(session_store),
+    "model": ModelCheck(MODEL),
+}
+
+# Workers share SQLite sessions, so each reports the same count; in memory their counts add up.
+sessions_gauge = metrics.gauge(
+    "travel_concierge_sessions",
+    "Sessions stored; summed over workers in memory, shared by all workers with SESSION_BACKEND=sqlite.",
+    mode="livemax" if isinstance(session_store, SqliteSessionService) else "livesum",
+)
+# Each worker runs its own MCP pool, so its slots are reported with the worker's pid.
+mcp_server_up = metrics.gauge(
+    "travel_concierge_mcp_server_up", "Whether the MCP server in each pool slot is running.", ["slot"], "liveall"
+)
+mcp_server_generation = metrics.gauge(
+    "travel_concierge_mcp_server_generation",
+    "Times the MCP server in each pool slot has been started.",
+    ["slot"],
+    "liveall",
+)
+mcp_servers_idle = metrics.gauge("travel_concierge_mcp_servers_idle", "MCP servers waiting for a request.")
+monitored_sessions = metrics.gauge(
+    "travel_concierge_monitored_sessions", "Sessions whose trips the workers check in the background."
+)
+
+def _collect_state_metrics():
+    """Reads session and MCP pool state into their gauges, on each scrape and every METRICS_COLLECT_INTERVAL."""
+    sessions_gauge.set(session_store.stats()["live_sessions"])
+    mcp_servers_idle.set(mcp_pool.stats()["idle"])
+    monitored_sessions.set(trip_monitor.stats()["sessions"])
+    for server in mcp_pool.servers():
+        mcp_server_up.labels(slot=str(server["slot"])).set(int(server["alive"]))
+        mcp_server_generation.labels(slot=str(server["slot"])).set(server["generation"])
+
+metrics.add_collector(_collect_state_metrics)
+
+# One long-lived runner for /chat; turns continue sessions in session_service
+chat_runner = Runner(
+    app_name=APP_NAME,
+    agent=root_agent,
+    session_service=session_service,
+    artifact_service=artifact_service
+)
+
 class ChatRequest(BaseModel):
     message: str
+    user_id: Optional[str] = None
+    session_id: Optional[str] = None
+    profile_id: Optional[str] = None
 
 class ChatResponse(BaseModel):
     response: str
     status: str = "success"
+    user_id: Optional[str] = None
+    session_id: Optional[str] = None
 
 class MCPAirbnbRequest(BaseModel):
     message: str
+    user_id: Optional[str] = None
+    session_id: Optional[str] = None
+    profile_id: Optional[str] = None
 
 class MCPAirbnbResponse(BaseModel):
     response: str
     status: str = "success"
+    user_id: Optional[str] = None
+    session_id: Optional[str] = None
     function_calls: Optional[list] = None
     function_responses: Optional[list] = None
 
-# Global variable to store MCP tools and exit stack
-mcp_tools = None
-mcp_exit_stack = None
-
-async def get_mcp_tools_async():
-    """Gets tools from Airbnb MCP Server."""
-    global mcp_tools, mcp_exit_stack
-    if mcp_tools is None:
-        print("Setting up Airbnb MCP Server...")
-        mcp_toolset = MCPToolset(
-            connection_params=StdioServerParameters(
-                command="npx",
-                args=["-y", "@openbnb/mcp-server-airbnb", "--ignore-robots-txt"],
-            )
-        )
-        mcp_tools = await mcp_toolset.get_tools()
-        mcp_exit_stack = mcp_toolset
-        print("✅ Airbnb MCP Server connected")
-    return mcp_tools, mcp_exit_stack
-
-def find_agent(agent, target_name):
-    """A convenient function to find an agent from an existing agent graph."""
-    result = None
-    if agent.name == target_name:
-        return agent
-    for sub_agent in agent.sub_agents:
-        result = find_agent(sub_agent, target_name)
-        if result:
-            break
-    for tool in agent.tools:
-        if isinstance(tool, AgentTool):
-            result = find_agent(tool.agent, target_name)
-            if result:
+class StreamFormat(str, Enum):
+    SSE = "sse"
+    NDJSON = "ndjson"
+
+# Run config for the streaming endpoints: the model yields partial text as it is generated
+STREAMING_RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+
+def _event_payloads(event) -> list[Dict[str, Any]]:
+    """Flattens an ADK event into the text, function call and function response items clients render."""
+    payloads = []
+    if not event.content or not event.content.parts:
+        return payloads
+    for part in event.content.parts:
+        if part.text:
+            payloads.append({
+                "type": "text",
+                "author": event.author,
+                "text": part.text,
+                "partial": bool(event.partial),
+            })
+        if part.function_call:
+            payloads.append({
+                "type": "function_call",
+                "author": event.author,
+                "name": part.function_call.name,
+                "args": part.function_call.args,
+            })
+        if part.function_response:
+            payloads.append({
+                "type": "function_response",
+                "author": event.author,
+                "name": part.function_response.name,
+                "response": part.function_response.response,
+            })
+    return payloads
+
+def _encode_payload(payload: Dict[str, Any], stream_format: StreamFormat) -> str:
+    """Encodes one payload as a Server-Sent Event or an NDJSON line."""
+    data = json.dumps(jsonable_encoder(payload), default=str)
+    if stream_format == StreamFormat.NDJSON:
+        return data + "\n"
+    return f"data: {data}\n\n"
+
+async def _forward_events(http_request: Request, events: AsyncIterator, stream_format: StreamFormat) -> AsyncIterator[str]:
+    """
+    Encodes agent events as they are yielded.
+
+    The runner is only advanced when the client has consumed the previous chunk, and it is
+    closed (stopping the agent run) when the client disconnects or the response is cancelled.
+    """
+    async with aclosing(events):
+        async for event in events:
+            if await http_request.is_disconnected():
                 break
-    return result
-
-async def get_agent_with_mcp_async():
-    """Creates an ADK Agent with tools from Airbnb MCP Server."""
-    tools, exit_stack = await get_mcp_tools_async()
-    print("Inserting Airbnb MCP tools into Travel-Concierge...")
-    planner = find_agent(root_agent, "planning_agent")
-    if planner:
-        print(f"✅ Found {planner.name}, adding MCP tools")
-        # Clear existing MCP tools to avoid duplicates
-        planner.tools = [tool for tool in planner.tools if not hasattr(tool, 'name') or not tool.name.startswith('airbnb_')]
-        planner.tools.extend(tools)
-    else:
-        print("⚠️ planning_agent not found")
-    return root_agent, exit_stack
+            for payload in _event_payloads(event):
+                yield _encode_payload(payload, stream_format)
 
-@app.post("/mcp-airbnb", response_model=MCPAirbnbResponse)
-async def mcp_airbnb(request: MCPAirbnbRequest):
-    """Send a message to the travel concierge agent with Airbnb MCP tools enabled"""
+async def _run_turn(
+    runner: Runner, user_id: str, session_id: str, content: Content, run_config: Optional[RunConfig] = None
+) -> AsyncIterator:
+    """
+    Yields the events of one turn, then writes the session's buffered events.
+
+    They are written however the turn ends: with its final response, an error,
+    or the client going away, so other workers see every event of the turn.
+    """
+    events = runner.run_async(user_id=user_id, session_id=session_id, new_message=content, run_config=run_config)
     try:
-        # Generate unique session and user IDs for each request
-        session_id = str(uuid.uuid4())
-        user_id = f"user_{uuid.uuid4().hex[:8]}"
-        
-        # Create session in session service
-        await session_service.create_session(
-            app_name="travel-concierge",
+        async with aclosing(events):
+            async for event in events:
+                yield event
+    finally:
+        await session_service.flush_session(app_name=APP_NAME, user_id=user_id, session_id=session_id)
+
+def _streaming_response(chunks: AsyncIterator[str], stream_format: StreamFormat) -> StreamingResponse:
+    media_type = "application/x-ndjson" if stream_format == StreamFormat.NDJSON else "text/event-stream"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+async def _get_or_create_session(
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None,
+    profile_id: Optional[str] = None
+) -> tuple[str, str]:
+    """
+    Returns the user and session IDs for a turn.
+
+    An existing session is continued as is; otherwise a new one is created, with
+    the requested session_id if given, and a generated user_id if none was given.
+    A new session starts from the catalog profile profile_id, if given. Either way
+    the session's trip, if it has one, is monitored in the background for a while,
+    see trip_monitor.
+    """
+    if session_id and not user_id:
+        raise HTTPException(status_code=400, detail="user_id is required to continue a session")
+    if profile_id and profile_id not in profile_catalog:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    user_id = user_id or f"user_{uuid.uuid4().hex[:8]}"
+    session = None
+    if session_id:
+        session = await session_service.get_session(
+            app_name=APP_NAME,
             user_id=user_id,
             session_id=session_id
         )
+    if session is None:
+        session = await session_service.create_session(
+            app_name=APP_NAME,
+            user_id=user_id,
+            session_id=session_id,
+            state={constants.PROFILE_ID: profile_id} if profile_id else None
+        )
+    trip_monitor.track(session)
+    return user_id, session.id
+
+@app.post("/mcp-airbnb", response_model=MCPAirbnbResponse)
+async def mcp_airbnb(request: MCPAirbnbRequest):
+    """Send a message to the travel concierge agent with Airbnb MCP tools enabled"""
+    try:
+        # Continue the requested session, or create one with unique session and user IDs
+        user_id, session_id = await _get_or_create_session(request.user_id, request.session_id, request.profile_id)
         
         # Create content from message
         content = Content(
@@ -126,44 +325,32 @@ async def mcp_airbnb(request: MCPAirbnbRequest):
             role="user"
         )
         
-        # Get agent with MCP tools
-        agent, exit_stack = await get_agent_with_mcp_async()
-        
-        # Create runner for this request
-        runner = Runner(
-            app_name="travel-concierge",
-            agent=agent,
-            session_service=session_service
-        )
-        
         # Run the agent and collect response
         response_text = ""
         function_calls = []
         function_responses = []
-        
-        async for event in runner.run_async(
-            user_id=user_id,
-            session_id=session_id,
-            new_message=content
-        ):
-            # Extract text from events
-            if hasattr(event, 'content') and event.content:
-                if hasattr(event.content, 'parts') and event.content.parts:
-                    for part in event.content.parts:
-                        if part.text:
-                            response_text += part.text
-                        if part.function_call:
-                            function_calls.append({
-                                "name": part.function_call.name,
-                                "args": part.function_call.args
-                            })
-                        if part.function_response:
-                            function_responses.append({
-                                "name": part.function_response.name,
-                                "response": part.function_response.response
-                            })
-                elif hasattr(event.content, 'text'):
-                    response_text += event.content.text
+
+        # Borrow a pre-warmed MCP server for the duration of the run
+        async with mcp_pool.checkout() as mcp_server:
+            # Get the agent graph with this server's MCP tools on the planning_agent
+            agent = mcp_agent_graphs.get(mcp_server.toolset, mcp_server.tools)
+
+            # Create runner for this request
+            runner = Runner(
+                app_name=APP_NAME,
+                agent=agent,
+                session_service=session_service
+            )
+
+            async for event in _run_turn(runner, user_id, session_id, content):
+                # Extract text, function calls and function responses from events
+                for payload in _event_payloads(event):
+                    if payload["type"] == "text":
+                        response_text += payload["text"]
+                    elif payload["type"] == "function_call":
+                        function_calls.append({"name": payload["name"], "args": payload["args"]})
+                    elif payload["type"] == "function_response":
+                        function_responses.append({"name": payload["name"], "response": payload["response"]})
         
         # If no response text was collected, provide a default response
         if not response_text.strip():
@@ -172,18 +359,121 @@ async def mcp_airbnb(request: MCPAirbnbRequest):
         return MCPAirbnbResponse(
             response=response_text,
             status="success",
+            user_id=user_id,
+            session_id=session_id,
             function_calls=function_calls if function_calls else None,
             function_responses=function_responses if function_responses else None
         )
         
+    except HTTPException:
+        raise
+    except MCPPoolError as e:
+        raise HTTPException(status_code=503, detail=f"Airbnb MCP server unavailable: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process message: {str(e)}")
 
+@app.post("/mcp-airbnb/stream")
+async def mcp_airbnb_stream(request: MCPAirbnbRequest, http_request: Request, format: StreamFormat = StreamFormat.SSE):
+    """Stream text deltas, function calls and function responses from the agent with Airbnb MCP tools enabled"""
+    user_id, session_id = await _get_or_create_session(request.user_id, request.session_id, request.profile_id)
+    content = Content(parts=[Part.from_text(text=request.message)], role="user")
+
+    async def stream():
+        try:
+            async with mcp_pool.checkout() as mcp_server:
+                runner = Runner(
+                    app_name=APP_NAME,
+                    agent=mcp_agent_graphs.get(mcp_server.toolset, mcp_server.tools),
+                    session_service=session_service
+                )
+                events = _run_turn(runner, user_id, session_id, content, STREAMING_RUN_CONFIG)
+                async for chunk in _forward_events(http_request, events, format):
+                    yield chunk
+            yield _encode_payload({"type": "done", "session_id": session_id}, format)
+        except MCPPoolError as e:
+            yield _encode_payload({"type": "error", "detail": f"Airbnb MCP server unavailable: {str(e)}"}, format)
+        except Exception as e:
+            yield _encode_payload({"type": "error", "detail": f"Failed to process message: {str(e)}"}, format)
+
+    return _streaming_response(stream(), format)
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest, http_request: Request, format: StreamFormat = StreamFormat.SSE):
+    """Stream text deltas, function calls and function responses from the travel concierge agent"""
+    user_id, session_id = await _get_or_create_session(request.user_id, request.session_id, request.profile_id)
+    content = Content(parts=[Part.from_text(text=request.message)], role="user")
+
+    async def stream():
+        try:
+            events = _run_turn(chat_runner, user_id, session_id, content, STREAMING_RUN_CONFIG)
+            async for chunk in _forward_events(http_request, events, format):
+                yield chunk
+            yield _encode_payload({"type": "done", "session_id": session_id}, format)
+        except Exception as e:
+            yield _encode_payload({"type": "error", "detail": f"Failed to process message: {str(e)}"}, format)
+
+    return _streaming_response(stream(), format)
+
 @app.post("/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest):
-    """Send a message to the travel concierge agent"""
-    # ...existing code for chat endpoint...
-    pass
+    """Send a message to the travel concierge agent, continuing the session if one is given"""
+    try:
+        user_id, session_id = await _get_or_create_session(request.user_id, request.session_id, request.profile_id)
+
+        content = Content(
+            parts=[Part.from_text(text=request.message)],
+            role="user"
+        )
+
+        response_text = ""
+        async for event in _run_turn(chat_runner, user_id, session_id, content):
+            for payload in _event_payloads(event):
+                if payload["type"] == "text":
+                    response_text += payload["text"]
+
+        # If no response text was collected, provide a default response
+        if not response_text.strip():
+            response_text = "I'm processing your request. Please try again."
+
+        return ChatResponse(
+            response=response_text,
+            status="success",
+            user_id=user_id,
+            session_id=session_id
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to process message: {str(e)}")
+
+@app.get("/profiles")
+async def profiles():
+    """List the profiles a new session can start from, see profile_id on /chat"""
+    return {"profiles": profile_catalog.ids()}
+
+@app.get("/health")
+async def health():
+    """Liveness: answers as long as the worker serves requests"""
+    return {"status": "healthy", "service": "travel_concierge_api"}
+
+@app.get("/ready")
+async def ready():
+    """Readiness: whether the MCP pool, session store and model can serve requests"""
+    ok, checks = await readiness(readiness_checks)
+    return JSONResponse(
+        {"status": "ready" if ok else "not ready", "checks": jsonable_encoder(checks)},
+        status_code=200 if ok else 503,
+    )
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """
+    Request, session, MCP pool, agent, model and tool metrics, in the Prometheus text format
+
+    Under gunicorn the metrics of all workers are aggregated, see PROMETHEUS_MULTIPROC_DIR in README_UVICORN.md
+    """
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
 
 @app.get("/")
 async def root():
@@ -191,10 +481,15 @@ async def root():
         "version": "1.0.0",
         "docs": "/docs",
         "health": "/health",
+        "ready": "/ready",
         "chat": "/chat",
-        "mcp-airbnb": "/mcp-airbnb"
+        "chat-stream": "/chat/stream",
+        "mcp-airbnb": "/mcp-airbnb",
+        "mcp-airbnb-stream": "/mcp-airbnb/stream",
+        "profiles": "/profiles",
+        "metrics": "/metrics"
     }
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
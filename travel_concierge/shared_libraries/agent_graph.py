@@ -0,0 +1,101 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Builds variants of the agent graph without mutating the shared root_agent."""
+
+import copy
+import weakref
+from typing import Any, Sequence
+
+from google.adk.agents import BaseAgent
+from google.adk.tools.agent_tool import AgentTool
+
+from travel_concierge.shared_libraries.agent_registry import AgentRegistry
+
+
+def _copy_agent(agent: BaseAgent, target_name: str, extra_tools: Sequence[Any]) -> tuple[BaseAgent, bool]:
+    """Copies `agent` and its sub-agents, returning the copy and whether the target was found."""
+    found = agent.name == target_name
+    sub_agents = []
+    for sub_agent in agent.sub_agents:
+        sub_copy, sub_found = _copy_agent(sub_agent, target_name, extra_tools)
+        sub_agents.append(sub_copy)
+        found = found or sub_found
+
+    update: dict[str, Any] = {"sub_agents": sub_agents, "parent_agent": None}
+    if hasattr(agent, "tools"):
+        tools = []
+        for tool in agent.tools:
+            if isinstance(tool, AgentTool):
+                inner_copy, inner_found = _copy_agent(tool.agent, target_name, extra_tools)
+                if inner_found:
+                    tool = copy.copy(tool)
+                    tool.agent = inner_copy
+                    found = True
+            tools.append(tool)
+        if agent.name == target_name:
+            tools.extend(extra_tools)
+        update["tools"] = tools
+
+    agent_copy = agent.model_copy(update=update)
+    for sub_copy in sub_agents:
+        sub_copy.parent_agent = agent_copy
+    return agent_copy, found
+
+
+def with_extra_tools(root: BaseAgent, agent_name: str, extra_tools: Sequence[Any]) -> BaseAgent:
+    """
+    Returns a copy of the agent tree rooted at `root` where `agent_name` also carries `extra_tools`.
+
+    The original tree is left untouched, so it can keep serving other requests.
+
+    Args:
+        root: The root of the agent tree, e.g. root_agent.
+        agent_name: The name of the agent receiving the extra tools.
+        extra_tools: The tools to append to that agent.
+
+    Returns:
+        The root of the copied tree.
+    """
+    root_copy, found = _copy_agent(root, agent_name, extra_tools)
+    if not found:
+        raise ValueError(f"Agent {agent_name} not found under {root.name}.")
+    return root_copy
+
+
+class AgentGraphCache:
+    """
+    Caches one tool-extended copy of the agent tree per toolset.
+
+    Entries are keyed by the toolset object itself and dropped once it is
+    garbage collected, so a respawned MCP server gets a freshly built graph.
+    Returned graphs are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, registry: AgentRegistry, agent_name: str):
+        registry.get(agent_name)  # Fail at startup rather than on the first request.
+        self._root = registry.root
+        self._agent_name = agent_name
+        self._graphs: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def get(self, toolset: Any, tools: Sequence[Any]) -> BaseAgent:
+        """Returns the graph for `toolset`, building it from `tools` on first use."""
+        graph = self._graphs.get(toolset)
+        if graph is None:
+            graph = with_extra_tools(self._root, self._agent_name, tools)
+            self._graphs[toolset] = graph
+        return graph
+
+    def __len__(self) -> int:
+        return len(self._graphs)
@@ -0,0 +1,98 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""An index of every agent in an agent graph, built once from its root."""
+
+from typing import Iterator, Optional
+
+from google.adk.agents import BaseAgent
+from google.adk.tools.agent_tool import AgentTool
+
+
+class DuplicateAgentError(ValueError):
+    """Raised when two different agents in one graph share a name."""
+
+
+class AgentRegistry:
+    """
+    Indexes the agents reachable from a root agent by name.
+
+    Agents are reached through `sub_agents` and through the agents wrapped by
+    `AgentTool`s. For each one the registry records its parent (the agent that
+    lists it as a sub-agent or tool) and, if any, the `AgentTool` wrapping it.
+    """
+
+    def __init__(self, root: BaseAgent):
+        self.root = root
+        self._agents: dict[str, BaseAgent] = {}
+        self._parents: dict[str, Optional[BaseAgent]] = {}
+        self._agent_tools: dict[str, Optional[AgentTool]] = {}
+        self._index(root, None, None)
+
+    def _index(self, agent: BaseAgent, parent: Optional[BaseAgent], agent_tool: Optional[AgentTool]):
+        existing = self._agents.get(agent.name)
+        if existing is not None:
+            if existing is not agent:
+                raise DuplicateAgentError(
+                    f"Agent name {agent.name} is used by more than one agent"
+                    f" (under {self._parents[agent.name].name if self._parents[agent.name] else None}"
+                    f" and under {parent.name if parent else None})."
+                )
+            return  # The same agent reused in several places keeps its first owner.
+
+        self._agents[agent.name] = agent
+        self._parents[agent.name] = parent
+        self._agent_tools[agent.name] = agent_tool
+
+        for sub_agent in agent.sub_agents:
+            self._index(sub_agent, agent, None)
+        for tool in getattr(agent, "tools", []):
+            if isinstance(tool, AgentTool):
+                self._index(tool.agent, agent, tool)
+
+    def get(self, name: str) -> BaseAgent:
+        """Returns the agent called `name`, raising KeyError if there is none."""
+        try:
+            return self._agents[name]
+        except KeyError:
+            raise KeyError(f"Agent {name} not found under {self.root.name}.") from None
+
+    def parent(self, name: str) -> Optional[BaseAgent]:
+        """Returns the agent that owns `name` as a sub-agent or AgentTool, None for the root."""
+        self.get(name)
+        return self._parents[name]
+
+    def agent_tool(self, name: str) -> Optional[AgentTool]:
+        """Returns the AgentTool wrapping `name`, None if it is a plain sub-agent or the root."""
+        self.get(name)
+        return self._agent_tools[name]
+
+    def path_to_root(self, name: str) -> list[BaseAgent]:
+        """Returns the agents from `name` up to and including the root."""
+        path = [self.get(name)]
+        while (parent := self._parents[path[-1].name]) is not None:
+            path.append(parent)
+        return path
+
+    def __getitem__(self, name: str) -> BaseAgent:
+        return self.get(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._agents
+
+    def __iter__(self) -> Iterator[BaseAgent]:
+        return iter(self._agents.values())
+
+    def __len__(self) -> int:
+        return len(self._agents)
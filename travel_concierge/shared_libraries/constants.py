@@ -16,6 +16,7 @@
 
 SYSTEM_TIME = "_time"
 ITIN_INITIALIZED = "_itin_initialized"
+PROFILE_ID = "_profile_id"
 
 ITIN_KEY = "itinerary"
 PROF_KEY = "user_profile"
@@ -23,6 +24,7 @@ PROF_KEY = "user_profile"
 ITIN_START_DATE = "itinerary_start_date"
 ITIN_END_DATE = "itinerary_end_date"
 ITIN_DATETIME = "itinerary_datetime"
+DAILY_CHECKS = "daily_checks"
 
 START_DATE = "start_date"
 END_DATE = "end_date"
@@ -0,0 +1,320 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A deterministic stand-in for Gemini, for benchmarks and tests without Vertex AI.
+
+It replays scripted conversations: for a user message found in a script it
+makes the recorded tool calls, in order, as each agent that owns the tool gets
+its turn, and then gives the recorded final response. Agents with an
+output_schema get their scripted output, or JSON made up from the schema.
+Select it for every agent with
+
+    TRAVEL_CONCIERGE_MODEL=fake uvicorn travel_concierge.api:app
+
+Scripts are JSON files in the format of fake_llm_script.json, or ADK eval
+sets such as eval/data/*.test.json.
+"""
+
+import asyncio
+import collections
+import functools
+import json
+import os
+import re
+import warnings
+from typing import Any, AsyncGenerator, Dict, Iterable, List, Optional, Tuple
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+from pydantic import BaseModel
+
+SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "fake_llm_script.json")
+
+# Scripts to replay, separated by os.pathsep; the bundled plan-and-book script by default
+FAKE_LLM_SCRIPTS = [path for path in os.getenv("FAKE_LLM_SCRIPTS", SCRIPT_PATH).split(os.pathsep) if path]
+# Seconds before the first token of a response, and for each token after it
+FAKE_LLM_FIRST_TOKEN_LATENCY = float(os.getenv("FAKE_LLM_FIRST_TOKEN_LATENCY", "0"))
+FAKE_LLM_TOKEN_LATENCY = float(os.getenv("FAKE_LLM_TOKEN_LATENCY", "0"))
+
+# Tokens sent in each partial response when streaming
+STREAM_CHUNK_TOKENS = 8
+# The date used for YYYY-MM-DD and ISO 8601 fields of made-up outputs
+SYNTHETIC_DATE = "2025-06-15"
+
+_AGENT_NAME = re.compile(r'Your internal name is "([^"]+)"')
+_CALLED_TOOL = re.compile(r"\] called tool `([^`]+)`")
+_EXAMPLE = re.compile(r"(?:e\.g\.|i\.e\.),?\s*([^,;()]+)")
+
+
+def normalize_message(text: str) -> str:
+    """Returns the key a user message is looked up by, ignoring case and spacing."""
+    return " ".join(text.casefold().split())
+
+
+def count_tokens(text: str) -> int:
+    """Roughly how many tokens `text` is, at four characters a token."""
+    return max(1, len(text) // 4) if text else 0
+
+
+class FakeScript:
+    """
+    Scripted conversation turns, and outputs of agents with an output_schema.
+
+    A turn is `{"user": ..., "tool_uses": [{"name": ..., "args": {...}}],
+    "final_response": ...}`; outputs map an agent name to its JSON output.
+    """
+
+    def __init__(self, turns: Iterable[Dict[str, Any]] = (), outputs: Optional[Dict[str, Any]] = None):
+        self.turns: Dict[str, Dict[str, Any]] = {}
+        for turn in turns:
+            # The first script to record a message wins.
+            self.turns.setdefault(normalize_message(turn["user"]), turn)
+        self.outputs: Dict[str, Any] = dict(outputs or {})
+
+    def find_turn(self, message: str) -> Optional[Dict[str, Any]]:
+        return self.turns.get(normalize_message(message))
+
+    def merge(self, other: "FakeScript"):
+        for key, turn in other.turns.items():
+            self.turns.setdefault(key, turn)
+        for name, output in other.outputs.items():
+            self.outputs.setdefault(name, output)
+
+
+def _text(content: Optional[Dict[str, Any]]) -> str:
+    return "".join(part.get("text") or "" for part in (content or {}).get("parts") or [])
+
+
+def _eval_set_turns(eval_set: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Converts the conversations of an ADK eval set into script turns."""
+    return [
+        {
+            "user": _text(invocation["user_content"]),
+            "tool_uses": [
+                {"name": tool_use["name"], "args": tool_use.get("args") or {}}
+                for tool_use in (invocation.get("intermediate_data") or {}).get("tool_uses", [])
+            ],
+            "final_response": _text(invocation.get("final_response")),
+        }
+        for case in eval_set["eval_cases"]
+        for invocation in case["conversation"]
+    ]
+
+
+def load_script(path: str) -> FakeScript:
+    """Loads a script file, or an ADK eval set file."""
+    with open(path, "r") as file:
+        data = json.load(file)
+    if "eval_cases" in data:
+        return FakeScript(_eval_set_turns(data))
+    return FakeScript(data.get("turns", []), data.get("outputs"))
+
+
+@functools.lru_cache(maxsize=None)
+def load_scripts(paths: Tuple[str, ...]) -> FakeScript:
+    """Loads and merges script files, earlier files taking precedence; cached."""
+    script = FakeScript()
+    for path in paths:
+        script.merge(load_script(path))
+    return script
+
+
+def _example_value(description: str) -> Optional[str]:
+    """Picks a plausible string out of a field description, e.g. "HH:MM format, e.g. 16:00"."""
+    if "ISO 8601" in description:
+        return f"{SYNTHETIC_DATE}T08:00:00"
+    if "YYYY-MM-DD" in description:
+        return SYNTHETIC_DATE
+    match = _EXAMPLE.search(description)
+    if match:
+        return match.group(1).rstrip(". ").strip("'\" ") or None
+    if "HH:MM" in description:
+        return "16:00"
+    return None
+
+
+def synthesize(schema: Dict[str, Any], defs: Optional[Dict[str, Any]] = None, name: str = "value") -> Any:
+    """Makes up a value valid for a JSON schema, the same every time."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return synthesize(defs[schema["$ref"].split("/")[-1]], defs, name)
+    if "default" in schema and not isinstance(schema["default"], (list, dict)):
+        return schema["default"]
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            options = [option for option in schema[key] if option.get("type") != "null"]
+            return synthesize(options[0], defs, name) if options else None
+    kind = schema.get("type", "string")
+    if kind == "object":
+        return {
+            prop: synthesize(prop_schema, defs, prop)
+            for prop, prop_schema in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [synthesize(schema.get("items", {}), defs, name) for _ in range(2)]
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 4.5
+    if kind == "boolean":
+        return True
+    if kind == "null":
+        return None
+    return _example_value(schema.get("description", "")) or f"Sample {schema.get('title', name)}"
+
+
+def _json_schema(response_schema: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(response_schema, type) and issubclass(response_schema, BaseModel):
+        with warnings.catch_warnings():
+            # E.g. Itinerary.destination, whose default is not JSON
+            warnings.simplefilter("ignore")
+            return response_schema.model_json_schema()
+    if isinstance(response_schema, dict):
+        return response_schema
+    return None
+
+
+class FakeLlm(BaseLlm):
+    """
+    Replays FAKE_LLM_SCRIPTS instead of calling a model, with simulated latency.
+
+    Model names "fake" and "fake/<anything>" resolve to it, so agents keep a
+    plain model string.
+    """
+
+    scripts: List[str] = FAKE_LLM_SCRIPTS
+    first_token_latency: float = FAKE_LLM_FIRST_TOKEN_LATENCY
+    token_latency: float = FAKE_LLM_TOKEN_LATENCY
+    default_response: str = "I'm {agent}. How can I help with your trip?"
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        return [r"fake(/.+)?"]
+
+    @property
+    def script(self) -> FakeScript:
+        return load_scripts(tuple(self.scripts))
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        content = self.respond(llm_request)
+        text = "".join(part.text or "" for part in content.parts)
+        output_tokens = count_tokens(text or json.dumps([
+            part.function_call.model_dump(mode="json", exclude_none=True) for part in content.parts
+        ]))
+        prompt_tokens = self._prompt_tokens(llm_request)
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=output_tokens,
+            total_token_count=prompt_tokens + output_tokens,
+        )
+
+        await self._sleep(self.first_token_latency)
+        if stream and text:
+            words = re.findall(r"\S+\s*", text)
+            step = max(1, STREAM_CHUNK_TOKENS * len(words) // output_tokens)
+            for start in range(0, len(words), step):
+                chunk = "".join(words[start:start + step])
+                await self._sleep(self.token_latency * count_tokens(chunk))
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=chunk)]),
+                    partial=True,
+                )
+        else:
+            await self._sleep(self.token_latency * output_tokens)
+        yield LlmResponse(content=content, usage_metadata=usage, turn_complete=True)
+
+    def respond(self, llm_request: LlmRequest) -> types.Content:
+        """Decides the next model response for the request, see the module docstring."""
+        agent = self._agent_name(llm_request)
+        contents = llm_request.contents or []
+        start, message = self._last_user_message(contents)
+
+        schema = _json_schema(llm_request.config.response_schema) if llm_request.config else None
+        if schema is not None:
+            output = self.script.outputs.get(agent)
+            if output is None:
+                output = synthesize(schema)
+            return self._text_content(json.dumps(output))
+
+        turn = self.script.find_turn(message) if message is not None else None
+        if turn is not None:
+            done = self._tools_called(contents[start + 1:])
+            for tool_use in turn.get("tool_uses", []):
+                name = tool_use["name"]
+                if done[name] > 0:
+                    done[name] -= 1
+                    continue
+                if name in llm_request.tools_dict:
+                    return types.Content(
+                        role="model",
+                        parts=[types.Part(function_call=types.FunctionCall(name=name, args=tool_use.get("args") or {}))],
+                    )
+                # Not this agent's tool: another agent makes the call, if any.
+                break
+            return self._text_content(turn.get("final_response") or self.default_response.format(agent=agent))
+
+        if contents and any(part.function_response for part in contents[-1].parts or []):
+            return self._text_content("Done.")
+        return self._text_content(self.default_response.format(agent=agent))
+
+    @staticmethod
+    def _text_content(text: str) -> types.Content:
+        return types.Content(role="model", parts=[types.Part(text=text)])
+
+    @staticmethod
+    def _agent_name(llm_request: LlmRequest) -> str:
+        instruction = llm_request.config.system_instruction if llm_request.config else None
+        match = _AGENT_NAME.search(instruction) if isinstance(instruction, str) else None
+        return match.group(1) if match else "an agent"
+
+    @staticmethod
+    def _last_user_message(contents: List[types.Content]) -> Tuple[int, Optional[str]]:
+        """Returns the index and text of the user's latest message, leaving out other agents' turns."""
+        for index in range(len(contents) - 1, -1, -1):
+            content = contents[index]
+            if content.role != "user" or not content.parts:
+                continue
+            text = "".join(part.text or "" for part in content.parts)
+            if text and not text.startswith("For context:"):
+                return index, text
+        return -1, None
+
+    @staticmethod
+    def _tools_called(contents: List[types.Content]) -> collections.Counter[str]:
+        """Counts the tool calls in `contents`, by this agent or by others."""
+        called: collections.Counter[str] = collections.Counter()
+        for content in contents:
+            for part in content.parts or []:
+                if part.function_call:
+                    called[part.function_call.name] += 1
+                elif part.text:
+                    called.update(_CALLED_TOOL.findall(part.text))
+        return called
+
+    @staticmethod
+    def _prompt_tokens(llm_request: LlmRequest) -> int:
+        instruction = llm_request.config.system_instruction if llm_request.config else None
+        size = len(instruction) if isinstance(instruction, str) else 0
+        for content in llm_request.contents or []:
+            for part in content.parts or []:
+                size += len(part.model_dump_json(exclude_none=True))
+        return max(1, size // 4)
+
+    @staticmethod
+    async def _sleep(seconds: float):
+        if seconds > 0:
+            await asyncio.sleep(seconds)
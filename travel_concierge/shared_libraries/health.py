@@ -0,0 +1,167 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Readiness checks of the worker's dependencies, and request metrics.
+
+The checks only read state the worker already has or make a metadata call:
+they never create a session, run an agent or spawn an MCP server.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from google.adk.models import LLMRegistry
+
+from travel_concierge.shared_libraries import metrics
+
+logger = logging.getLogger(__name__)
+
+# Seconds each readiness check may take before it counts as failed
+READINESS_CHECK_TIMEOUT = float(os.getenv("READINESS_CHECK_TIMEOUT", "5"))
+# Seconds a model reachability result is reused, so probes do not hit the model API each time
+MODEL_CHECK_INTERVAL = float(os.getenv("MODEL_CHECK_INTERVAL", "60"))
+
+Check = Callable[[], Awaitable[Dict[str, Any]]]
+
+http_requests = metrics.counter(
+    "travel_concierge_http_requests_total",
+    "HTTP requests, by route and status code.",
+    ["method", "route", "status"],
+)
+http_duration = metrics.histogram(
+    "travel_concierge_http_request_duration_seconds",
+    "Time from receiving an HTTP request to sending the last byte of its response.",
+    ["method", "route"],
+)
+http_in_flight = metrics.gauge(
+    "travel_concierge_http_requests_in_flight",
+    "HTTP requests being served, including open streams.",
+)
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware counting and timing requests by route template, e.g. /chat."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_and_record_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_and_record_status)
+        finally:
+            http_in_flight.dec()
+            # The route template, not the raw path, so metrics do not grow with ids in URLs.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_requests.labels(method=scope["method"], route=route, status=str(status)).inc()
+            http_duration.labels(method=scope["method"], route=route).observe(time.perf_counter() - started)
+
+
+def check_mcp_pool(pool) -> Check:
+    """Ready while at least one MCP server runs, or when the pool is disabled."""
+
+    async def check() -> Dict[str, Any]:
+        stats = pool.stats()
+        if pool.size <= 0:
+            return {"ok": True, "disabled": True, **stats}
+        return {"ok": pool.started and stats["alive"] > 0, **stats}
+
+    return check
+
+
+def check_session_store(store) -> Check:
+    """Ready when the session store answers, e.g. the SQLite database can be read."""
+
+    async def check() -> Dict[str, Any]:
+        ping = getattr(store, "ping", None)
+        if ping is not None:
+            await ping()
+        return {"ok": True, "backend": type(store).__name__}
+
+    return check
+
+
+class ModelCheck:
+    """
+    Checks that the model can be reached with a metadata lookup, which costs no tokens.
+
+    Results are reused for `interval` seconds, and concurrent probes share one
+    lookup. Models without an API client, such as the fake model, are always ready.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        interval: float = MODEL_CHECK_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.model = model
+        self.interval = interval
+        self._clock = clock
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._llm = None
+        self._lock = asyncio.Lock()
+
+    async def __call__(self) -> Dict[str, Any]:
+        async with self._lock:
+            if self._result is None or self._clock() - self._checked_at >= self.interval:
+                self._result = await self._lookup()
+                self._checked_at = self._clock()
+            return self._result
+
+    async def _lookup(self) -> Dict[str, Any]:
+        try:
+            if self._llm is None:
+                self._llm = LLMRegistry.new_llm(self.model)
+            client = getattr(self._llm, "api_client", None)
+            if client is None:
+                return {"ok": True, "model": self.model, "remote": False}
+            await asyncio.wait_for(client.aio.models.get(model=self._llm.model), READINESS_CHECK_TIMEOUT)
+        except Exception as e:
+            logger.warning("Model %s is not reachable: %r", self.model, e)
+            return {"ok": False, "model": self.model, "error": repr(e)}
+        return {"ok": True, "model": self.model, "remote": True}
+
+
+async def _run_check(check: Check, timeout: float) -> Dict[str, Any]:
+    try:
+        return await asyncio.wait_for(check(), timeout)
+    except asyncio.TimeoutError:
+        return {"ok": False, "error": f"timed out after {timeout}s"}
+    except Exception as e:
+        return {"ok": False, "error": repr(e)}
+
+
+async def readiness(checks: Dict[str, Check], timeout: float = READINESS_CHECK_TIMEOUT) -> Tuple[bool, Dict[str, Any]]:
+    """Runs `checks` concurrently; returns whether all passed, and each one's result."""
+    results = await asyncio.gather(*(_run_check(check, timeout) for check in checks.values()))
+    results = dict(zip(checks, results))
+    return all(result["ok"] for result in results.values()), results
@@ -0,0 +1,216 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pooled HTTP clients with timeouts, retries and a circuit breaker."""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import httpx
+
+# Responses worth retrying: rate limiting and server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Fails fast after repeated failures, then lets a trial request through.
+
+    The breaker opens after `failure_threshold` failures in a row. While open,
+    requests are refused until `reset_timeout` seconds have passed; then one
+    request is let through, which closes the breaker if it succeeds and opens
+    it again if it fails. A trial that never reports back is replaced by a new
+    one after another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_started_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self._clock() - self.opened_at < self.reset_timeout:
+            return "open"
+        return "half_open"
+
+    def before_request(self):
+        """Raises CircuitOpenError if the request must not be sent."""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return
+            now = self._clock()
+            trial_running = self._trial_started_at is not None and now - self._trial_started_at < self.reset_timeout
+            if state == "open" or trial_running:
+                raise CircuitOpenError("Circuit breaker is open after repeated failures")
+            self._trial_started_at = now
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_started_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_started_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = self._clock()
+            self._trial_started_at = None
+
+
+class ResilientHttpClient:
+    """
+    A keep-alive connection pool for one upstream API, for sync and async callers.
+
+    Requests time out after `connect_timeout` seconds connecting and
+    `read_timeout` seconds reading. Connection errors, timeouts and 429/5xx
+    responses are retried up to `max_retries` times, after a jittered
+    exponential backoff starting at `backoff` seconds, or after the server's
+    Retry-After if that is shorter than `max_backoff`. A request that still
+    fails counts against the circuit breaker and raises an httpx.HTTPError.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = 3,
+        read_timeout: float = 10,
+        max_retries: int = 2,
+        backoff: float = 0.2,
+        max_backoff: float = 5,
+        max_connections: int = 20,
+        breaker: Optional[CircuitBreaker] = None,
+        transport: Optional[Any] = None,
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker or CircuitBreaker()
+        self._client_options = dict(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+        )
+        self._client = httpx.Client(**self._client_options)
+        self._async_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._async_clients_lock = threading.Lock()
+
+    def get(self, url: str, params: Optional[dict[str, Any]] = None) -> httpx.Response:
+        """Sends a GET request, retrying it as needed, and returns the successful response."""
+        self.breaker.before_request()
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self._client.get(url, params=params)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    self.breaker.record_failure()
+                    raise
+                time.sleep(self._delay(attempt))
+                continue
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(self._delay(attempt, response))
+                continue
+            return self._finish(response)
+
+    async def aget(self, url: str, params: Optional[dict[str, Any]] = None) -> httpx.Response:
+        """The async version of get, sharing its connection pool per event loop."""
+        self.breaker.before_request()
+        client = self._get_async_client()
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await client.get(url, params=params)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    self.breaker.record_failure()
+                    raise
+                await asyncio.sleep(self._delay(attempt))
+                continue
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                await asyncio.sleep(self._delay(attempt, response))
+                continue
+            return self._finish(response)
+
+    def retry_budget(self) -> float:
+        """
+        Returns the longest a get or aget may take with every attempt timing out.
+
+        Each attempt may spend connect_timeout plus read_timeout seconds, and
+        each wait before a retry up to max_backoff seconds. A caller's own
+        timeout shorter than this cancels requests that were still retrying.
+        """
+        attempts = self.max_retries + 1
+        return attempts * (self.connect_timeout + self.read_timeout) + self.max_retries * self.max_backoff
+
+    def _finish(self, response: httpx.Response) -> httpx.Response:
+        if response.status_code in RETRY_STATUSES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        response.raise_for_status()
+        return response
+
+    def _delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        """Returns how long to wait before retrying: the server's Retry-After, or a jittered backoff."""
+        if response is not None:
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit() and int(retry_after) <= self.max_backoff:
+                return float(retry_after)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Returns the async client of the running event loop, creating it on first use.
+
+        Connections belong to the loop that opened them, so each loop gets its
+        own client. Clients of loops that have since closed are dropped, their
+        connections went with the loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                for other in [other for other in self._async_clients if other.is_closed()]:
+                    del self._async_clients[other]
+                client = self._async_clients[loop] = httpx.AsyncClient(**self._client_options)
+        return client
+
+    def close(self):
+        self._client.close()
+
+    async def aclose(self):
+        """Closes the async clients, each on its own event loop if that loop is still running."""
+        running = asyncio.get_running_loop()
+        with self._async_clients_lock:
+            clients, self._async_clients = self._async_clients, {}
+        for loop, client in clients.items():
+            if loop is running:
+                await client.aclose()
+            elif loop.is_running():
+                await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(client.aclose(), loop))
@@ -0,0 +1,143 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Instruction providers that render once per distinct value of the state they read.
+
+ADK renders an agent's instruction before every model call, formatting whole
+state values such as the itinerary into it. Between those calls the state
+rarely changes, so rendered instructions are cached, keyed by the values of
+the state keys the instruction reads: scalars by value, dicts and lists by the
+content fingerprint stored next to them (see state_fingerprints).
+"""
+
+import collections
+import functools
+import inspect
+import os
+import re
+import threading
+from typing import Awaitable, Callable, Optional, Sequence, Union
+
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.sessions.state import State
+from google.adk.utils.instructions_utils import inject_session_state
+
+from travel_concierge.shared_libraries import metrics
+from travel_concierge.shared_libraries.state_fingerprints import state_fingerprint
+
+# Rendered instructions kept per instruction, across sessions
+INSTRUCTION_CACHE_SIZE = int(os.getenv("INSTRUCTION_CACHE_SIZE", "1024"))
+
+# The placeholders ADK fills in string instructions, e.g. {itinerary} or {origin?}
+_PLACEHOLDER = re.compile(r"{+[^{}]*}+")
+_STATE_PREFIXES = (State.APP_PREFIX, State.USER_PREFIX, State.TEMP_PREFIX)
+
+Render = Callable[[ReadonlyContext], Union[str, Awaitable[str]]]
+
+instruction_renders = metrics.counter(
+    "travel_concierge_instruction_renders_total",
+    "Instructions requested, by whether the rendered text was reused (hit) or rendered (miss).",
+    ["instruction", "result"],
+)
+
+
+def _state_key(placeholder: str) -> Optional[str]:
+    """The state key a placeholder reads, as ADK resolves it; None for artifacts and literal braces."""
+    name = placeholder.lstrip("{").rstrip("}").strip().removesuffix("?")
+    prefix, sep, rest = name.rpartition(":")
+    if sep and prefix + ":" in _STATE_PREFIXES and rest.isidentifier():
+        return name
+    return name if name.isidentifier() else None
+
+
+def template_keys(template: str) -> Optional[tuple[str, ...]]:
+    """The state keys `template` reads, in order; None if it also reads artifacts."""
+    keys = []
+    for match in _PLACEHOLDER.finditer(template):
+        if match.group().lstrip("{").strip().startswith("artifact."):
+            return None
+        key = _state_key(match.group())
+        if key is not None and key not in keys:
+            keys.append(key)
+    return tuple(keys)
+
+
+class MemoizedInstruction:
+    """
+    An ADK instruction provider reusing its rendered text while `keys` keep their values.
+
+    `render` must depend on the session state through `keys` only. Entries are
+    keyed by the fingerprints of those values and hold only the rendered text,
+    so copies of a session loaded on later turns find them too.
+    """
+
+    def __init__(self, render: Render, keys: Sequence[str], name: str, maxsize: int = INSTRUCTION_CACHE_SIZE):
+        self._render = render
+        self.keys = tuple(keys)
+        self.name = name
+        self.maxsize = maxsize
+        self._cache: collections.OrderedDict[tuple, str] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        functools.update_wrapper(self, render)
+
+    async def __call__(self, readonly_context: ReadonlyContext) -> str:
+        state = readonly_context.state
+        fingerprint = tuple(state_fingerprint(state, key) for key in self.keys)
+        with self._lock:
+            cached = self._cache.get(fingerprint)
+            if cached is not None:
+                self._cache.move_to_end(fingerprint)
+                instruction_renders.labels(instruction=self.name, result="hit").inc()
+                return cached
+
+        text = self._render(readonly_context)
+        if inspect.isawaitable(text):
+            text = await text
+        instruction_renders.labels(instruction=self.name, result="miss").inc()
+        with self._lock:
+            self._cache[fingerprint] = text
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return text
+
+    def cache_clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+def memoized_instruction(*keys: str) -> Callable[[Render], MemoizedInstruction]:
+    """Decorates an instruction provider reading only the state `keys`, see MemoizedInstruction."""
+
+    def decorate(render: Render) -> MemoizedInstruction:
+        return MemoizedInstruction(render, keys, render.__name__)
+
+    return decorate
+
+
+def template_instruction(template: str, name: str) -> Union[str, MemoizedInstruction]:
+    """
+    Renders an ADK instruction template, e.g. "Itinerary: {itinerary}", as ADK would, memoized.
+
+    Templates without state placeholders are returned as they are, and so are
+    ones reading artifacts, which are not in the state and cannot be fingerprinted.
+    """
+    keys = template_keys(template)
+    if not keys:
+        return template
+
+    async def render(readonly_context: ReadonlyContext) -> str:
+        return await inject_session_state(template, readonly_context)
+
+    return MemoizedInstruction(render, keys, name)
@@ -0,0 +1,106 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A session service that layers each session's state over its shared profile."""
+
+from typing import Any, Callable, Mapping, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+from travel_concierge.shared_libraries.state_fingerprints import add_fingerprints
+
+
+class ProfileLayeredSessionService(BaseSessionService):
+    """
+    Wraps a session service so it stores only what a session changed.
+
+    The wrapped `store` keeps each session's overlay: its initial state plus the
+    state deltas of its events, e.g. the keys tools set with memorize,
+    memorize_list and forget. Sessions returned by this service also hold the
+    base layer, `base_state(overlay)`, by reference for every key the overlay
+    does not have. The base layer is shared between sessions and never
+    modified, since tools assign new values rather than changing old ones, so
+    stored state stays plain JSON and grows with edits rather than profile size.
+
+    Dicts and lists written to the state, by tools, output keys or state edits,
+    are stored with their content fingerprint, see state_fingerprints.
+    """
+
+    def __init__(
+        self,
+        store: BaseSessionService,
+        base_state: Callable[[Mapping[str, Any]], Mapping[str, Any]],
+    ):
+        self.store = store
+        self._base_state = base_state
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        if state:
+            state = add_fingerprints(dict(state))
+        session = await self.store.create_session(
+            app_name=app_name, user_id=user_id, state=state, session_id=session_id
+        )
+        return self._layer(session)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        session = await self.store.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id, config=config
+        )
+        return self._layer(session) if session is not None else None
+
+    async def list_sessions(self, *, app_name: str, user_id: Optional[str] = None) -> ListSessionsResponse:
+        return await self.store.list_sessions(app_name=app_name, user_id=user_id)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        await self.store.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.actions and event.actions.state_delta:
+            add_fingerprints(event.actions.state_delta)
+        return await self.store.append_event(session, event)
+
+    async def flush(self):
+        # Only buffering stores, such as SqliteSessionService, have anything to flush;
+        # BaseSessionService.flush does not exist in every ADK release this supports.
+        flush = getattr(self.store, "flush", None)
+        if flush is not None:
+            await flush()
+
+    async def flush_session(self, *, app_name: str, user_id: str, session_id: str):
+        """Writes the buffered events of one session, if the store buffers them."""
+        flush_session = getattr(self.store, "flush_session", None)
+        if flush_session is not None:
+            await flush_session(app_name=app_name, user_id=user_id, session_id=session_id)
+
+    def _layer(self, session: Session) -> Session:
+        """Adds the base layer under the session's own state; the store returns a copy, so it is unaffected."""
+        for key, value in self._base_state(session.state).items():
+            session.state.setdefault(key, value)
+        return session
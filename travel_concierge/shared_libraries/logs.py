@@ -0,0 +1,170 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Logging setup: JSON lines written off the event loop, with per-module levels and sampling.
+
+Modules log through `logging.getLogger(__name__)` with %-style arguments, so
+a disabled level costs one level check and nothing is formatted. Structured
+fields go in `extra`, and become keys of the JSON line:
+
+    logger.debug("Transit segment", extra={"travel_from": origin, "leave_by": leave_by})
+
+Records are handed to a queue; a listener thread formats and writes them, so
+a slow stderr never blocks a request. Configured by:
+
+    LOG_LEVEL     level of every logger without its own, default INFO
+    LOG_LEVELS    per-module levels, e.g. "travel_concierge.sub_agents.in_trip=DEBUG,google_adk=WARNING"
+    LOG_SAMPLING  share of records below WARNING kept per module, e.g. "travel_concierge.sub_agents=0.1"
+    LOG_FORMAT    json (default) or text
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+
+# Attributes every LogRecord has; anything else on a record came from `extra`.
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def parse_settings(value: str) -> Dict[str, str]:
+    """Parses "module=value,module=value" into a dict, ignoring blank entries."""
+    settings = {}
+    for item in value.split(","):
+        name, sep, setting = item.partition("=")
+        if sep and name.strip():
+            settings[name.strip()] = setting.strip()
+    return settings
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a share of the records below WARNING of each configured module; all records of others."""
+
+    def __init__(self, rates: Dict[str, float], rng: Callable[[], float] = random.random):
+        super().__init__()
+        # Longest names first, so a module's own rate wins over its package's.
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self._rng = rng
+
+    def rate(self, name: str) -> float:
+        for prefix, rate in self.rates:
+            if name == prefix or name.startswith(prefix + "."):
+                return rate
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1.0 or self._rng() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object per line, with its `extra` fields as keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queues records with their arguments and exception rendered, keeping `extra` fields."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The record is formatted later, on the listener thread; arguments may
+        # change by then, so they are rendered into the message here.
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(
+    level: str = LOG_LEVEL,
+    levels: str = LOG_LEVELS,
+    sampling: str = LOG_SAMPLING,
+    log_format: str = LOG_FORMAT,
+    stream=None,
+) -> logging.Handler:
+    """
+    Routes the root logger through a queue to `stream` (default stderr).
+
+    Replaces the root handlers, so calling it again reconfigures logging.
+    Returns the handler records are queued to.
+    """
+    global _listener
+    stop_logging()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    if log_format == "text":
+        output.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    else:
+        output.setFormatter(JsonFormatter())
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    handler = _QueueHandler(records)
+    rates = {name: float(rate) for name, rate in parse_settings(sampling).items()}
+    if rates:
+        handler.addFilter(SamplingFilter(rates))
+    _listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(level.upper())
+    for name, module_level in parse_settings(levels).items():
+        logging.getLogger(name).setLevel(module_level.upper())
+    return handler
+
+
+def stop_logging():
+    """Writes out queued records and stops the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
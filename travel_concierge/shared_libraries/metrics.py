@@ -0,0 +1,119 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prometheus counters, gauges and histograms, aggregated across gunicorn workers.
+
+When PROMETHEUS_MULTIPROC_DIR is set, as gunicorn.conf.py does, every worker
+writes its samples to files in that directory and /metrics renders the sum of
+all of them, so any worker can answer a scrape. Gauges say how their values
+are combined, see `gauge`. Without it, as under a single uvicorn process,
+/metrics renders the samples of this process.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Callable, List, Literal, Sequence
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Where each worker writes its samples; read by prometheus_client itself, set it before starting the workers
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+# Seconds between refreshes of the state gauges of each worker when workers are aggregated
+METRICS_COLLECT_INTERVAL = float(os.getenv("METRICS_COLLECT_INTERVAL", "15"))
+
+# Seconds, from a fast tool call to a long agent run
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# How the values of a gauge in several workers are combined: summed, the
+# largest, or one series per worker (with a pid label); dead workers are left out
+GaugeMode = Literal["livesum", "livemax", "liveall"]
+
+_collectors: List[Callable[[], None]] = []
+_collectors_lock = threading.Lock()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return Counter(name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = (), mode: GaugeMode = "livesum") -> Gauge:
+    return Gauge(name, documentation, labelnames, multiprocess_mode=mode)
+
+
+def histogram(
+    name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DURATION_BUCKETS
+) -> Histogram:
+    return Histogram(name, documentation, labelnames, buckets=buckets)
+
+
+def value(name: str, **labels: str) -> float:
+    """Returns a sample of this process, e.g. value("http_requests_total", route="/chat"), or 0 if there is none."""
+    sample = REGISTRY.get_sample_value(name, labels)
+    return 0 if sample is None else sample
+
+
+def add_collector(collector: Callable[[], None]):
+    """Registers `collector()`, called by `collect`, e.g. to set gauges read from elsewhere."""
+    with _collectors_lock:
+        _collectors.append(collector)
+
+
+def collect():
+    """Runs every collector; one failing is logged and does not stop the others."""
+    with _collectors_lock:
+        collectors = list(_collectors)
+    for collector in collectors:
+        try:
+            collector()
+        except Exception:
+            logger.exception("Metrics collector %r failed", collector)
+
+
+async def collect_periodically(interval: float = METRICS_COLLECT_INTERVAL):
+    """
+    Runs the collectors every `interval` seconds until cancelled.
+
+    A scrape is answered by one worker, which runs its own collectors; the
+    others publish their gauges through this loop.
+    """
+    while True:
+        collect()
+        await asyncio.sleep(interval)
+
+
+def render() -> bytes:
+    """Renders the metrics of every worker, or of this process alone, in the Prometheus text format."""
+    collect()
+    if not PROMETHEUS_MULTIPROC_DIR:
+        return generate_latest(REGISTRY)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, PROMETHEUS_MULTIPROC_DIR)
+    return generate_latest(registry)
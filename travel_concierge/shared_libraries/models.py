@@ -0,0 +1,31 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The model every agent runs on, and the local backends it may name."""
+
+import os
+import re
+
+from google.adk.models import LLMRegistry
+
+from travel_concierge.shared_libraries.fake_llm import FakeLlm
+
+LLMRegistry.register(FakeLlm)
+
+# E.g. "fake" to run all agents on the scripted stand-in, see fake_llm.
+MODEL = os.getenv("TRAVEL_CONCIERGE_MODEL", "gemini-2.5-flash")
+
+if any(re.fullmatch(regex, MODEL) for regex in FakeLlm.supported_models()):
+    # Built-in Gemini tools, such as google_search, refuse other models; the fake ignores them.
+    os.environ.setdefault("ADK_DISABLE_GEMINI_MODEL_ID_CHECK", "true")
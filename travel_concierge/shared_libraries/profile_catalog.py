@@ -0,0 +1,86 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A catalog of the profile and itinerary scenarios a session can start from."""
+
+import dataclasses
+import glob
+import json
+import os
+import types
+from typing import Any, Iterable, Mapping
+
+from travel_concierge.shared_libraries.state_fingerprints import add_fingerprints
+
+# The scenarios bundled with the package, e.g. itinerary_seattle_example.json
+PROFILES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "profiles")
+
+# Additional directories of user-supplied scenarios, separated by os.pathsep
+PROFILE_DIRS = [d for d in os.getenv("TRAVEL_CONCIERGE_PROFILE_DIRS", "").split(os.pathsep) if d]
+
+
+@dataclasses.dataclass(frozen=True)
+class Profile:
+    """
+    A scenario file, identified by its file name without the extension.
+
+    `state` is shared by every session seeded from this profile, so neither it
+    nor the values in it may be modified; tools replace state values instead.
+    """
+
+    profile_id: str
+    path: str
+    state: Mapping[str, Any]
+
+
+class ProfileCatalog:
+    """Indexes scenario files once so sessions can be seeded from them by id."""
+
+    def __init__(self, directories: Iterable[str] = ()):
+        self._profiles: dict[str, Profile] = {}
+        for directory in directories:
+            self.add_directory(directory)
+
+    def add_directory(self, directory: str):
+        """Adds every *.json scenario in `directory`."""
+        for path in sorted(glob.glob(os.path.join(directory, "*.json"))):
+            self.add_file(path)
+
+    def add_file(self, path: str, profile_id: str | None = None) -> Profile:
+        """Adds one scenario file, replacing any profile with the same id."""
+        with open(path, "r") as file:
+            data = json.load(file)
+        profile_id = profile_id or os.path.splitext(os.path.basename(path))[0]
+        profile = Profile(profile_id, path, types.MappingProxyType(add_fingerprints(data["state"])))
+        self._profiles[profile_id] = profile
+        return profile
+
+    def get(self, profile_id: str) -> Profile:
+        """Returns the profile with the given id, raising KeyError if there is none."""
+        try:
+            return self._profiles[profile_id]
+        except KeyError:
+            raise KeyError(f"Profile {profile_id} not found.") from None
+
+    def ids(self) -> list[str]:
+        return sorted(self._profiles)
+
+    def __contains__(self, profile_id: object) -> bool:
+        return profile_id in self._profiles
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+
+profile_catalog = ProfileCatalog([PROFILES_DIR, *PROFILE_DIRS])
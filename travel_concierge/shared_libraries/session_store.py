@@ -0,0 +1,203 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""An in-memory session service with a bounded number of live sessions."""
+
+import collections
+import contextlib
+import contextvars
+import json
+import os
+import time
+from typing import Any, Callable, Iterator, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import InMemorySessionService, Session
+
+SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", "10000"))
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "3600"))
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", "0"))
+
+SessionKey = tuple[str, str, str]
+EvictionListener = Callable[[SessionKey, str], None]
+
+_untouched = contextvars.ContextVar("untouched_sessions", default=False)
+
+
+@contextlib.contextmanager
+def untouched_sessions() -> Iterator[None]:
+    """
+    Lets a background job read and update sessions without keeping them alive.
+
+    Within it, BoundedInMemorySessionService serves sessions as usual but leaves
+    their idle time and least-recently-used position as they were, so a job
+    visiting sessions does not hold off their idle eviction. It applies to the
+    current task and the tasks started from it, not to concurrent requests.
+    """
+    token = _untouched.set(True)
+    try:
+        yield
+    finally:
+        _untouched.reset(token)
+
+
+def _json_size(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+class _SessionUsage:
+    """Bookkeeping for one live session."""
+
+    __slots__ = ("last_access", "size")
+
+    def __init__(self, last_access: float, size: int):
+        self.last_access = last_access
+        self.size = size
+
+
+class BoundedInMemorySessionService(InMemorySessionService):
+    """
+    InMemorySessionService that evicts sessions instead of growing without bound.
+
+    Sessions are kept in least-recently-used order. A session is evicted when it
+    has been idle for longer than `idle_ttl` seconds, when more than `max_sessions`
+    are live, or when the estimated size of all sessions exceeds `max_bytes`.
+    The size of a session is estimated from its initial state plus the events
+    appended to it. A limit of 0 disables that limit. Eviction listeners are
+    called with the key of each evicted session and the reason.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = SESSION_MAX_COUNT,
+        idle_ttl: float = SESSION_IDLE_TTL,
+        max_bytes: int = SESSION_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__()
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._usage: collections.OrderedDict[SessionKey, _SessionUsage] = collections.OrderedDict()
+        self.total_bytes = 0
+        self.evictions: collections.Counter[str] = collections.Counter()
+        self._eviction_listeners: list[EvictionListener] = []
+
+    async def create_session(self, **kwargs) -> Session:
+        session = await super().create_session(**kwargs)
+        self._track(session)
+        return session
+
+    def create_session_sync(self, **kwargs) -> Session:
+        session = super().create_session_sync(**kwargs)
+        self._track(session)
+        return session
+
+    async def get_session(self, **kwargs) -> Optional[Session]:
+        if not self._touch((kwargs["app_name"], kwargs["user_id"], kwargs["session_id"])):
+            return None
+        return await super().get_session(**kwargs)
+
+    def get_session_sync(self, **kwargs) -> Optional[Session]:
+        if not self._touch((kwargs["app_name"], kwargs["user_id"], kwargs["session_id"])):
+            return None
+        return super().get_session_sync(**kwargs)
+
+    async def delete_session(self, **kwargs) -> None:
+        await super().delete_session(**kwargs)
+        self._untrack((kwargs["app_name"], kwargs["user_id"], kwargs["session_id"]))
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session, event)
+        key = (session.app_name, session.user_id, session.id)
+        usage = self._usage.get(key)
+        if usage is not None and not event.partial:
+            growth = len(event.model_dump_json(exclude_none=True))
+            usage.size += growth
+            self.total_bytes += growth
+            self._touch(key)
+            self._evict_over_capacity(keep=key)
+        return event
+
+    def add_eviction_listener(self, listener: EvictionListener):
+        """Registers `listener((app_name, user_id, session_id), reason)`, called for each evicted session."""
+        self._eviction_listeners.append(listener)
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the number and estimated size of live sessions, and eviction counts by reason."""
+        return {
+            "live_sessions": len(self._usage),
+            "total_bytes": self.total_bytes,
+            "evictions": dict(self.evictions),
+        }
+
+    def _track(self, session: Session):
+        key = (session.app_name, session.user_id, session.id)
+        self._untrack(key)
+        usage = _SessionUsage(self._clock(), _json_size(session.state))
+        self._usage[key] = usage
+        self.total_bytes += usage.size
+        self._evict_expired()
+        self._evict_over_capacity(keep=key)
+
+    def _untrack(self, key: SessionKey) -> Optional[_SessionUsage]:
+        usage = self._usage.pop(key, None)
+        if usage is not None:
+            self.total_bytes -= usage.size
+        return usage
+
+    def _touch(self, key: SessionKey) -> bool:
+        """Marks a session as used, returning False if it is unknown or has expired; see untouched_sessions."""
+        self._evict_expired()
+        usage = self._usage.get(key)
+        if usage is None:
+            return False
+        if not _untouched.get():
+            usage.last_access = self._clock()
+            self._usage.move_to_end(key)
+        return True
+
+    def _evict(self, key: SessionKey, reason: str):
+        self._untrack(key)
+        app_name, user_id, session_id = key
+        user_sessions = self.sessions.get(app_name, {}).get(user_id)
+        if user_sessions is not None:
+            user_sessions.pop(session_id, None)
+            if not user_sessions:
+                del self.sessions[app_name][user_id]
+        self.evictions[reason] += 1
+        for listener in list(self._eviction_listeners):
+            listener(key, reason)
+
+    def _evict_expired(self):
+        if self.idle_ttl <= 0:
+            return
+        deadline = self._clock() - self.idle_ttl
+        while self._usage:
+            key, usage = next(iter(self._usage.items()))
+            if usage.last_access > deadline:
+                break
+            self._evict(key, "idle")
+
+    def _evict_over_capacity(self, keep: SessionKey):
+        while self.max_sessions > 0 and len(self._usage) > self.max_sessions:
+            self._evict(self._oldest(keep), "count")
+        while self.max_bytes > 0 and self.total_bytes > self.max_bytes and len(self._usage) > 1:
+            self._evict(self._oldest(keep), "size")
+
+    def _oldest(self, keep: SessionKey) -> SessionKey:
+        keys = iter(self._usage)
+        key = next(keys)
+        return next(keys) if key == keep else key
@@ -0,0 +1,404 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A durable session service backed by a local SQLite database."""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+
+logger = logging.getLogger(__name__)
+
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", "sessions.db")
+SESSION_DB_BATCH_SIZE = int(os.getenv("SESSION_DB_BATCH_SIZE", "32"))
+# Seconds the session count reported by stats() is reused before it is counted again
+SESSION_DB_COUNT_INTERVAL = float(os.getenv("SESSION_DB_COUNT_INTERVAL", "30"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    create_time REAL NOT NULL,
+    update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_by_session ON events (app_name, user_id, session_id, seq);
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+"""
+
+SessionKey = tuple[str, str, str]
+
+
+def _split_state(state: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """Splits a state (or state delta) into its app, user and session scoped parts; temp keys are dropped."""
+    app_state, user_state, session_state = {}, {}, {}
+    for key, value in state.items():
+        if key.startswith(State.APP_PREFIX):
+            app_state[key.removeprefix(State.APP_PREFIX)] = value
+        elif key.startswith(State.USER_PREFIX):
+            user_state[key.removeprefix(State.USER_PREFIX)] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session_state[key] = value
+    return app_state, user_state, session_state
+
+
+def _log_count_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Could not count the stored sessions", exc_info=task.exception())
+
+
+class SqliteSessionService(BaseSessionService):
+    """
+    Session service persisting sessions in a SQLite database in WAL mode.
+
+    Events are stored append-only. Each session row also holds a snapshot of the
+    session-scoped state, so loading a session never replays its events, and
+    `GetSessionConfig` limits how many events are read back. Appended events are
+    buffered per session and written in one transaction when the turn produces
+    its final response, when `batch_size` events are pending, or on
+    `flush_session()`, which the API calls when a turn ends in any other way.
+    State edits without content, such as those the trip monitor makes outside
+    any agent run, are written at once, as no final response follows them.
+
+    Every process pointing at the same file sees the same sessions, so gunicorn
+    workers can serve any turn of any conversation.
+    """
+
+    def __init__(
+        self,
+        db_path: str = SESSION_DB_PATH,
+        batch_size: int = SESSION_DB_BATCH_SIZE,
+        count_interval: float = SESSION_DB_COUNT_INTERVAL,
+    ):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.count_interval = count_interval
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._pending: dict[SessionKey, list[Event]] = {}
+        self._connect().executescript(_SCHEMA)
+        self._session_count = self._count_sessions()
+        self._counted_at = time.monotonic()
+        self._counting: Optional[asyncio.Task] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    async def _run(self, fn, *args):
+        return await asyncio.to_thread(fn, *args)
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        return await self._run(self._create_session, app_name, user_id, session_id, state or {})
+
+    def _create_session(self, app_name: str, user_id: str, session_id: str, state: dict[str, Any]) -> Session:
+        app_delta, user_delta, session_state = _split_state(state)
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?)",
+                (app_name, user_id, session_id, json.dumps(session_state), now, now),
+            )
+            self._merge_scoped_state(conn, app_name, user_id, app_delta, user_delta)
+            conn.execute("COMMIT")
+        except sqlite3.IntegrityError:
+            conn.execute("ROLLBACK")
+            raise ValueError(f"Session with id {session_id} already exists.") from None
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=self._merged_state(conn, app_name, user_id, session_state),
+            last_update_time=now,
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        await self._flush_session((app_name, user_id, session_id))
+        return await self._run(self._get_session, app_name, user_id, session_id, config)
+
+    def _get_session(
+        self, app_name: str, user_id: str, session_id: str, config: Optional[GetSessionConfig]
+    ) -> Optional[Session]:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT state, update_time FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+            (app_name, user_id, session_id),
+        ).fetchone()
+        if row is None:
+            return None
+
+        query = "SELECT data FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?"
+        params: list[Any] = [app_name, user_id, session_id]
+        if config and config.after_timestamp:
+            query += " AND timestamp >= ?"
+            params.append(config.after_timestamp)
+        query += " ORDER BY seq DESC"
+        if config and config.num_recent_events is not None:
+            query += " LIMIT ?"
+            params.append(config.num_recent_events)
+        rows = conn.execute(query, params).fetchall()
+        events = [Event.model_validate_json(data) for (data,) in reversed(rows)]
+
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=self._merged_state(conn, app_name, user_id, json.loads(row[0])),
+            events=events,
+            last_update_time=row[1],
+        )
+
+    async def list_sessions(self, *, app_name: str, user_id: Optional[str] = None) -> ListSessionsResponse:
+        return await self._run(self._list_sessions, app_name, user_id)
+
+    def _list_sessions(self, app_name: str, user_id: Optional[str]) -> ListSessionsResponse:
+        query = "SELECT user_id, id, update_time FROM sessions WHERE app_name = ?"
+        params = [app_name]
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        rows = self._connect().execute(query, params).fetchall()
+        return ListSessionsResponse(
+            sessions=[
+                Session(app_name=app_name, user_id=uid, id=sid, state={}, last_update_time=update_time)
+                for uid, sid, update_time in rows
+            ]
+        )
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        self._pending.pop((app_name, user_id, session_id), None)
+        await self._run(self._delete_session, app_name, user_id, session_id)
+
+    def _delete_session(self, app_name: str, user_id: str, session_id: str):
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                (app_name, user_id, session_id),
+            )
+            conn.execute(
+                "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                (app_name, user_id, session_id),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        event = await super().append_event(session, event)
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+        pending = self._pending.setdefault(key, [])
+        pending.append(event)
+        state_edit = event.content is None and event.actions is not None and bool(event.actions.state_delta)
+        if len(pending) >= self.batch_size or state_edit or (event.content and event.is_final_response()):
+            await self._flush_session(key)
+        return event
+
+    async def flush_session(self, *, app_name: str, user_id: str, session_id: str):
+        """Writes the buffered events of one session, e.g. at the end of a turn that failed."""
+        await self._flush_session((app_name, user_id, session_id))
+
+    async def flush(self):
+        """Writes every buffered event."""
+        for key in list(self._pending):
+            await self._flush_session(key)
+
+    async def close(self):
+        """Writes every buffered event and closes the database connections."""
+        if self._counting is not None:
+            self._counting.cancel()
+        await self.flush()
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    async def ping(self):
+        """Runs a trivial query, raising if the database cannot be read."""
+        await self._run(lambda: self._connect().execute("SELECT 1").fetchone())
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Returns the number of stored sessions and of events waiting to be written.
+
+        Counting sessions scans the table, so stats() never counts on the event
+        loop: it returns the last count, and starts a new one on a thread once
+        that is `count_interval` seconds old.
+        """
+        self._recount()
+        return {
+            "live_sessions": self._session_count,
+            "pending_events": sum(len(events) for events in self._pending.values()),
+        }
+
+    async def count_sessions(self) -> int:
+        """Counts the stored sessions, of every worker, for the following stats()."""
+        self._counted_at = time.monotonic()
+        self._session_count = await self._run(self._count_sessions)
+        return self._session_count
+
+    def _count_sessions(self) -> int:
+        (count,) = self._connect().execute("SELECT COUNT(*) FROM sessions").fetchone()
+        return count
+
+    def _recount(self):
+        if self._counting is not None and not self._counting.done():
+            return
+        if time.monotonic() - self._counted_at < self.count_interval:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No event loop to count on; the last count stands.
+        self._counting = loop.create_task(self.count_sessions())
+        self._counting.add_done_callback(_log_count_failure)
+
+    async def _flush_session(self, key: SessionKey):
+        events = self._pending.pop(key, None)
+        if events:
+            await self._run(self._write_events, key, events)
+
+    def _write_events(self, key: SessionKey, events: list[Event]):
+        app_name, user_id, session_id = key
+        app_delta, user_delta, session_delta = {}, {}, {}
+        for event in events:
+            if event.actions and event.actions.state_delta:
+                app, user, session = _split_state(event.actions.state_delta)
+                app_delta.update(app)
+                user_delta.update(user)
+                session_delta.update(session)
+
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT state FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?",
+                (app_name, user_id, session_id),
+            ).fetchone()
+            if row is None:  # Deleted while the turn was running.
+                conn.execute("ROLLBACK")
+                return
+            conn.executemany(
+                "INSERT INTO events (app_name, user_id, session_id, timestamp, data) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (app_name, user_id, session_id, event.timestamp, event.model_dump_json(exclude_none=True))
+                    for event in events
+                ],
+            )
+            state = json.loads(row[0])
+            state.update(session_delta)
+            conn.execute(
+                "UPDATE sessions SET state = ?, update_time = ? WHERE app_name = ? AND user_id = ? AND id = ?",
+                (json.dumps(state), events[-1].timestamp, app_name, user_id, session_id),
+            )
+            self._merge_scoped_state(conn, app_name, user_id, app_delta, user_delta)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _merge_scoped_state(
+        self, conn: sqlite3.Connection, app_name: str, user_id: str, app_delta: dict, user_delta: dict
+    ):
+        if app_delta:
+            row = conn.execute("SELECT state FROM app_states WHERE app_name = ?", (app_name,)).fetchone()
+            state = json.loads(row[0]) if row else {}
+            state.update(app_delta)
+            conn.execute("INSERT OR REPLACE INTO app_states VALUES (?, ?)", (app_name, json.dumps(state)))
+        if user_delta:
+            row = conn.execute(
+                "SELECT state FROM user_states WHERE app_name = ? AND user_id = ?", (app_name, user_id)
+            ).fetchone()
+            state = json.loads(row[0]) if row else {}
+            state.update(user_delta)
+            conn.execute(
+                "INSERT OR REPLACE INTO user_states VALUES (?, ?, ?)", (app_name, user_id, json.dumps(state))
+            )
+
+    def _merged_state(
+        self, conn: sqlite3.Connection, app_name: str, user_id: str, session_state: dict[str, Any]
+    ) -> dict[str, Any]:
+        state = dict(session_state)
+        row = conn.execute("SELECT state FROM app_states WHERE app_name = ?", (app_name,)).fetchone()
+        if row:
+            state.update({State.APP_PREFIX + key: value for key, value in json.loads(row[0]).items()})
+        row = conn.execute(
+            "SELECT state FROM user_states WHERE app_name = ? AND user_id = ?", (app_name, user_id)
+        ).fetchone()
+        if row:
+            state.update({State.USER_PREFIX + key: value for key, value in json.loads(row[0]).items()})
+        return state
@@ -0,0 +1,77 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Content fingerprints of structured state values, stored next to them.
+
+Sessions are copied when they are loaded, by deep copy in memory or by
+json.loads from SQLite, so an itinerary cannot be recognized by identity from
+one turn to the next. Instead, whenever a dict or list is written to the state,
+a hash of its content is written with it, under fingerprint_key(key). Readers
+caching work per value, such as memoized instructions and itinerary timelines,
+key their caches on that hash without serializing the value again.
+"""
+
+import hashlib
+import json
+from typing import Any, Hashable, Mapping, MutableMapping
+
+_SCALARS = (str, int, float, bool, type(None))
+_SUFFIX = "_fingerprint"
+
+
+def fingerprint(value: Any) -> str:
+    """Returns a hash of a JSON-like value, the same for equal content."""
+    content = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+
+def fingerprint_key(key: str) -> str:
+    """The state key holding the fingerprint of `key`, in the same scope, e.g. user:_home_fingerprint."""
+    scope, sep, name = key.rpartition(":")
+    return f"{scope}{sep}_{name}{_SUFFIX}"
+
+
+def is_fingerprint_key(key: str) -> bool:
+    name = key.rpartition(":")[2]
+    return name.startswith("_") and name.endswith(_SUFFIX)
+
+
+def add_fingerprints(state: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
+    """
+    Adds the fingerprint of every dict or list value of `state`, e.g. a state delta, and returns it.
+
+    Fingerprints already in `state` are kept, as they were written with their value.
+    """
+    for key, value in list(state.items()):
+        if isinstance(value, _SCALARS) or is_fingerprint_key(key):
+            continue
+        state.setdefault(fingerprint_key(key), fingerprint(value))
+    return state
+
+
+def state_fingerprint(state: Mapping[str, Any], key: str) -> Hashable:
+    """
+    Returns a hashable stand-in for the content of state[key].
+
+    Scalars stand for themselves. Dicts and lists are represented by their
+    stored fingerprint, computed here only for state written without one.
+    """
+    if key not in state:
+        return ("missing",)
+    value = state[key]
+    if isinstance(value, _SCALARS):
+        return (type(value).__name__, value)
+    stored = state.get(fingerprint_key(key))
+    return ("fingerprint", stored if isinstance(stored, str) else fingerprint(value))
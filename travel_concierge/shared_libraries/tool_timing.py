@@ -0,0 +1,175 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures how long function tools hold the event loop."""
+
+import collections
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+from google.adk.agents import BaseAgent
+from google.adk.tools import FunctionTool
+
+logger = logging.getLogger(__name__)
+
+# Tool calls holding the event loop for longer than this many seconds are logged.
+TOOL_BLOCKING_WARN_SECONDS = float(os.getenv("TOOL_BLOCKING_WARN_SECONDS", "0.05"))
+
+BlockingObserver = Callable[[str, float], None]
+
+_observers: list[BlockingObserver] = []
+
+
+class ToolBlockingStats:
+    """Per-tool call counts, and total and worst time spent on the event loop."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: collections.Counter[str] = collections.Counter()
+        self.total_seconds: collections.Counter[str] = collections.Counter()
+        self.max_seconds: dict[str, float] = {}
+
+    def __call__(self, tool_name: str, blocked: float):
+        with self._lock:
+            self.calls[tool_name] += 1
+            self.total_seconds[tool_name] += blocked
+            self.max_seconds[tool_name] = max(blocked, self.max_seconds.get(tool_name, 0.0))
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    "calls": self.calls[name],
+                    "blocked_seconds": self.total_seconds[name],
+                    "max_blocked_seconds": self.max_seconds[name],
+                }
+                for name in self.calls
+            }
+
+
+def _warn_if_slow(tool_name: str, blocked: float):
+    if blocked > TOOL_BLOCKING_WARN_SECONDS:
+        logger.warning("Tool %s blocked the event loop for %.3fs", tool_name, blocked)
+
+
+tool_blocking_stats = ToolBlockingStats()
+
+
+def add_blocking_observer(observer: BlockingObserver):
+    """Registers `observer(tool_name, seconds)`, called for each call of a timed tool."""
+    _observers.append(observer)
+
+
+def remove_blocking_observer(observer: BlockingObserver):
+    _observers.remove(observer)
+
+
+add_blocking_observer(tool_blocking_stats)
+add_blocking_observer(_warn_if_slow)
+
+
+def _report(tool_name: str, blocked: float):
+    for observer in list(_observers):
+        try:
+            observer(tool_name, blocked)
+        except Exception:
+            logger.exception("Blocking observer failed for tool %s", tool_name)
+
+
+class _TimedAwait:
+    """Awaits a coroutine, adding up the time each of its steps holds the event loop."""
+
+    def __init__(self, coro, tool_name: str):
+        self._coro = coro
+        self._tool_name = tool_name
+
+    def __await__(self):
+        steps = self._coro.__await__()
+        blocked = 0.0
+        send, value = steps.send, None
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    pending = send(value)
+                except StopIteration as stop:
+                    return stop.value
+                finally:
+                    blocked += time.perf_counter() - started
+                try:
+                    send, value = steps.send, (yield pending)
+                except GeneratorExit:
+                    steps.close()
+                    raise
+                except BaseException as e:
+                    send, value = steps.throw, e
+        finally:
+            _report(self._tool_name, blocked)
+
+
+def timed(func: Callable) -> Callable:
+    """
+    Wraps a function tool, measuring how long it holds the event loop.
+
+    Sync functions and coroutine functions both run on the event loop as
+    before; sync tools such as memorize read, modify and write session state,
+    so they must not run on threads alongside the other calls of a model
+    response. The time each call holds the loop is reported to the blocking
+    observers. The wrapper keeps the signature and docstring, so ADK declares
+    the tool exactly as before.
+    """
+    if getattr(func, "_timed", False):
+        return func
+    name = func.__name__
+
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            return await _TimedAwait(func(*args, **kwargs), name)
+    else:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> Any:
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _report(name, time.perf_counter() - started)
+
+    wrapper._timed = True
+    return wrapper
+
+
+def time_function_tools(agents: Iterable[BaseAgent]):
+    """
+    Replaces the function tools of `agents` with timed ones, see timed.
+
+    Plain functions and FunctionTool instances are wrapped; other tools, such
+    as AgentTool, MCP and built-in tools, are left alone. Calling this again
+    on the same agents does nothing.
+    """
+    for agent in agents:
+        tools = getattr(agent, "tools", None)
+        if not tools:
+            continue
+        for i, tool in enumerate(tools):
+            if type(tool) is FunctionTool:
+                if not getattr(tool.func, "_timed", False):
+                    tools[i] = FunctionTool(timed(tool.func))
+            elif inspect.isfunction(tool):
+                tools[i] = timed(tool)
@@ -0,0 +1,402 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Times every agent run, model call and tool call, through ADK callbacks.
+
+Each one becomes a span, nested under the span that was open when it started:
+a model call under its agent, an AgentTool's agent under the tool call. Spans
+go to the metrics on /metrics and to the exporters picked by TRACE_EXPORTERS:
+
+    json  a Chrome trace event file at TRACE_FILE, for chrome://tracing or Perfetto
+    otel  the OpenTelemetry tracer provider the app configured
+    otlp  an OTLP/HTTP exporter configured by the standard OTEL_EXPORTER_OTLP_* variables
+"""
+
+import collections
+import contextvars
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Protocol
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.adk.tools import BaseTool, ToolContext
+
+from travel_concierge.shared_libraries import metrics
+
+logger = logging.getLogger(__name__)
+
+# Comma separated: json, otel, otlp
+TRACE_EXPORTERS = os.getenv("TRACE_EXPORTERS", "")
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.json")
+# Spans whose end is never seen, e.g. of a run that raised, are dropped beyond this many
+MAX_OPEN_SPANS = 10000
+
+AGENT, MODEL, TOOL = "agent", "model", "tool"
+
+agent_duration = metrics.histogram(
+    "travel_concierge_agent_duration_seconds",
+    "Time each agent runs, including its model calls, tools and sub-agents.",
+    ["agent"],
+)
+model_duration = metrics.histogram(
+    "travel_concierge_model_duration_seconds",
+    "Time each model call takes, to its last response.",
+    ["agent"],
+)
+model_tokens = metrics.counter(
+    "travel_concierge_model_tokens_total",
+    "Tokens sent to (prompt) and received from (output) the model.",
+    ["agent", "direction"],
+)
+tool_duration = metrics.histogram(
+    "travel_concierge_tool_duration_seconds",
+    "Time each tool call takes, including AgentTool sub-agents.",
+    ["agent", "tool"],
+)
+tool_args_size = metrics.histogram(
+    "travel_concierge_tool_args_bytes",
+    "Size of tool call arguments, as JSON.",
+    ["tool"],
+    metrics.SIZE_BUCKETS,
+)
+span_errors = metrics.counter(
+    "travel_concierge_span_errors_total",
+    "Agent runs, model calls and tool calls that failed or never finished.",
+    ["kind", "name"],
+)
+
+
+@dataclass
+class Span:
+    """One agent run, model call or tool call."""
+
+    span_id: int
+    kind: str
+    name: str
+    agent: str
+    parent: Optional["Span"]
+    start_ns: int = field(default_factory=time.time_ns)
+    started: float = field(default_factory=time.perf_counter)
+    duration: Optional[float] = None
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    # Exporter handles, e.g. the matching OpenTelemetry span
+    exported: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @property
+    def depth(self) -> int:
+        return self.parent.depth + 1 if self.parent else 0
+
+    @property
+    def trace_id(self) -> int:
+        return self.parent.trace_id if self.parent else self.span_id
+
+
+class SpanExporter(Protocol):
+    def start(self, span: Span): ...
+
+    def finish(self, span: Span): ...
+
+
+def _json_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return len(str(value))
+
+
+class AgentTracer:
+    """
+    Records spans from the ADK callbacks of the agents it instruments.
+
+    The span open in the current task is kept in a context variable, which
+    ADK's tool tasks and AgentTool runners inherit, so spans nest the way the
+    calls do. Spans are matched to their end by invocation, agent and, for
+    tools, the function call id.
+    """
+
+    def __init__(self, exporters: Iterable[SpanExporter] = ()):
+        self.exporters = list(exporters)
+        self._ids = itertools.count(1)
+        self._current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+            f"current_span_{id(self)}", default=None
+        )
+        self._open: collections.OrderedDict[Any, Span] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def _start(self, key: Any, kind: str, name: str, agent: str, **attributes: Any) -> Span:
+        span = Span(next(self._ids), kind, name, agent, self._current.get(), attributes=attributes)
+        with self._lock:
+            self._open[key] = span
+            while len(self._open) > MAX_OPEN_SPANS:
+                self._open.popitem(last=False)
+        self._current.set(span)
+        for exporter in self.exporters:
+            try:
+                exporter.start(span)
+            except Exception:
+                logger.exception("Trace exporter %s failed to start a span", type(exporter).__name__)
+        return span
+
+    def _finish(self, key: Any, error: Optional[str] = None, **attributes: Any) -> Optional[Span]:
+        with self._lock:
+            span = self._open.pop(key, None)
+            # Spans opened under this one and never finished, e.g. a tool call
+            # skipped by a later callback, end with it.
+            orphans = [k for k, s in self._open.items() if s.parent is span] if span else []
+        if span is None:
+            return None
+        for orphan in orphans:
+            self._finish(orphan, error="not finished")
+        span.duration = time.perf_counter() - span.started
+        span.error = error
+        span.attributes.update(attributes)
+        if self._current.get() is span:
+            self._current.set(span.parent)
+        self._record(span)
+        for exporter in self.exporters:
+            try:
+                exporter.finish(span)
+            except Exception:
+                logger.exception("Trace exporter %s failed to finish a span", type(exporter).__name__)
+        return span
+
+    def _record(self, span: Span):
+        if span.error:
+            span_errors.labels(kind=span.kind, name=span.name).inc()
+        if span.kind == AGENT:
+            agent_duration.labels(agent=span.agent).observe(span.duration)
+        elif span.kind == MODEL:
+            model_duration.labels(agent=span.agent).observe(span.duration)
+            for direction in ("prompt", "output"):
+                tokens = span.attributes.get(f"{direction}_tokens")
+                if tokens:
+                    model_tokens.labels(agent=span.agent, direction=direction).inc(tokens)
+        elif span.kind == TOOL:
+            tool_duration.labels(agent=span.agent, tool=span.name).observe(span.duration)
+            tool_args_size.labels(tool=span.name).observe(span.attributes.get("args_bytes", 0))
+
+    def open_spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._open.values())
+
+    # ADK callbacks. They all return None, so the agent's own callbacks still run.
+
+    def before_agent(self, callback_context: CallbackContext):
+        self._start(
+            (callback_context.invocation_id, callback_context.agent_name),
+            AGENT,
+            callback_context.agent_name,
+            callback_context.agent_name,
+            invocation_id=callback_context.invocation_id,
+        )
+
+    def after_agent(self, callback_context: CallbackContext):
+        self._finish((callback_context.invocation_id, callback_context.agent_name))
+
+    def before_model(self, callback_context: CallbackContext, llm_request: LlmRequest):
+        self._start(
+            (callback_context.invocation_id, callback_context.agent_name, MODEL),
+            MODEL,
+            llm_request.model or "model",
+            callback_context.agent_name,
+            contents=len(llm_request.contents),
+        )
+
+    def after_model(self, callback_context: CallbackContext, llm_response: LlmResponse):
+        key = (callback_context.invocation_id, callback_context.agent_name, MODEL)
+        if llm_response.partial:
+            # A streamed chunk: the call goes on until the final response.
+            with self._lock:
+                span = self._open.get(key)
+            if span is not None and "first_chunk_seconds" not in span.attributes:
+                span.attributes["first_chunk_seconds"] = time.perf_counter() - span.started
+            return
+        usage = llm_response.usage_metadata
+        self._finish(
+            key,
+            error=llm_response.error_code,
+            prompt_tokens=usage.prompt_token_count if usage else None,
+            output_tokens=usage.candidates_token_count if usage else None,
+        )
+
+    def on_model_error(self, callback_context: CallbackContext, llm_request: LlmRequest, error: Exception):
+        self._finish((callback_context.invocation_id, callback_context.agent_name, MODEL), error=repr(error))
+
+    def before_tool(self, tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext):
+        self._start(
+            tool_context.function_call_id,
+            TOOL,
+            tool.name,
+            tool_context.agent_name,
+            args_bytes=_json_size(args),
+        )
+
+    def after_tool(self, tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext, tool_response: Any):
+        self._finish(tool_context.function_call_id, response_bytes=_json_size(tool_response))
+
+    def on_tool_error(self, tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext, error: Exception):
+        self._finish(tool_context.function_call_id, error=repr(error))
+
+    def callbacks(self) -> Dict[str, Any]:
+        """The agent fields to set, and the callback to set each to."""
+        return {
+            "before_agent_callback": self.before_agent,
+            "after_agent_callback": self.after_agent,
+            "before_model_callback": self.before_model,
+            "after_model_callback": self.after_model,
+            "on_model_error_callback": self.on_model_error,
+            "before_tool_callback": self.before_tool,
+            "after_tool_callback": self.after_tool,
+            "on_tool_error_callback": self.on_tool_error,
+        }
+
+
+def instrument_agents(agents: Iterable[BaseAgent], tracer: Optional[AgentTracer] = None):
+    """
+    Adds the callbacks of `tracer` (default: agent_tracer) to each of `agents`.
+
+    They go first, ahead of the agent's own callbacks, because ADK stops at the
+    first callback returning a value. Fields an agent type lacks, e.g. model
+    callbacks on workflow agents, are skipped. Calling this again on the same
+    agents does nothing.
+    """
+    tracer = tracer or agent_tracer
+    for agent in agents:
+        for name, callback in tracer.callbacks().items():
+            if name not in type(agent).model_fields:
+                continue
+            existing = getattr(agent, name)
+            if existing is None:
+                existing = []
+            elif not isinstance(existing, list):
+                existing = [existing]
+            if callback not in existing:
+                setattr(agent, name, [callback, *existing])
+
+
+class JsonTraceExporter:
+    """
+    Appends finished spans to a Chrome trace event file, one event per line.
+
+    The file is a JSON array left open at the end, which chrome://tracing and
+    Perfetto accept as is; each trace gets its own track.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+        if self._file.tell() == 0:
+            self._file.write("[\n")
+            self._file.flush()
+
+    def start(self, span: Span):
+        pass
+
+    def finish(self, span: Span):
+        event = {
+            "name": span.name,
+            "cat": span.kind,
+            "ph": "X",
+            "ts": span.start_ns // 1000,
+            "dur": int(span.duration * 1e6),
+            "pid": os.getpid(),
+            "tid": span.trace_id,
+            "args": {
+                "agent": span.agent,
+                "span_id": span.span_id,
+                "parent_id": span.parent.span_id if span.parent else None,
+                "depth": span.depth,
+                "error": span.error,
+                **span.attributes,
+            },
+        }
+        line = json.dumps(event, default=str) + ",\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class OpenTelemetryExporter:
+    """Mirrors spans as OpenTelemetry spans, under the span of their parent."""
+
+    def __init__(self, tracer_provider: Any = None):
+        from opentelemetry import trace
+
+        self._trace = trace
+        self._tracer = trace.get_tracer(__name__, tracer_provider=tracer_provider)
+
+    def start(self, span: Span):
+        parent = span.parent.exported.get("otel") if span.parent else None
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        attributes = {"travel_concierge.agent": span.agent, "travel_concierge.depth": span.depth}
+        span.exported["otel"] = self._tracer.start_span(
+            f"{span.kind} {span.name}", context=context, start_time=span.start_ns, attributes=attributes
+        )
+
+    def finish(self, span: Span):
+        otel_span = span.exported.pop("otel", None)
+        if otel_span is None:
+            return
+        for key, value in span.attributes.items():
+            if isinstance(value, (bool, int, float, str)):
+                otel_span.set_attribute(f"travel_concierge.{key}", value)
+        if span.error:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=span.start_ns + int(span.duration * 1e9))
+
+
+def _otlp_tracer_provider() -> Any:
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = TracerProvider(resource=Resource.create({"service.name": "travel-concierge"}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    return provider
+
+
+def exporters_from_env(names: str = TRACE_EXPORTERS) -> List[SpanExporter]:
+    """The exporters named in `names`; ones whose packages are missing are skipped with a warning."""
+    exporters: List[SpanExporter] = []
+    for name in filter(None, (name.strip().lower() for name in names.split(","))):
+        try:
+            if name == "json":
+                exporters.append(JsonTraceExporter(TRACE_FILE))
+            elif name == "otel":
+                exporters.append(OpenTelemetryExporter())
+            elif name == "otlp":
+                exporters.append(OpenTelemetryExporter(_otlp_tracer_provider()))
+            else:
+                logger.warning("Unknown trace exporter %s, expected json, otel or otlp", name)
+        except ImportError as e:
+            logger.warning("Trace exporter %s needs a package that is not installed: %s", name, e)
+    return exporters
+
+
+# The tracer of this worker, see instrument_agents
+agent_tracer = AgentTracer(exporters_from_env())
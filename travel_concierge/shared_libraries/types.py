@@ -229,3 +229,25 @@ class UserProfile(BaseModel):
 class PackingList(BaseModel):
     """A list of things to pack for the trip."""
     items: list[str]
+
+
+class FlightCheck(BaseModel):
+    """A flight to check the status of."""
+    flight_number: str = Field(description="Flight number, e.g. UA5678")
+    flight_date: str = Field(description="The date of the flight in YYYY-MM-DD format")
+    checkin_time: str = Field(default="", description="Time in HH:MM format, e.g. 15:30")
+    departure_time: str = Field(default="", description="Time in HH:MM format, e.g. 16:00")
+
+
+class EventCheck(BaseModel):
+    """An event requiring booking to check the status of."""
+    event_name: str = Field(description="The name of the event, e.g. Space Needle")
+    event_date: str = Field(description="The date of the event in YYYY-MM-DD format")
+    event_location: str = Field(default="", description="The location of the event")
+
+
+class ActivityCheck(BaseModel):
+    """An outdoor activity to check the weather impact on."""
+    activity_name: str = Field(description="The name of the activity")
+    activity_date: str = Field(description="The date of the activity in YYYY-MM-DD format")
+    activity_location: str = Field(default="", description="The location of the activity")
@@ -18,11 +18,12 @@ from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
 from google.genai.types import GenerateContentConfig
 
+from travel_concierge.shared_libraries.models import MODEL
 from travel_concierge.sub_agents.booking import prompt
 
 
 create_reservation = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="create_reservation",
     description="""Create a reservation for the selected item.""",
     instruction=prompt.CONFIRM_RESERVATION_INSTR,
@@ -30,14 +31,14 @@ create_reservation = Agent(
 
 
 payment_choice = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="payment_choice",
     description="""Show the users available payment choices.""",
     instruction=prompt.PAYMENT_CHOICE_INSTR,
 )
 
 process_payment = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="process_payment",
     description="""Given a selected payment choice, processes the payment, completing the transaction.""",
     instruction=prompt.PROCESS_PAYMENT_INSTR,
@@ -45,7 +46,7 @@ process_payment = Agent(
 
 
 booking_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="booking_agent",
     description="Given an itinerary, complete the bookings of items by handling payment choices and processing.",
     instruction=prompt.BOOKING_AGENT_INSTR,
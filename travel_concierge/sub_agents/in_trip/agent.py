@@ -17,12 +17,13 @@
 from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
 
+from travel_concierge.shared_libraries import constants
+from travel_concierge.shared_libraries.instructions import template_instruction
+from travel_concierge.shared_libraries.models import MODEL
 from travel_concierge.sub_agents.in_trip import prompt
 from travel_concierge.sub_agents.in_trip.tools import (
     transit_coordination,
-    flight_status_check,
-    event_booking_check,
-    weather_impact_check,
+    trip_status_check,
 )
 
 from travel_concierge.tools.memory import memorize
@@ -30,7 +31,7 @@ from travel_concierge.tools.memory import memorize
 
 # This sub-agent is expected to be called every day closer to the trip, and frequently several times a day during the trip.
 day_of_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="day_of_agent",
     description="Day_of agent is the agent handling the travel logistics of a trip.",
     instruction=transit_coordination,
@@ -38,20 +39,20 @@ day_of_agent = Agent(
 
 
 trip_monitor_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="trip_monitor_agent",
     description="Monitor aspects of a itinerary and bring attention to items that necessitate changes",
-    instruction=prompt.TRIP_MONITOR_INSTR,
-    tools=[flight_status_check, event_booking_check, weather_impact_check],
-    output_key="daily_checks",  # can be sent via email.
+    instruction=template_instruction(prompt.TRIP_MONITOR_INSTR, "TRIP_MONITOR_INSTR"),
+    tools=[trip_status_check],
+    output_key=constants.DAILY_CHECKS,  # can be sent via email; also refreshed in the background, see monitor.
 )
 
 
 in_trip_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="in_trip_agent",
     description="Provide information about what the users need as part of the tour.",
-    instruction=prompt.INTRIP_INSTR,
+    instruction=template_instruction(prompt.INTRIP_INSTR, "INTRIP_INSTR"),
     sub_agents=[
         trip_monitor_agent
     ],  # This can be run as an AgentTool. Illustrate as an Agent for demo purpose.
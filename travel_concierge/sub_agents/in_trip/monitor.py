@@ -0,0 +1,297 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Runs the trip monitor checks in the background, ahead of the traveler asking."""
+
+import asyncio
+import collections
+import contextlib
+import logging
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from google.adk.events import Event, EventActions
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig
+
+from travel_concierge.shared_libraries import constants, metrics
+from travel_concierge.shared_libraries.session_store import SESSION_IDLE_TTL, untouched_sessions
+from travel_concierge.sub_agents.in_trip.timeline import Timeline, timeline_for, timeline_key
+from travel_concierge.sub_agents.in_trip.tools import trip_checks, trip_status_check
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of the same trip, 0 disables background monitoring
+MONITOR_INTERVAL = float(os.getenv("MONITOR_INTERVAL", "900"))
+# Share of the interval by which each wait is lengthened or shortened at random
+MONITOR_JITTER = float(os.getenv("MONITOR_JITTER", "0.1"))
+# Trips checked at the same time
+MONITOR_WORKERS = int(os.getenv("MONITOR_WORKERS", "4"))
+# Days checked, starting with the traveler's current day
+MONITOR_DAYS = int(os.getenv("MONITOR_DAYS", "2"))
+# Seconds a session stays monitored after its last request, 0 for as long as it is stored;
+# by default as long as an idle in-memory session is kept
+MONITOR_SESSION_TTL = float(os.getenv("MONITOR_SESSION_TTL", str(SESSION_IDLE_TTL)))
+# Sessions monitored at most, the least recently active are dropped first
+MONITOR_MAX_SESSIONS = int(os.getenv("MONITOR_MAX_SESSIONS", "1000"))
+
+SessionKey = tuple[str, str]
+
+monitor_cycle_duration = metrics.histogram(
+    "travel_concierge_trip_monitor_cycle_seconds",
+    "Time each background trip monitor cycle takes, loading sessions, checking trips and storing results.",
+)
+monitored_trips = metrics.counter(
+    "travel_concierge_monitored_trips_total",
+    "Trips checked in the background, by whether their checks ran.",
+    ["result"],
+)
+daily_checks_updates = metrics.counter(
+    "travel_concierge_daily_checks_updates_total",
+    "Sessions whose daily checks the background monitor stored, by whether they changed.",
+    ["result"],
+)
+
+
+def _current_time(state: Dict[str, Any], default: datetime) -> datetime:
+    """The traveler's current time: the session's itinerary_datetime, if it is set and valid."""
+    value = state.get(constants.ITIN_DATETIME)
+    if isinstance(value, str) and value.strip():
+        try:
+            return datetime.fromisoformat(value.strip())
+        except ValueError:
+            pass
+    return default
+
+
+def _status(result: Dict[str, Any]) -> str:
+    status = result.get("status", "")
+    return f"{status} ({result['error']})" if "error" in result else status
+
+
+def summarize_checks(trip_name: str, start: datetime, end: datetime, report: Dict[str, Any]) -> str:
+    """Renders a trip_status_check report as the daily_checks text the in-trip agent answers from."""
+    lines = [f"Checks of {trip_name} from {start.date()} to {(end - timedelta(days=1)).date()}:"]
+    for result in report["flights"]:
+        lines.append(f"- Flight {result.get('flight_number')} on {result.get('flight_date')}: {_status(result)}")
+    for result in report["events"]:
+        lines.append(f"- {result.get('event_name')} on {result.get('event_date')}: {_status(result)}")
+    for result in report["activities"]:
+        lines.append(f"- {result.get('activity_name')} on {result.get('activity_date')}: {_status(result)}")
+    return "\n".join(lines)
+
+
+@dataclass
+class _TripJob:
+    """The checks of one trip over one window, and the sessions following it."""
+
+    trip_name: str
+    timeline: Timeline
+    start: datetime
+    end: datetime
+    sessions: list[Session] = field(default_factory=list)
+
+
+class TripMonitor:
+    """
+    Checks the trips of recently active sessions every `interval` seconds.
+
+    Sessions with an itinerary are monitored once `track` has been called for
+    them, typically on each request, until `session_ttl` seconds after the last
+    call or until they are gone from the session service; at most
+    `max_sessions` of them, the least recently tracked are dropped first. Each
+    cycle loads them, finds the events of their next `days` days and checks them
+    with trip_status_check, on `workers` concurrent workers. A trip is checked
+    once per cycle however many sessions follow it, e.g. every session of a
+    catalog profile. The results are stored in each session's daily_checks state
+    when they changed, so the in-trip agent answers from them without checking.
+    Sessions are read and written within untouched_sessions, so monitoring does
+    not keep them from being evicted when idle. Waits between cycles vary by
+    `jitter`, so workers do not check in step.
+    """
+
+    def __init__(
+        self,
+        session_service: BaseSessionService,
+        app_name: str,
+        interval: float = MONITOR_INTERVAL,
+        jitter: float = MONITOR_JITTER,
+        workers: int = MONITOR_WORKERS,
+        days: int = MONITOR_DAYS,
+        session_ttl: float = MONITOR_SESSION_TTL,
+        max_sessions: int = MONITOR_MAX_SESSIONS,
+        clock: Callable[[], float] = time.monotonic,
+        now: Callable[[], datetime] = datetime.now,
+        rng: Callable[[], float] = random.random,
+    ):
+        self._session_service = session_service
+        self._app_name = app_name
+        self.interval = interval
+        self.jitter = jitter
+        self.workers = workers
+        self.days = days
+        self.session_ttl = session_ttl
+        self.max_sessions = max_sessions
+        self._clock = clock
+        self._now = now
+        self._rng = rng
+        self._sessions: collections.OrderedDict[SessionKey, float] = collections.OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+        self.cycles = 0
+
+    @property
+    def started(self) -> bool:
+        return self._task is not None
+
+    def track(self, session: Session) -> bool:
+        """Monitors the session's trip for session_ttl seconds from now; returns False if it has no itinerary."""
+        key = (session.user_id, session.id)
+        if not session.state.get(constants.ITIN_KEY):
+            self._sessions.pop(key, None)
+            return False
+        self._sessions[key] = self._clock()
+        self._sessions.move_to_end(key)
+        while self.max_sessions > 0 and len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return True
+
+    def untrack(self, user_id: str, session_id: str):
+        """Stops monitoring a session, e.g. one the session service evicted."""
+        self._sessions.pop((user_id, session_id), None)
+
+    async def start(self):
+        """Starts the monitoring loop; its first cycle is a random part of an interval away."""
+        if self.started or self.interval <= 0:
+            return
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        """Stops the monitoring loop, cancelling a cycle in progress."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def stats(self) -> dict[str, Any]:
+        """Returns the number of monitored sessions and of cycles run."""
+        return {"sessions": len(self._sessions), "cycles": self.cycles}
+
+    async def run_once(self) -> dict[str, int]:
+        """Runs one cycle; returns the number of trips checked and of sessions updated."""
+        started = time.perf_counter()
+        with untouched_sessions():
+            jobs = await self._collect()
+            queue: asyncio.Queue[_TripJob] = asyncio.Queue()
+            for job in jobs:
+                queue.put_nowait(job)
+            updated = await asyncio.gather(*(self._worker(queue) for _ in range(min(self.workers, len(jobs)))))
+        self.cycles += 1
+        monitor_cycle_duration.observe(time.perf_counter() - started)
+        result = {"trips": len(jobs), "updated": sum(updated)}
+        logger.info("Trip monitor cycle checked %d trips, updated %d sessions", result["trips"], result["updated"])
+        return result
+
+    async def _loop(self):
+        delay = self.interval * self._rng()
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Trip monitor cycle failed")
+            delay = self.interval * (1 + self.jitter * (2 * self._rng() - 1))
+
+    def _expire(self):
+        if self.session_ttl <= 0:
+            return
+        deadline = self._clock() - self.session_ttl
+        while self._sessions:
+            key, last_seen = next(iter(self._sessions.items()))
+            if last_seen > deadline:
+                break
+            del self._sessions[key]
+
+    async def _collect(self) -> list[_TripJob]:
+        """Loads the monitored sessions and groups those with events ahead by trip and window."""
+        self._expire()
+        jobs: dict[tuple[Timeline, datetime], _TripJob] = {}
+        for user_id, session_id in list(self._sessions):
+            session = await self._session_service.get_session(
+                app_name=self._app_name,
+                user_id=user_id,
+                session_id=session_id,
+                config=GetSessionConfig(num_recent_events=0),
+            )
+            if session is None or not session.state.get(constants.ITIN_KEY):
+                # Gone, or its itinerary was cleared; tracked again on a later request if it gets one.
+                self.untrack(user_id, session_id)
+                continue
+            itinerary = session.state[constants.ITIN_KEY]
+            profile = session.state.get(constants.PROF_KEY) or {}
+            # Equal itineraries share a Timeline, so equal trips share a job.
+            timeline = timeline_for(profile.get("home") or {}, itinerary, timeline_key(session.state))
+            now = _current_time(session.state, self._now())
+            start = datetime.combine(now.date(), datetime.min.time())
+            key = (timeline, start)
+            if key not in jobs:
+                jobs[key] = _TripJob(
+                    itinerary.get("trip_name", "the trip"), timeline, start, start + timedelta(days=self.days)
+                )
+            jobs[key].sessions.append(session)
+            # In-memory sessions are copied without awaiting; let requests through between them.
+            await asyncio.sleep(0)
+        return list(jobs.values())
+
+    async def _worker(self, queue: asyncio.Queue) -> int:
+        updated = 0
+        while not queue.empty():
+            job = queue.get_nowait()
+            segments = job.timeline.segments_between(job.start, job.end)
+            if not segments:
+                continue
+            try:
+                report = await trip_status_check(**trip_checks(segments))
+            except Exception:
+                logger.exception("Checking %s failed", job.trip_name)
+                monitored_trips.labels(result="failed").inc()
+                continue
+            monitored_trips.labels(result="checked").inc()
+            text = summarize_checks(job.trip_name, job.start, job.end, report)
+            for session in job.sessions:
+                updated += await self._store(session, text)
+        return updated
+
+    async def _store(self, session: Session, text: str) -> int:
+        if session.state.get(constants.DAILY_CHECKS) == text:
+            daily_checks_updates.labels(result="unchanged").inc()
+            return 0
+        # Recorded as ADK records state edits made outside a run, without content the agents see.
+        event = Event(
+            invocation_id="p-" + str(uuid.uuid4()),
+            author="user",
+            actions=EventActions(state_delta={constants.DAILY_CHECKS: text}),
+        )
+        try:
+            await self._session_service.append_event(session, event)
+        except Exception:
+            logger.warning("Could not store the daily checks of session %s", session.id, exc_info=True)
+            return 0
+        daily_checks_updates.labels(result="changed").inc()
+        return 1
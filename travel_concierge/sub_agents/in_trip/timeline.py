@@ -0,0 +1,184 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""An index of the itinerary's events by time, to find where the traveler goes next."""
+
+import bisect
+import collections
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Hashable, List, Mapping, Optional
+
+from travel_concierge.shared_libraries import constants
+from travel_concierge.shared_libraries.state_fingerprints import fingerprint, state_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Timelines kept, one per itinerary and home in use
+TIMELINE_CACHE_SIZE = 256
+
+# The time the traveler must be at an event of each type
+_ARRIVE_BY_FIELDS = {
+    "flight": ("boarding_time", "departure_time"),
+    "hotel": ("check_in_time",),
+    "visit": ("start_time",),
+}
+# Other times an event may carry, used when its own is missing
+_ANY_TIME_FIELDS = (
+    "start_time",
+    "boarding_time",
+    "departure_time",
+    "check_in_time",
+    "arrival_time",
+    "end_time",
+    "check_out_time",
+)
+_TIME_FORMATS = ("%H:%M", "%H:%M:%S", "%I:%M %p", "%I:%M%p", "%I %p")
+
+
+def parse_time(value: Any) -> Optional[time]:
+    """Parses a time like 16:00, 4:00 PM or 2025-06-15T16:00; None if it is not one."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    for time_format in _TIME_FORMATS:
+        try:
+            return datetime.strptime(value.upper(), time_format).time()
+        except ValueError:
+            pass
+    try:
+        return datetime.fromisoformat(value).time()
+    except ValueError:
+        return None
+
+
+def parse_date(value: Any) -> Optional[date]:
+    """Parses a date like 2025-06-15; None if it is not one."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return date.fromisoformat(value.strip()[:10])
+    except ValueError:
+        return None
+
+
+def arrive_by_time(event: Dict[str, Any]) -> Optional[time]:
+    """The time the traveler must be at `event`, or any time it carries if that is missing."""
+    fields = _ARRIVE_BY_FIELDS.get(event.get("event_type"), ()) + _ANY_TIME_FIELDS
+    for field in fields:
+        parsed = parse_time(event.get(field))
+        if parsed is not None:
+            return parsed
+    return None
+
+
+@dataclass(frozen=True)
+class Segment:
+    """Travel from `origin` to `destination`, which the traveler must reach by `arrive_by`."""
+
+    arrive_by: datetime
+    origin: Dict[str, Any]
+    destination: Dict[str, Any]
+    date: str
+
+
+class Timeline:
+    """
+    The events of an itinerary in time order, each paired with the place before it.
+
+    Times are real datetimes: an event listed after a later one on the same
+    day, e.g. a 00:30 flight after a 22:00 dinner, is taken to be after
+    midnight; an event without a time takes that of the event before it on
+    its day, or the start of its day. Events of days without a valid date
+    are left out.
+    """
+
+    def __init__(self, home: Dict[str, Any], itinerary: Dict[str, Any]):
+        self.home = home
+        events = []
+        for day in itinerary.get("days") or []:
+            day_date = parse_date(day.get("date"))
+            if day_date is None:
+                logger.warning("Skipping itinerary day with invalid date %r", day.get("date"))
+                continue
+            previous = datetime.combine(day_date, time())
+            for event in day.get("events") or []:
+                event_time = arrive_by_time(event)
+                if event_time is None:
+                    when = previous
+                else:
+                    when = datetime.combine(previous.date(), event_time)
+                    if when < previous:
+                        when += timedelta(days=1)
+                events.append((when, len(events), event, day.get("date")))
+                previous = when
+        events.sort(key=lambda item: item[:2])
+
+        self.segments: List[Segment] = []
+        origin = home
+        for when, _, event, day_date in events:
+            self.segments.append(Segment(when, origin, event, day_date))
+            origin = event
+        self._times = [segment.arrive_by for segment in self.segments]
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    def next_segment(self, now: datetime) -> Optional[Segment]:
+        """The first segment to arrive at `now` or later; the last one once the trip is over."""
+        if not self.segments:
+            return None
+        index = bisect.bisect_left(self._times, now)
+        return self.segments[min(index, len(self.segments) - 1)]
+
+    def segments_between(self, start: datetime, end: datetime) -> List[Segment]:
+        """The segments to arrive at from `start` up to, but excluding, `end`."""
+        return self.segments[bisect.bisect_left(self._times, start) : bisect.bisect_left(self._times, end)]
+
+
+_timelines: collections.OrderedDict[Hashable, Timeline] = collections.OrderedDict()
+_timelines_lock = threading.Lock()
+
+
+def timeline_key(state: Mapping[str, Any]) -> Hashable:
+    """The key of the session's timeline: the content fingerprints stored with its profile and itinerary."""
+    return (state_fingerprint(state, constants.PROF_KEY), state_fingerprint(state, constants.ITIN_KEY))
+
+
+def timeline_for(home: Dict[str, Any], itinerary: Dict[str, Any], key: Optional[Hashable] = None) -> Timeline:
+    """
+    Returns the Timeline of `itinerary`, building it the first time it is seen.
+
+    Timelines are looked up by `key`, which must change whenever the home or
+    itinerary does, typically timeline_key(state): sessions are copied when
+    loaded, so the same itinerary is a new object on every turn, while its
+    stored fingerprint is not. Without a key, the content is hashed instead.
+    """
+    if key is None:
+        key = ("content", fingerprint([home, itinerary]))
+    with _timelines_lock:
+        timeline = _timelines.get(key)
+        if timeline is not None:
+            _timelines.move_to_end(key)
+            return timeline
+
+    timeline = Timeline(home, itinerary)
+    logger.debug("Indexed %d itinerary events of %s", len(timeline), itinerary.get("trip_name"))
+    with _timelines_lock:
+        _timelines[key] = timeline
+        while len(_timelines) > TIMELINE_CACHE_SIZE:
+            _timelines.popitem(last=False)
+    return timeline
@@ -14,30 +14,60 @@
 
 """Tools for the in_trip, trip_monitor and day_of agents."""
 
+import asyncio
+import logging
+import os
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Callable, Hashable, Iterable, Optional
 
 from google.adk.agents.readonly_context import ReadonlyContext
+import pydantic
 
 from travel_concierge.sub_agents.in_trip import prompt
+from travel_concierge.sub_agents.in_trip.timeline import Segment, timeline_for, timeline_key
 from travel_concierge.shared_libraries import constants
+from travel_concierge.shared_libraries.instructions import memoized_instruction
+from travel_concierge.shared_libraries.tool_timing import timed
+from travel_concierge.shared_libraries.types import ActivityCheck, EventCheck, FlightCheck
+from travel_concierge.tools.fake_status import SimulatedStatusProvider
+from travel_concierge.tools.trip_status import CachingStatusProvider
 
+logger = logging.getLogger(__name__)
 
-def flight_status_check(flight_number: str, flight_date: str, checkin_time: str, departure_time: str):
-    """Checks the status of a flight, given its flight_number, date, checkin_time and departure_time."""
-    print("Checking", flight_number, flight_date, checkin_time, departure_time)
-    return {"status": f"Flight {flight_number} checked"}
+# Checks of one trip_status_check call running at the same time
+TRIP_CHECK_CONCURRENCY = int(os.getenv("TRIP_CHECK_CONCURRENCY", "16"))
+
+# Flight, event and weather status, cached and coalesced; the simulated provider stands in for real feeds
+status_service = CachingStatusProvider(SimulatedStatusProvider())
 
 
-def event_booking_check(event_name: str, event_date: str, event_location: str):
+@timed
+async def flight_status_check(flight_number: str, flight_date: str, checkin_time: str, departure_time: str):
+    """Checks the status of a flight, given its flight_number, date, checkin_time and departure_time."""
+    logger.debug("Checking flight %s on %s", flight_number, flight_date)
+    flight = await status_service.flight_status(flight_number, flight_date)
+    if flight["state"] == "cancelled":
+        return {"status": f"Flight {flight_number} is cancelled.", "needs_attention": True}
+    if flight["state"] == "delayed":
+        return {
+            "status": f"Flight {flight_number} is delayed by {flight['delay_minutes']} minutes.",
+            "needs_attention": True,
+        }
+    return {"status": f"Flight {flight_number} is on time.", "needs_attention": False}
+
+
+@timed
+async def event_booking_check(event_name: str, event_date: str, event_location: str):
     """Checks the status of an event that requires booking, given its event_name, date, and event_location."""
-    print("Checking", event_name, event_date, event_location)
-    if event_name.startswith("Space Needle"):  # Mocking an exception to illustrate
-        return {"status": f"{event_name} is closed."}
-    return {"status": f"{event_name} checked"}
+    logger.debug("Checking event %s on %s at %s", event_name, event_date, event_location)
+    event = await status_service.event_status(event_name, event_date, event_location)
+    if event["state"] == "closed":
+        return {"status": f"{event_name} is closed.", "needs_attention": True}
+    return {"status": f"{event_name} is open.", "needs_attention": False}
 
 
-def weather_impact_check(activity_name: str, activity_date: str, activity_location: str):
+@timed
+async def weather_impact_check(activity_name: str, activity_date: str, activity_location: str):
     """
     Checks the status of an outdoor activity that may be impacted by weather, given its name, date, and its location.
 
@@ -49,21 +79,108 @@ def weather_impact_check(activity_name: str, activity_date: str, activity_locati
     Returns:
         A dictionary containing the status of the activity.
     """
-    print("Checking", activity_name, activity_date, activity_location)
-    return {"status": f"{activity_name} checked"}
+    logger.debug("Checking weather for %s on %s at %s", activity_name, activity_date, activity_location)
+    # Activities at the same place on the same day share a forecast.
+    weather = await status_service.weather_forecast(activity_location or activity_name, activity_date)
+    status = f"{weather['forecast'].capitalize()} expected for {activity_name}."
+    if not weather["outdoor_ok"]:
+        status += " It may be affected by the weather."
+    return {"status": status, "needs_attention": not weather["outdoor_ok"]}
+
+
+async def _run_check(
+    check: Callable, model: type[pydantic.BaseModel], item: Any, semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """Runs one check of a batch; a check that is malformed or fails is reported, not raised."""
+    try:
+        args = model.model_validate(item).model_dump()
+    except pydantic.ValidationError as e:
+        return {"item": item, "status": "not checked", "error": str(e)}
+    async with semaphore:
+        try:
+            result = await check(**args)
+        except Exception as e:
+            logger.warning("%s failed for %s", check.__name__, args, exc_info=True)
+            return {**args, "status": "unknown", "error": str(e)}
+    return {**args, **result}
+
+
+async def trip_status_check(
+    flights: Optional[list[FlightCheck]] = None,
+    events: Optional[list[EventCheck]] = None,
+    activities: Optional[list[ActivityCheck]] = None,
+):
+    """
+    Checks the status of all flights, booked events and outdoor activities of an itinerary at once.
 
+    Args:
+        flights: The flights, with their flight_number, flight_date, checkin_time and departure_time.
+        events: The events that require booking, with their event_name, event_date and event_location.
+        activities: The outdoor activities that may be impacted by weather, with their activity_name,
+          activity_date and activity_location.
 
-def get_event_time_as_destination(destin_json: Dict[str, Any], default_value: str):
-    """Returns an event time appropriate for the location type."""
-    match destin_json["event_type"]:
-        case "flight":
-            return destin_json["boarding_time"]
-        case "hotel":
-            return destin_json["check_in_time"]
-        case "visit":
-            return destin_json["start_time"]
-        case _:
-            return default_value
+    Returns:
+        A report with the status of each flight, event and activity, in the order given.
+    """
+    semaphore = asyncio.Semaphore(TRIP_CHECK_CONCURRENCY)
+    batches = {
+        "flights": (flight_status_check, FlightCheck, flights or []),
+        "events": (event_booking_check, EventCheck, events or []),
+        "activities": (weather_impact_check, ActivityCheck, activities or []),
+    }
+    results = await asyncio.gather(*(
+        _run_check(check, model, item, semaphore)
+        for check, model, items in batches.values()
+        for item in items
+    ))
+
+    report, start = {}, 0
+    for kind, (_, _, items) in batches.items():
+        report[kind] = results[start : start + len(items)]
+        start += len(items)
+    failed = sum(1 for result in results if "error" in result)
+    logger.debug("Checked %d trip items, %d failed", len(results), failed)
+    report["summary"] = {"checked": len(results) - failed, "failed": failed}
+    return report
+
+
+def _place(event: Dict[str, Any]) -> str:
+    location = event.get("location")
+    if isinstance(location, dict) and location.get("name"):
+        return location["name"]
+    return event.get("address") or event.get("description", "")
+
+
+def trip_checks(segments: Iterable[Segment]) -> Dict[str, list[Dict[str, str]]]:
+    """
+    Returns the arguments of trip_status_check for the events of `segments`.
+
+    Flights are checked for delays, other events requiring booking for their
+    booking, and the remaining visits for the weather.
+    """
+    checks = {"flights": [], "events": [], "activities": []}
+    for segment in segments:
+        event = segment.destination
+        if event.get("event_type") == "flight":
+            checks["flights"].append({
+                "flight_number": event.get("flight_number", ""),
+                "flight_date": segment.date,
+                "checkin_time": event.get("boarding_time", ""),
+                "departure_time": event.get("departure_time", ""),
+            })
+        elif event.get("booking_required"):
+            checks["events"].append({
+                "event_name": _place(event),
+                "event_date": segment.date,
+                "event_location": _place(event),
+            })
+        elif event.get("event_type") == "visit":
+            checks["activities"].append({
+                "activity_name": event.get("description", ""),
+                "activity_date": segment.date,
+                "activity_location": _place(event),
+            })
+    return checks
 
 
 def parse_as_origin(origin_json: Dict[str, Any]):
@@ -72,7 +189,7 @@ def parse_as_origin(origin_json: Dict[str, Any]):
         case "flight":
             return (
                 origin_json["arrival_airport"] + " Airport",
-                origin_json["arrival_time"],
+                origin_json.get("arrival_time") or "any time",
             )
         case "hotel":
             return (
@@ -82,7 +199,7 @@ def parse_as_origin(origin_json: Dict[str, Any]):
         case "visit":
             return (
                 origin_json["description"] + " " + origin_json.get("address", ""),
-                origin_json["end_time"],
+                origin_json.get("end_time") or "any time",
             )
         case "home":
             return (
@@ -99,9 +216,10 @@ def parse_as_destin(destin_json: Dict[str, Any]):
     """Returns a tuple of strings (destination, arrive_by) appropriate for the destination."""
     match destin_json["event_type"]:
         case "flight":
+            boarding_time = destin_json.get("boarding_time") or destin_json.get("departure_time")
             return (
                 destin_json["departure_airport"] + " Airport",
-                "An hour before " + destin_json["boarding_time"],
+                "An hour before " + boarding_time if boarding_time else "as soon as possible",
             )
         case "hotel":
             return (
@@ -111,7 +229,7 @@ def parse_as_destin(destin_json: Dict[str, Any]):
         case "visit":
             return (
                 destin_json["description"] + " " + destin_json.get("address", ""),
-                destin_json["start_time"],
+                destin_json.get("start_time") or "as soon as possible",
             )
         case "home":
             return (
@@ -124,7 +242,9 @@ def parse_as_destin(destin_json: Dict[str, Any]):
             return "Local in the region", "as soon as possible"
 
 
-def find_segment(profile: Dict[str, Any], itinerary: Dict[str, Any], current_datetime: str):
+def find_segment(
+    profile: Dict[str, Any], itinerary: Dict[str, Any], current_datetime: str, key: Optional[Hashable] = None
+):
     """
     Find the events to travel from A to B
     This follows the itinerary schema in types.Itinerary.
@@ -136,6 +256,7 @@ def find_segment(profile: Dict[str, Any], itinerary: Dict[str, Any], current_dat
         profile: A dictionary containing the user's profile.
         itinerary: A dictionary containing the user's itinerary.
         current_datetime: A string containing the current date and time.   
+        key: The key of the itinerary's timeline, see timeline_for.
 
     Returns:
       from - capture information about the origin of this segment.
@@ -143,41 +264,14 @@ def find_segment(profile: Dict[str, Any], itinerary: Dict[str, Any], current_dat
       arrive_by - an indication of the time we shall arrive at the destination.
     """
     # Expects current_datetime is in '2024-03-15 04:00:00' format
-    datetime_object = datetime.fromisoformat(current_datetime)
-    current_date = datetime_object.strftime("%Y-%m-%d")
-    current_time = datetime_object.strftime("%H:%M")
-    event_date = current_date
-    event_time = current_time
-
-    print("-----")
-    print("MATCH DATE", current_date, current_time)
-    print("-----")
-
-    # defaults
-    origin_json = profile["home"]
-    destin_json = profile["home"]
-
-    leave_by = "No movement required"
-    arrive_by = "No movement required"
-
-    # Go through the itinerary to find where we are base on the current date and time
-    for day in itinerary.get("days", []):
-        event_date = day["date"]
-        for event in day["events"]:
-            # for every event we update the origin and destination until
-            # we find one we need to pay attention
-            origin_json = destin_json
-            destin_json = event
-            event_time = get_event_time_as_destination(destin_json, current_time)
-            # The moment we find an event that's in the immediate future we stop to handle it
-            print(
-                event["event_type"], event_date, current_date, event_time, current_time
-            )
-            if event_date >= current_date and event_time >= current_time:
-                break
-        else:  # if inner loop not break, continue
-            continue
-        break  # else break too.
+    now = datetime.fromisoformat(current_datetime)
+    logger.debug("Finding the itinerary segment at %s", now)
+
+    home = profile["home"]
+    # The first event to reach from now on, through an index built once per itinerary
+    segment = timeline_for(home, itinerary, key).next_segment(now)
+    origin_json = segment.origin if segment else home
+    destin_json = segment.destination if segment else home
 
     #
     # Construct prompt descriptions for travel_from, travel_to, arrive_by
@@ -193,7 +287,7 @@ def _inspect_itinerary(state: dict[str: Any]):
 
     itinerary = state[constants.ITIN_KEY]
     profile = state[constants.PROF_KEY]
-    print("itinerary", itinerary)
+    logger.debug("Inspecting itinerary %s", itinerary.get("trip_name"))
     current_datetime = itinerary["start_date"] + " 00:00"
     if state.get(constants.ITIN_DATETIME, ""):
         current_datetime = state[constants.ITIN_DATETIME]
@@ -201,8 +295,9 @@ def _inspect_itinerary(state: dict[str: Any]):
     return itinerary, profile, current_datetime
 
 
+@memoized_instruction(constants.ITIN_KEY, constants.PROF_KEY, constants.ITIN_DATETIME)
 def transit_coordination(readonly_context: ReadonlyContext):
-    """Dynamically generates an instruction for the day_of agent."""
+    """Dynamically generates an instruction for the day_of agent, again only when the state it reads changes."""
 
     state = readonly_context.state
 
@@ -212,18 +307,15 @@ def transit_coordination(readonly_context: ReadonlyContext):
 
     itinerary, profile, current_datetime = _inspect_itinerary(state)
     travel_from, travel_to, leave_by, arrive_by = find_segment(
-        profile, itinerary, current_datetime
+        profile, itinerary, current_datetime, timeline_key(state)
     )
 
-    print("-----")
-    print(itinerary["trip_name"])
-    print(current_datetime)
-    print("-----")
-    print("-----")
-    print("TRIP EVENT")
-    print("FROM", travel_from, leave_by)
-    print("TO", travel_to, arrive_by)
-    print("-----")
+    logger.debug(
+        "Transit segment of %s at %s",
+        itinerary["trip_name"],
+        current_datetime,
+        extra={"travel_from": travel_from, "leave_by": leave_by, "travel_to": travel_to, "arrive_by": arrive_by},
+    )
 
     return prompt.LOGISTIC_INSTR_TEMPLATE.format(
         CURRENT_TIME=current_datetime,
@@ -16,13 +16,14 @@
 
 from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
+from travel_concierge.shared_libraries.models import MODEL
 from travel_concierge.shared_libraries.types import DestinationIdeas, POISuggestions, json_response_config
 from travel_concierge.sub_agents.inspiration import prompt
 from travel_concierge.tools.places import map_tool
 
 
 place_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="place_agent",
     instruction=prompt.PLACE_AGENT_INSTR,
     description="This agent suggests a few destination given some user preferences",
@@ -34,7 +35,7 @@ place_agent = Agent(
 )
 
 poi_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="poi_agent",
     description="This agent suggests a few activities and points of interests given a destination",
     instruction=prompt.POI_AGENT_INSTR,
@@ -46,7 +47,7 @@ poi_agent = Agent(
 )
 
 inspiration_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="inspiration_agent",
     description="A travel inspiration agent who inspire users, and discover their next vacations; Provide information about places, activities, interests,",
     instruction=prompt.INSPIRATION_AGENT_INSTR,
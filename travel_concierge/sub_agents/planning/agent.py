@@ -17,16 +17,18 @@
 from google.adk.agents import Agent
 from google.adk.tools.agent_tool import AgentTool
 from google.genai.types import GenerateContentConfig
+from travel_concierge.shared_libraries.instructions import template_instruction
+from travel_concierge.shared_libraries.models import MODEL
 from travel_concierge.shared_libraries import types
 from travel_concierge.sub_agents.planning import prompt
 from travel_concierge.tools.memory import memorize
 
 
 itinerary_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="itinerary_agent",
     description="Create and persist a structured JSON representation of the itinerary",
-    instruction=prompt.ITINERARY_AGENT_INSTR,
+    instruction=template_instruction(prompt.ITINERARY_AGENT_INSTR, "ITINERARY_AGENT_INSTR"),
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
     output_schema=types.Itinerary,
@@ -36,10 +38,10 @@ itinerary_agent = Agent(
 
 
 hotel_room_selection_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="hotel_room_selection_agent",
     description="Help users with the room choices for a hotel",
-    instruction=prompt.HOTEL_ROOM_SELECTION_INSTR,
+    instruction=template_instruction(prompt.HOTEL_ROOM_SELECTION_INSTR, "HOTEL_ROOM_SELECTION_INSTR"),
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
     output_schema=types.RoomsSelection,
@@ -48,10 +50,10 @@ hotel_room_selection_agent = Agent(
 )
 
 hotel_search_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="hotel_search_agent",
     description="Help users find hotel around a specific geographic area",
-    instruction=prompt.HOTEL_SEARCH_INSTR,
+    instruction=template_instruction(prompt.HOTEL_SEARCH_INSTR, "HOTEL_SEARCH_INSTR"),
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
     output_schema=types.HotelsSelection,
@@ -61,10 +63,10 @@ hotel_search_agent = Agent(
 
 
 flight_seat_selection_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="flight_seat_selection_agent",
     description="Help users with the seat choices",
-    instruction=prompt.FLIGHT_SEAT_SELECTION_INSTR,
+    instruction=template_instruction(prompt.FLIGHT_SEAT_SELECTION_INSTR, "FLIGHT_SEAT_SELECTION_INSTR"),
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
     output_schema=types.SeatsSelection,
@@ -73,10 +75,10 @@ flight_seat_selection_agent = Agent(
 )
 
 flight_search_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     name="flight_search_agent",
     description="Help users find best flight deals",
-    instruction=prompt.FLIGHT_SEARCH_INSTR,
+    instruction=template_instruction(prompt.FLIGHT_SEARCH_INSTR, "FLIGHT_SEARCH_INSTR"),
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
     output_schema=types.FlightsSelection,
@@ -86,10 +88,10 @@ flight_search_agent = Agent(
 
 
 planning_agent = Agent(
-    model="gemini-2.5-flash",
+    model=MODEL,
     description="""Helps users with travel planning, complete a full itinerary for their vacation, finding best deals for flights and hotels.""",
     name="planning_agent",
-    instruction=prompt.PLANNING_AGENT_INSTR,
+    instruction=template_instruction(prompt.PLANNING_AGENT_INSTR, "PLANNING_AGENT_INSTR"),
     tools=[
         AgentTool(agent=flight_search_agent),
         AgentTool(agent=flight_seat_selection_agent),
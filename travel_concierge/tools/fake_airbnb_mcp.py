@@ -0,0 +1,114 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A local stand-in for the Airbnb MCP server, for offline tests and load tests.
+
+It serves the airbnb_search and airbnb_listing_details tools over stdio, with
+made-up listings that are the same for the same query. Point the MCP pool at it:
+
+    MCP_AIRBNB_COMMAND="python -m travel_concierge.tools.fake_airbnb_mcp" uvicorn travel_concierge.api:app
+"""
+
+import asyncio
+import hashlib
+import os
+from typing import Any, Dict, Optional
+
+from mcp.server.fastmcp import FastMCP
+
+# Seconds each tool call takes
+FAKE_AIRBNB_LATENCY = float(os.getenv("FAKE_AIRBNB_LATENCY", "0"))
+# Listings returned by each search
+FAKE_AIRBNB_RESULTS = int(os.getenv("FAKE_AIRBNB_RESULTS", "5"))
+
+server = FastMCP("airbnb", log_level="WARNING")
+
+
+def _listing(location: str, index: int) -> Dict[str, Any]:
+    """Makes up a listing in `location` that is the same every time."""
+    digest = hashlib.sha1(f"{location.casefold()}#{index}".encode()).hexdigest()
+    listing_id = str(int(digest[:12], 16))
+    return {
+        "id": listing_id,
+        "url": f"https://www.airbnb.com/rooms/{listing_id}",
+        "demandStayListing": {
+            "description": {"name": f"{location} stay #{index + 1}"},
+            "location": {
+                "coordinate": {
+                    "latitude": round(int(digest[12:20], 16) / 0xFFFFFFFF * 180 - 90, 6),
+                    "longitude": round(int(digest[20:28], 16) / 0xFFFFFFFF * 360 - 180, 6),
+                }
+            },
+        },
+        "badges": "Guest favorite" if index % 2 == 0 else "",
+        "structuredContent": {"primaryLine": f"{1 + index % 3} bedrooms", "secondaryLine": "Free cancellation"},
+        "avgRatingA11yLabel": f"{4.5 + (int(digest[28:30], 16) % 5) / 10:.1f} out of 5 average rating",
+        "structuredDisplayPrice": {"primaryLine": {"accessibilityLabel": f"${80 + int(digest[30:34], 16) % 300} per night"}},
+    }
+
+
+async def _simulate_latency():
+    if FAKE_AIRBNB_LATENCY > 0:
+        await asyncio.sleep(FAKE_AIRBNB_LATENCY)
+
+
+@server.tool()
+async def airbnb_search(
+    location: str,
+    checkin: Optional[str] = None,
+    checkout: Optional[str] = None,
+    adults: int = 1,
+    children: int = 0,
+    infants: int = 0,
+    pets: int = 0,
+    minPrice: Optional[int] = None,
+    maxPrice: Optional[int] = None,
+    cursor: Optional[str] = None,
+    ignoreRobotsText: bool = False,
+) -> Dict[str, Any]:
+    """Search for Airbnb listings with various filters and pagination. Provide direct links to the user."""
+    await _simulate_latency()
+    return {
+        "searchUrl": f"https://www.airbnb.com/s/{location.replace(' ', '-')}/homes",
+        "searchResults": [_listing(location, index) for index in range(FAKE_AIRBNB_RESULTS)],
+        "paginationInfo": {"pageCursors": [], "nextPageCursor": None},
+    }
+
+
+@server.tool()
+async def airbnb_listing_details(
+    id: str,
+    checkin: Optional[str] = None,
+    checkout: Optional[str] = None,
+    adults: int = 1,
+    children: int = 0,
+    infants: int = 0,
+    pets: int = 0,
+    ignoreRobotsText: bool = False,
+) -> Dict[str, Any]:
+    """Get detailed information about a specific Airbnb listing. Provide direct links to the user."""
+    await _simulate_latency()
+    return {
+        "listingUrl": f"https://www.airbnb.com/rooms/{id}",
+        "details": [
+            {"id": "LOCATION_DEFAULT", "title": "Where you'll be"},
+            {"id": "POLICIES_DEFAULT", "houseRules": "Check-in after 4:00 PM, checkout before 11:00 AM"},
+            {"id": "AMENITIES_DEFAULT", "amenities": ["Wifi", "Kitchen", "Free parking on premises"]},
+        ],
+    }
+
+
+if __name__ == "__main__":
+    server.run()
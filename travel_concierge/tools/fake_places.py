@@ -0,0 +1,215 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A local stand-in for the Places API, for offline tests and load tests.
+
+It serves findplacefromtext and photo requests from recorded fixtures, with
+optional latency and injected errors. Run it and point PlacesService at it:
+
+    python -m travel_concierge.tools.fake_places --port 8099 --latency 0.05
+    PLACES_BASE_URL=http://127.0.0.1:8099 uvicorn travel_concierge.api:app
+"""
+
+import argparse
+import asyncio
+import base64
+import collections
+import dataclasses
+import hashlib
+import json
+import os
+import random
+import threading
+from typing import Any, Dict, Optional
+
+from fastapi import FastAPI, Response
+from fastapi.responses import JSONResponse
+import uvicorn
+
+from travel_concierge.tools.geocode_cache import normalize_query
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), "fake_places_fixtures.json")
+
+# A 1x1 transparent PNG, served for every photo
+PHOTO = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+
+@dataclasses.dataclass
+class FakePlacesConfig:
+    """
+    How the fake server behaves; it can be changed while it runs via POST /_config.
+
+    Every response is delayed by `latency` plus up to `jitter` seconds, and a
+    fraction `error_rate` of requests fail with `error_status`. Queries without
+    a fixture get a made-up but stable place, or no results if
+    `synthesize_unknown` is False.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    synthesize_unknown: bool = True
+    seed: Optional[int] = None
+
+
+def load_fixtures(path: str = FIXTURES_PATH) -> Dict[str, Dict[str, Any]]:
+    """Returns the fixture candidates keyed by normalized place name."""
+    with open(path, "r") as file:
+        return {normalize_query(name): candidate for name, candidate in json.load(file).items()}
+
+
+def _synthesize(query: str) -> Dict[str, Any]:
+    """Makes up a candidate for `query` that is the same every time."""
+    digest = hashlib.sha1(normalize_query(query).encode()).hexdigest()
+    name, _, address = query.partition(",")
+    return {
+        "place_id": f"synthetic-{digest[:20]}",
+        "name": name.strip(),
+        "formatted_address": address.strip() or name.strip(),
+        "geometry": {
+            "location": {
+                "lat": round(int(digest[:8], 16) / 0xFFFFFFFF * 180 - 90, 7),
+                "lng": round(int(digest[8:16], 16) / 0xFFFFFFFF * 360 - 180, 7),
+            }
+        },
+        "photos": [{"photo_reference": f"synthetic-{digest[:12]}", "height": 1000, "width": 1000}],
+    }
+
+
+def create_app(config: Optional[FakePlacesConfig] = None, fixtures_path: str = FIXTURES_PATH) -> FastAPI:
+    """Returns the fake Places API as an ASGI app."""
+    config = config or FakePlacesConfig()
+    fixtures = load_fixtures(fixtures_path)
+    rng = random.Random(config.seed)
+    stats: collections.Counter[str] = collections.Counter()
+    app = FastAPI(title="Fake Places API")
+    app.state.config = config
+    app.state.stats = stats
+
+    async def simulate(endpoint: str) -> Optional[Response]:
+        """Waits out the configured latency, and returns an error response if one is due."""
+        stats[endpoint] += 1
+        delay = config.latency + rng.uniform(0, config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if rng.random() < config.error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"status": "UNKNOWN_ERROR"}, status_code=config.error_status)
+        return None
+
+    @app.get("/findplacefromtext/json")
+    async def find_place_from_text(input: str, inputtype: str = "textquery", fields: str = "", key: str = ""):
+        error = await simulate("findplacefromtext")
+        if error is not None:
+            return error
+
+        query = normalize_query(input)
+        candidate = fixtures.get(query) or fixtures.get(query.split(" , ")[0])
+        if candidate is None and config.synthesize_unknown:
+            candidate = _synthesize(input)
+        if candidate is None:
+            return {"candidates": [], "status": "ZERO_RESULTS"}
+
+        if fields:
+            wanted = set(fields.split(","))
+            candidate = {name: value for name, value in candidate.items() if name in wanted}
+        return {"candidates": [candidate], "status": "OK"}
+
+    @app.get("/photo")
+    async def photo(photoreference: str, maxwidth: int = 400, key: str = ""):
+        error = await simulate("photo")
+        if error is not None:
+            return error
+        return Response(PHOTO, media_type="image/png")
+
+    @app.get("/_stats")
+    async def get_stats():
+        return dict(stats)
+
+    @app.post("/_config")
+    async def update_config(changes: Dict[str, Any]):
+        for name, value in changes.items():
+            if not hasattr(config, name):
+                return JSONResponse({"detail": f"Unknown setting {name}"}, status_code=400)
+            setattr(config, name, value)
+        return dataclasses.asdict(config)
+
+    return app
+
+
+class FakePlacesServer:
+    """Runs the fake Places API on a free local port in a background thread, e.g. for tests."""
+
+    def __init__(self, config: Optional[FakePlacesConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.app = create_app(config)
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host=host, port=port, log_level="warning"))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.servers[0].sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Starts serving and returns the base URL to give PlacesService."""
+        self._thread = threading.Thread(target=self._server.run, name="fake-places", daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("Fake Places server failed to start")
+            self._thread.join(0.01)
+        return self.base_url
+
+    def stop(self):
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakePlacesServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many more seconds, at random")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--no-synthesize", action="store_true", help="no results for queries without a fixture")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = FakePlacesConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        synthesize_unknown=not args.no_synthesize,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+A local stand-in for flight, event and weather status feeds, for demos and load tests.
+
+Answers are made up, but the same for the same entity and date, so they can
+be cached like real ones. Latency and faults are configurable, e.g.
+
+    STATUS_SIM_LATENCY=0.2 STATUS_SIM_ERROR_RATE=0.05 uvicorn travel_concierge.api:app
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import os
+import random
+from typing import Any, Dict, Optional
+
+from travel_concierge.tools.trip_status import StatusProviderError
+
+STATUS_SIM_LATENCY = float(os.getenv("STATUS_SIM_LATENCY", "0"))
+STATUS_SIM_JITTER = float(os.getenv("STATUS_SIM_JITTER", "0"))
+STATUS_SIM_ERROR_RATE = float(os.getenv("STATUS_SIM_ERROR_RATE", "0"))
+STATUS_SIM_DISRUPTION_RATE = float(os.getenv("STATUS_SIM_DISRUPTION_RATE", "0"))
+
+_FORECASTS = ("sunny", "partly cloudy", "cloudy", "light rain")
+_BAD_WEATHER = ("heavy rain", "thunderstorms", "strong winds")
+
+
+@dataclasses.dataclass
+class SimulatedStatusConfig:
+    """
+    How the simulated provider behaves; it can be changed while it runs.
+
+    Every answer is delayed by `latency` plus up to `jitter` seconds, and a
+    fraction `error_rate` of lookups fail with StatusProviderError. A fraction
+    `disruption_rate` of flights, events and forecasts are bad news: delayed
+    or cancelled, closed, or bad weather. Events whose name starts with one of
+    `closed_events` are always closed, as in the Seattle demo itinerary.
+    """
+
+    latency: float = STATUS_SIM_LATENCY
+    jitter: float = STATUS_SIM_JITTER
+    error_rate: float = STATUS_SIM_ERROR_RATE
+    disruption_rate: float = STATUS_SIM_DISRUPTION_RATE
+    closed_events: tuple[str, ...] = ("Space Needle",)
+    seed: Optional[int] = None
+
+
+class SimulatedStatusProvider:
+    """A StatusProvider answering from a seeded random draw per entity and date."""
+
+    def __init__(self, config: Optional[SimulatedStatusConfig] = None):
+        self.config = config or SimulatedStatusConfig()
+        self._rng = random.Random(self.config.seed)
+        self.calls = 0
+
+    async def flight_status(self, flight_number: str, flight_date: str) -> Dict[str, Any]:
+        draw = await self._simulate("flight", flight_number, flight_date)
+        if draw.random() >= self.config.disruption_rate:
+            return {"state": "on time", "delay_minutes": 0}
+        if draw.random() < 0.25:
+            return {"state": "cancelled", "delay_minutes": 0}
+        return {"state": "delayed", "delay_minutes": draw.choice((15, 30, 45, 60, 90, 120, 180))}
+
+    async def event_status(self, event_name: str, event_date: str, event_location: str) -> Dict[str, Any]:
+        draw = await self._simulate("event", f"{event_name} @ {event_location}", event_date)
+        closed = any(event_name.casefold().startswith(name.casefold()) for name in self.config.closed_events)
+        if closed or draw.random() < self.config.disruption_rate:
+            return {"state": "closed"}
+        return {"state": "open"}
+
+    async def weather_forecast(self, location: str, date: str) -> Dict[str, Any]:
+        draw = await self._simulate("weather", location, date)
+        if draw.random() < self.config.disruption_rate:
+            return {"forecast": draw.choice(_BAD_WEATHER), "outdoor_ok": False}
+        return {"forecast": draw.choice(_FORECASTS), "outdoor_ok": True}
+
+    async def _simulate(self, kind: str, entity: str, date: str) -> random.Random:
+        """Waits out the latency and raises a fault if one is due; returns the draw for the answer."""
+        self.calls += 1
+        delay = self.config.latency + self._rng.uniform(0, self.config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._rng.random() < self.config.error_rate:
+            raise StatusProviderError(f"Simulated {kind} feed error for {entity} on {date}")
+        seed = f"{self.config.seed}:{kind}:{' '.join(entity.casefold().split())}:{date}"
+        return random.Random(hashlib.sha256(seed.encode()).digest())
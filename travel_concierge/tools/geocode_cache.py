@@ -0,0 +1,153 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A two-tier cache of Places API lookups, in process and optionally on disk."""
+
+import collections
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+GEOCODE_CACHE_SIZE = int(os.getenv("GEOCODE_CACHE_SIZE", "10000"))
+# Google allows caching coordinates for up to 30 days.
+GEOCODE_CACHE_TTL = float(os.getenv("GEOCODE_CACHE_TTL", str(30 * 24 * 3600)))
+GEOCODE_CACHE_NEGATIVE_TTL = float(os.getenv("GEOCODE_CACHE_NEGATIVE_TTL", "3600"))
+# A SQLite file shared by all workers; empty keeps the cache in process only.
+GEOCODE_CACHE_PATH = os.getenv("GEOCODE_CACHE_PATH", "")
+
+NOT_FOUND = {"error": "No places found."}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS geocodes (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def normalize_query(query: str, namespace: str = "") -> str:
+    """
+    Returns the cache key for a `place_name, address` query, ignoring case and spacing.
+
+    Keys are prefixed by `namespace`, e.g. the Places API base URL, so answers
+    of different APIs sharing a cache file are kept apart.
+    """
+    key = " ".join(query.casefold().replace(",", " , ").split())
+    return f"{namespace} {key}" if namespace else key
+
+
+class GeocodeCache:
+    """
+    Caches find_place_from_text results by normalized query.
+
+    Lookups check an in-process LRU first, then the SQLite file at `path` if one
+    is given, which gunicorn workers share. Found places are kept for `ttl`
+    seconds and "No places found." answers for `negative_ttl` seconds; other
+    errors are never cached. A TTL of 0 turns off caching of that kind of
+    result, and a `max_entries` of 0 leaves the in-process tier unbounded.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = GEOCODE_CACHE_SIZE,
+        ttl: float = GEOCODE_CACHE_TTL,
+        negative_ttl: float = GEOCODE_CACHE_NEGATIVE_TTL,
+        path: Optional[str] = GEOCODE_CACHE_PATH,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.path = path
+        self._clock = clock
+        self._entries: collections.OrderedDict[str, tuple[float, Dict[str, Any]]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.metrics: collections.Counter[str] = collections.Counter()
+        if path:
+            self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, query: str, namespace: str = "") -> Optional[Dict[str, Any]]:
+        """Returns the cached result for `query` in `namespace`, or None on a miss."""
+        key = normalize_query(query, namespace)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.metrics["memory_hits"] += 1
+                return dict(entry[1])
+            if entry is not None:
+                del self._entries[key]
+
+        if self.path:
+            row = self._connect().execute(
+                "SELECT result, expires_at FROM geocodes WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is not None:
+                result = json.loads(row[0])
+                self._remember(key, row[1], result)
+                self._count("disk_hits")
+                return dict(result)
+
+        self._count("misses")
+        return None
+
+    def put(self, query: str, result: Dict[str, Any], namespace: str = ""):
+        """Caches a result in `namespace`, unless it is an error other than "No places found."."""
+        if "error" in result and result != NOT_FOUND:
+            return
+        ttl = self.negative_ttl if result == NOT_FOUND else self.ttl
+        if ttl <= 0:
+            return
+        key = normalize_query(query, namespace)
+        expires_at = self._clock() + ttl
+        result = dict(result)
+        self._remember(key, expires_at, result)
+        if self.path:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO geocodes VALUES (?, ?, ?)", (key, json.dumps(result), expires_at)
+            )
+        self._count("stores")
+
+    def _remember(self, key: str, expires_at: float, result: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = (expires_at, result)
+            self._entries.move_to_end(key)
+            while self.max_entries > 0 and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.metrics["evictions"] += 1
+
+    def _count(self, metric: str):
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of entries in process, and hit, miss, store and eviction counts."""
+        with self._lock:
+            entries = len(self._entries)
+        return {"entries": entries, **self.metrics}
@@ -0,0 +1,227 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A pool of pre-warmed Airbnb MCP server connections shared by API requests."""
+
+import asyncio
+import contextlib
+import logging
+import os
+import shlex
+import time
+from typing import Any, AsyncIterator, Callable, Optional
+
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset, StdioServerParameters
+
+logger = logging.getLogger(__name__)
+
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "2"))
+MCP_SPAWN_TIMEOUT = float(os.getenv("MCP_SPAWN_TIMEOUT", "60"))
+MCP_PROBE_INTERVAL = float(os.getenv("MCP_PROBE_INTERVAL", "30"))
+MCP_PROBE_TIMEOUT = float(os.getenv("MCP_PROBE_TIMEOUT", "10"))
+MCP_CHECKOUT_TIMEOUT = float(os.getenv("MCP_CHECKOUT_TIMEOUT", "30"))
+# The command starting an Airbnb MCP server; see fake_airbnb_mcp for a local stand-in
+MCP_AIRBNB_COMMAND = os.getenv("MCP_AIRBNB_COMMAND", "npx -y @openbnb/mcp-server-airbnb --ignore-robots-txt")
+
+
+class MCPPoolError(RuntimeError):
+    """Raised when no healthy MCP server can be handed out."""
+
+
+def airbnb_connection_params() -> StdioServerParameters:
+    """Connection parameters for the Airbnb MCP server."""
+    command, *args = shlex.split(MCP_AIRBNB_COMMAND)
+    return StdioServerParameters(command=command, args=args)
+
+
+class PooledToolset:
+    """One MCP server process and the tools it exposes."""
+
+    def __init__(self, slot: int):
+        self.slot = slot
+        self.toolset: Optional[MCPToolset] = None
+        self.tools: list[Any] = []
+        self.generation = 0
+        self.started_at: Optional[float] = None
+        self.suspect = False
+
+    @property
+    def alive(self) -> bool:
+        return self.toolset is not None and not self.suspect
+
+
+class MCPToolsetPool:
+    """
+    Keeps `size` MCP server processes running and hands them out one request at a time.
+
+    Servers are spawned by `start()` (wired to the FastAPI lifespan), probed with a
+    `list_tools` round-trip every `probe_interval` seconds while idle, and respawned
+    when a probe fails or a request using them raised.
+    """
+
+    def __init__(
+        self,
+        connection_params: Callable[[], Any] = airbnb_connection_params,
+        size: int = MCP_POOL_SIZE,
+        spawn_timeout: float = MCP_SPAWN_TIMEOUT,
+        probe_interval: float = MCP_PROBE_INTERVAL,
+        probe_timeout: float = MCP_PROBE_TIMEOUT,
+        toolset_factory: Callable[..., Any] = MCPToolset,
+    ):
+        self._connection_params = connection_params
+        self.size = size
+        self._spawn_timeout = spawn_timeout
+        self._probe_interval = probe_interval
+        self._probe_timeout = probe_timeout
+        self._toolset_factory = toolset_factory
+        self._members = [PooledToolset(slot) for slot in range(size)]
+        self._idle: Optional[asyncio.Queue] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._recoveries: set[asyncio.Task] = set()
+        self.respawns = 0
+
+    @property
+    def started(self) -> bool:
+        return self._idle is not None
+
+    async def start(self):
+        """Spawns every server concurrently and starts the liveness monitor."""
+        if self.started or self.size <= 0:
+            return
+        self._idle = asyncio.Queue()
+        await asyncio.gather(*(self._spawn(member) for member in self._members))
+        for member in self._members:
+            self._idle.put_nowait(member)
+        self._monitor_task = asyncio.create_task(self._monitor())
+
+    async def stop(self):
+        """Stops the monitor and closes every server process."""
+        if self._monitor_task is not None:
+            self._monitor_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._monitor_task
+            self._monitor_task = None
+        for task in list(self._recoveries):
+            task.cancel()
+        await asyncio.gather(*self._recoveries, return_exceptions=True)
+        await asyncio.gather(*(self._close(member) for member in self._members))
+        self._idle = None
+
+    @contextlib.asynccontextmanager
+    async def checkout(self, timeout: float = MCP_CHECKOUT_TIMEOUT) -> AsyncIterator[PooledToolset]:
+        """
+        Borrows a healthy server for the duration of the `async with` block.
+
+        At most `size` requests hold a server at once; others wait up to `timeout` seconds.
+        """
+        if not self.started:
+            raise MCPPoolError("MCP pool is not running.")
+        try:
+            member = await asyncio.wait_for(self._idle.get(), timeout)
+        except asyncio.TimeoutError as e:
+            raise MCPPoolError(f"No MCP server became available within {timeout}s.") from e
+
+        try:
+            if not member.alive:
+                await self._spawn(member)
+            if not member.alive:
+                raise MCPPoolError(f"MCP server in slot {member.slot} is unavailable.")
+            yield member
+        except BaseException:
+            member.suspect = True
+            raise
+        finally:
+            if member.suspect:
+                # Probing is done out of band so the failing request is not held up.
+                task = asyncio.create_task(self._recover(member))
+                self._recoveries.add(task)
+                task.add_done_callback(self._recoveries.discard)
+            else:
+                self._idle.put_nowait(member)
+
+    def stats(self) -> dict[str, Any]:
+        """Returns a snapshot of the pool state."""
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize() if self.started else 0,
+            "alive": sum(1 for member in self._members if member.alive),
+            "respawns": self.respawns,
+        }
+
+    def servers(self) -> list[dict[str, Any]]:
+        """Returns the state of the server in each slot."""
+        now = time.monotonic()
+        return [
+            {
+                "slot": member.slot,
+                "alive": member.alive,
+                "generation": member.generation,
+                "uptime": now - member.started_at if member.alive and member.started_at else 0.0,
+            }
+            for member in self._members
+        ]
+
+    async def _spawn(self, member: PooledToolset):
+        await self._close(member)
+        toolset = self._toolset_factory(connection_params=self._connection_params())
+        try:
+            tools = await asyncio.wait_for(toolset.get_tools(), self._spawn_timeout)
+        except Exception:
+            logger.exception("Failed to start MCP server in slot %d", member.slot)
+            with contextlib.suppress(Exception):
+                await toolset.close()
+            return
+        member.toolset = toolset
+        member.tools = tools
+        member.generation += 1
+        member.started_at = time.monotonic()
+        member.suspect = False
+        if member.generation > 1:
+            self.respawns += 1
+        logger.info("MCP server in slot %d ready (generation %d)", member.slot, member.generation)
+
+    async def _close(self, member: PooledToolset):
+        toolset, member.toolset, member.tools = member.toolset, None, []
+        if toolset is not None:
+            with contextlib.suppress(Exception):
+                await toolset.close()
+
+    async def _probe(self, member: PooledToolset) -> bool:
+        if member.toolset is None:
+            return False
+        try:
+            await asyncio.wait_for(member.toolset.get_tools(), self._probe_timeout)
+        except Exception:
+            logger.warning("MCP server in slot %d failed its liveness probe", member.slot)
+            return False
+        return True
+
+    async def _recover(self, member: PooledToolset):
+        try:
+            if await self._probe(member):
+                member.suspect = False
+            else:
+                await self._spawn(member)
+        finally:
+            if self.started:
+                self._idle.put_nowait(member)
+
+    async def _monitor(self):
+        while True:
+            await asyncio.sleep(self._probe_interval)
+            for _ in range(self._idle.qsize()):
+                member = self._idle.get_nowait()
+                if not await self._probe(member):
+                    await self._spawn(member)
+                self._idle.put_nowait(member)
@@ -16,19 +16,27 @@
 
 from datetime import datetime
 import json
+import logging
 import os
-from typing import Dict, Any
+from typing import Any, Dict, Mapping
 
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.sessions.state import State
 from google.adk.tools import ToolContext
 
 from travel_concierge.shared_libraries import constants
+from travel_concierge.shared_libraries.profile_catalog import profile_catalog
+from travel_concierge.shared_libraries.state_fingerprints import add_fingerprints, fingerprint_key, is_fingerprint_key
+
+logger = logging.getLogger(__name__)
 
 SAMPLE_SCENARIO_PATH = os.getenv(
     "TRAVEL_CONCIERGE_SCENARIO", "travel_concierge/profiles/itinerary_empty_default.json"
 )
 
+# Parsed scenario files keyed by path, with the mtime they were parsed at.
+_scenario_cache: Dict[str, tuple[int, Dict[str, Any]]] = {}
+
 
 def memorize_list(key: str, value: str, tool_context: ToolContext):
     """
@@ -46,7 +54,8 @@ def memorize_list(key: str, value: str, tool_context: ToolContext):
     if key not in mem_dict:
         mem_dict[key] = []
     if value not in mem_dict[key]:
-        mem_dict[key].append(value)
+        # Assign a new list instead of appending, the old one may be shared with a profile.
+        mem_dict[key] = [*mem_dict[key], value]
     return {"status": f'Stored "{key}": "{value}"'}
 
 
@@ -82,11 +91,14 @@ def forget(key: str, value: str, tool_context: ToolContext):
     if tool_context.state[key] is None:
         tool_context.state[key] = []
     if value in tool_context.state[key]:
-        tool_context.state[key].remove(value)
+        # Assign a new list instead of removing in place, the old one may be shared with a profile.
+        values = list(tool_context.state[key])
+        values.remove(value)
+        tool_context.state[key] = values
     return {"status": f'Removed "{key}": "{value}"'}
 
 
-def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
+def _set_initial_states(source: Mapping[str, Any], target: State | dict[str, Any]):
     """
     Setting the initial session state given a JSON object of states.
 
@@ -100,7 +112,13 @@ def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
     if constants.ITIN_INITIALIZED not in target:
         target[constants.ITIN_INITIALIZED] = True
 
-        target.update(source)
+        # Keys already present, e.g. layered in from the profile, are left as they are.
+        # Fingerprints are copied along with their value only, never next to another value.
+        copied = {key: value for key, value in source.items() if key not in target and not is_fingerprint_key(key)}
+        for key in list(copied):
+            if fingerprint_key(key) in source:
+                copied[fingerprint_key(key)] = source[fingerprint_key(key)]
+        target.update(copied)
 
         itinerary = source.get(constants.ITIN_KEY, {})
         if itinerary:
@@ -109,18 +127,65 @@ def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
             target[constants.ITIN_DATETIME] = itinerary[constants.START_DATE]
 
 
+def load_scenario(path: str = SAMPLE_SCENARIO_PATH) -> Dict[str, Any]:
+    """
+    Returns the parsed scenario file, parsing it again only if it changed on disk.
+
+    Args:
+        path: The path to the scenario JSON file.
+
+    Returns:
+        The parsed scenario. It is shared between callers and must not be modified.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _scenario_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "r") as file:
+        data = json.load(file)
+    add_fingerprints(data.get("state", {}))
+    _scenario_cache[path] = (mtime, data)
+    logger.debug("Loaded scenario %s", path)
+    return data
+
+
+def preload_scenario(path: str = SAMPLE_SCENARIO_PATH):
+    """Parses the scenario file ahead of the first session, e.g. at startup."""
+    load_scenario(path)
+
+
+def profile_state(state: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    Returns the state a session is seeded from.
+
+    Args:
+        state: The session state.
+
+    Returns:
+        The state of the catalog profile named by the session's `_profile_id`, or
+        of the scenario file when it has none. It is shared and must not be modified.
+    """
+    profile_id = state.get(constants.PROFILE_ID)
+    if profile_id:
+        return profile_catalog.get(profile_id).state
+    return load_scenario(SAMPLE_SCENARIO_PATH)["state"]
+
+
 def _load_precreated_itinerary(callback_context: CallbackContext):
     """
     Sets up the initial state.
     Set this as a callback as before_agent_call of the root_agent.
     This gets called before the system instruction is contructed.
 
+    The session is seeded from the catalog profile named by its `_profile_id`
+    state, or from the scenario file when it has none.
+
     Args:
         callback_context: The callback context.
-    """    
-    data = {}
-    with open(SAMPLE_SCENARIO_PATH, "r") as file:
-        data = json.load(file)
-        print(f"\nLoading Initial State: {data}\n")
+    """
+    if constants.ITIN_INITIALIZED in callback_context.state:
+        return  # Already seeded on an earlier turn of this session.
 
-    _set_initial_states(data["state"], callback_context.state)
+    # Tools replace state values rather than modifying them, so the session can share the profile's values.
+    _set_initial_states(profile_state(callback_context.state), callback_context.state)
@@ -14,16 +14,55 @@
 
 """Wrapper to Google Maps Places API."""
 
+import asyncio
 import os
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 from google.adk.tools import ToolContext
-import requests
+import httpx
+
+from travel_concierge.shared_libraries.http_client import CircuitBreaker, ResilientHttpClient
+from travel_concierge.tools.geocode_cache import NOT_FOUND, GeocodeCache
+
+# Where the Places API is served; point it at travel_concierge.tools.fake_places to work offline
+PLACES_BASE_URL = os.getenv("PLACES_BASE_URL", "https://maps.googleapis.com/maps/api/place").rstrip("/")
+
+# Lookups map_tool runs at once, and how long each may take; keep the timeout
+# below gunicorn's worker timeout (30s), it cuts short retries running past it
+PLACES_CONCURRENCY = int(os.getenv("PLACES_CONCURRENCY", "8"))
+PLACES_LOOKUP_TIMEOUT = float(os.getenv("PLACES_LOOKUP_TIMEOUT", "20"))
+
+# Timeouts and retries of each Places API request, and when to stop sending them
+PLACES_CONNECT_TIMEOUT = float(os.getenv("PLACES_CONNECT_TIMEOUT", "3"))
+PLACES_READ_TIMEOUT = float(os.getenv("PLACES_READ_TIMEOUT", "5"))
+PLACES_MAX_RETRIES = int(os.getenv("PLACES_MAX_RETRIES", "2"))
+PLACES_BREAKER_THRESHOLD = int(os.getenv("PLACES_BREAKER_THRESHOLD", "5"))
+PLACES_BREAKER_RESET = float(os.getenv("PLACES_BREAKER_RESET", "30"))
+
+
+def places_http_client() -> ResilientHttpClient:
+    """Returns a pooled client configured for the Places API."""
+    return ResilientHttpClient(
+        connect_timeout=PLACES_CONNECT_TIMEOUT,
+        read_timeout=PLACES_READ_TIMEOUT,
+        max_retries=PLACES_MAX_RETRIES,
+        breaker=CircuitBreaker(PLACES_BREAKER_THRESHOLD, PLACES_BREAKER_RESET),
+    )
 
 
 class PlacesService:
     """Wrapper to Placees API."""
 
+    def __init__(
+        self,
+        cache: Optional[GeocodeCache] = None,
+        http: Optional[ResilientHttpClient] = None,
+        base_url: str = PLACES_BASE_URL,
+    ):
+        self.cache = cache
+        self.http = http or places_http_client()
+        self.base_url = base_url.rstrip("/")
+
     def _check_key(self):
         if (
             not hasattr(self, "places_api_key") or not self.places_api_key
@@ -32,53 +71,137 @@ class PlacesService:
             self.places_api_key = os.getenv("GOOGLE_PLACES_API_KEY")
 
     def find_place_from_text(self, query: str) -> Dict[str, str]:
-        """Fetches place details using a text query."""
+        """Fetches place details using a text query, from the cache if it has them."""
+        if self.cache is not None:
+            cached = self.cache.get(query, namespace=self.base_url)
+            if cached is not None:
+                return self._with_photos(cached)
+
+        result = self._fetch_place(query)
+        if self.cache is not None:
+            self.cache.put(query, result, namespace=self.base_url)
+        return self._with_photos(result)
+
+    async def find_place_from_text_async(self, query: str) -> Dict[str, str]:
+        """Like find_place_from_text, without blocking the event loop on the Places API or the cache file."""
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, query, namespace=self.base_url)
+            if cached is not None:
+                return self._with_photos(cached)
+
+        result = await self._fetch_place_async(query)
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.put, query, result, namespace=self.base_url)
+        return self._with_photos(result)
+
+    async def find_places_from_text(
+        self,
+        queries: List[str],
+        concurrency: int = PLACES_CONCURRENCY,
+        timeout: Optional[float] = PLACES_LOOKUP_TIMEOUT,
+    ) -> List[Dict[str, str]]:
+        """
+        Fetches place details for several text queries concurrently.
+
+        At most `concurrency` lookups run at once, and each is given `timeout`
+        seconds, or the HTTP client's retry budget if it is None. A lookup that
+        fails or times out gets an error result, while the others keep theirs.
+        Repeated queries are looked up once.
+        """
+        if timeout is None:
+            timeout = self.http.retry_budget()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def lookup(query: str) -> Dict[str, str]:
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(self.find_place_from_text_async(query), timeout)
+                except asyncio.TimeoutError:
+                    return {"error": f"Timed out fetching place data after {timeout:g}s"}
+                except Exception as e:
+                    return {"error": f"Error fetching place data: {e}"}
+
+        unique = list(dict.fromkeys(queries))
+        results = dict(zip(unique, await asyncio.gather(*(lookup(query) for query in unique))))
+        return [results[query] for query in queries]
+
+    def _params(self, query: str) -> Dict[str, str]:
         self._check_key()
-        places_url = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
-        params = {
+        return {
             "input": query,
             "inputtype": "textquery",
             "fields": "place_id,formatted_address,name,photos,geometry",
             "key": self.places_api_key,
         }
 
+    def _fetch_place(self, query: str) -> Dict[str, str]:
+        """Fetches place details from the Places API."""
+        try:
+            response = self.http.get(f"{self.base_url}/findplacefromtext/json", params=self._params(query))
+            return self._parse_place(response.json())
+        except httpx.HTTPError as e:
+            return {"error": f"Error fetching place data: {e}"}
+
+    async def _fetch_place_async(self, query: str) -> Dict[str, str]:
+        """Fetches place details from the Places API without blocking the event loop."""
         try:
-            response = requests.get(places_url, params=params)
-            response.raise_for_status()
-            place_data = response.json()
-
-            if not place_data.get("candidates"):
-                return {"error": "No places found."}
-
-            # Extract data for the first candidate
-            place_details = place_data["candidates"][0]
-            place_id = place_details["place_id"]
-            place_name = place_details["name"]
-            place_address = place_details["formatted_address"]
-            photos = self.get_photo_urls(place_details.get("photos", []), maxwidth=400)
-            map_url = self.get_map_url(place_id)
-            location = place_details["geometry"]["location"]
-            lat = str(location["lat"])
-            lng = str(location["lng"])
-
-            return {
-                "place_id": place_id,
-                "place_name": place_name,
-                "place_address": place_address,
-                "photos": photos,
-                "map_url": map_url,
-                "lat": lat,
-                "lng": lng,
-            }
-
-        except requests.exceptions.RequestException as e:
+            response = await self.http.aget(f"{self.base_url}/findplacefromtext/json", params=self._params(query))
+            return self._parse_place(response.json())
+        except httpx.HTTPError as e:
             return {"error": f"Error fetching place data: {e}"}
 
+    def _parse_place(self, place_data: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Extracts the details of the first candidate from a findplacefromtext response.
+
+        Only a ZERO_RESULTS answer means "No places found." and may be cached;
+        other statuses without candidates, such as OVER_QUERY_LIMIT or
+        REQUEST_DENIED, are returned as errors, which are never cached.
+        """
+        status = place_data.get("status")
+        if status == "ZERO_RESULTS":
+            return dict(NOT_FOUND)
+        if not place_data.get("candidates"):
+            message = place_data.get("error_message")
+            return {"error": f"Places API status {status}" + (f": {message}" if message else "")}
+
+        # Extract data for the first candidate
+        place_details = place_data["candidates"][0]
+        place_id = place_details["place_id"]
+        place_name = place_details["name"]
+        place_address = place_details["formatted_address"]
+        # Only the references are kept, the API key is added to the photo URLs as they are returned.
+        photo_references = [photo["photo_reference"] for photo in place_details.get("photos", [])]
+        map_url = self.get_map_url(place_id)
+        location = place_details["geometry"]["location"]
+        lat = str(location["lat"])
+        lng = str(location["lng"])
+
+        return {
+            "place_id": place_id,
+            "place_name": place_name,
+            "place_address": place_address,
+            "photo_references": photo_references,
+            "map_url": map_url,
+            "lat": lat,
+            "lng": lng,
+        }
+
+    def _with_photos(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Replaces the photo references of a parsed or cached place with their photo URLs."""
+        if "photo_references" not in result:
+            return result
+        self._check_key()
+        result = dict(result)
+        references = result.pop("photo_references")
+        result["photos"] = self.get_photo_urls([{"photo_reference": ref} for ref in references], maxwidth=400)
+        return result
+
     def get_photo_urls(self, photos: List[Dict[str, Any]], maxwidth: int = 400) -> List[str]:
         """Extracts photo URLs from the 'photos' list."""
         photo_urls = []
         for photo in photos:
-            photo_url = f"https://maps.googleapis.com/maps/api/place/photo?maxwidth={maxwidth}&photoreference={photo['photo_reference']}&key={self.places_api_key}"
+            photo_url = f"{self.base_url}/photo?maxwidth={maxwidth}&photoreference={photo['photo_reference']}&key={self.places_api_key}"
             photo_urls.append(photo_url)
         return photo_urls
 
@@ -87,14 +210,14 @@ class PlacesService:
         return f"https://www.google.com/maps/place/?q=place_id:{place_id}"
 
 
-# Google Places API
-places_service = PlacesService()
+# Google Places API, with lookups cached across calls (and workers, if GEOCODE_CACHE_PATH is set)
+places_service = PlacesService(cache=GeocodeCache())
 
 
-def map_tool(key: str, tool_context: ToolContext):
+async def map_tool(key: str, tool_context: ToolContext):
     """
     This is going to inspect the pois stored under the specified key in the state.
-    One by one it will retrieve the accurate Lat/Lon from the Map API, if the Map API is available for use.
+    It will retrieve the accurate Lat/Lon of all of them at once from the Map API, if the Map API is available for use.
 
     Args:
         key: The key under which the POIs are stored.
@@ -103,22 +226,25 @@ def map_tool(key: str, tool_context: ToolContext):
     Returns:
         The updated state with the full JSON object under the key.
     """
-    if key not in tool_context.state:
-        tool_context.state[key] = {}
-
     # The pydantic object types.POISuggestions
-    if "places" not in tool_context.state[key]:
-        tool_context.state[key]["places"] = []
-
-    pois = tool_context.state[key]["places"]
-    for poi in pois:  # The pydantic object types.POI
-        location = poi["place_name"] + ", " + poi["address"]
-        result = places_service.find_place_from_text(location)
+    suggestions = tool_context.state[key] if key in tool_context.state else {}
+
+    # Work on copies and store them back, the old values may be shared with a profile.
+    pois = [dict(poi) for poi in suggestions.get("places", [])]
+    results = await places_service.find_places_from_text(
+        [poi["place_name"] + ", " + poi["address"] for poi in pois]
+    )
+    for poi, result in zip(pois, results):  # The pydantic object types.POI
+        if "place_id" not in result:
+            # Keep what an earlier lookup found, if anything.
+            poi.setdefault("place_id", None)
+            poi.setdefault("map_url", None)
+            continue
         # Fill the place holders with verified information.
-        poi["place_id"] = result["place_id"] if "place_id" in result else None
-        poi["map_url"] = result["map_url"] if "map_url" in result else None
-        if "lat" in result and "lng" in result:
-            poi["lat"] = result["lat"]
-            poi["long"] = result["lng"]
+        poi["place_id"] = result["place_id"]
+        poi["map_url"] = result["map_url"]
+        poi["lat"] = result["lat"]
+        poi["long"] = result["lng"]
+    tool_context.state[key] = {**suggestions, "places": pois}
 
     return {"places": pois}  # Return the updated pois
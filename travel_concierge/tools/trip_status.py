@@ -0,0 +1,179 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Flight, event and weather status providers, behind a cache shared by the trip monitor checks.
+
+A provider answers for one entity on one date: a flight number, an event or
+a location. See fake_status for a local stand-in with configurable latency
+and faults.
+"""
+
+import asyncio
+import collections
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Protocol
+
+from travel_concierge.shared_libraries import metrics
+
+# How long answers are reused, and how many are kept, per worker
+STATUS_CACHE_TTL = float(os.getenv("STATUS_CACHE_TTL", "300"))
+STATUS_CACHE_SIZE = int(os.getenv("STATUS_CACHE_SIZE", "10000"))
+# How long a provider may take to answer
+STATUS_LOOKUP_TIMEOUT = float(os.getenv("STATUS_LOOKUP_TIMEOUT", "10"))
+
+StatusKey = tuple[str, str, str]
+
+status_lookups = metrics.counter(
+    "travel_concierge_status_lookups_total",
+    "Status lookups, by kind and by whether they were cached (hit), joined one in progress (coalesced), "
+    "asked the provider (miss) or failed (error).",
+    ["kind", "result"],
+)
+status_provider_duration = metrics.histogram(
+    "travel_concierge_status_provider_seconds",
+    "Time the status provider takes to answer, by kind.",
+    ["kind"],
+)
+
+
+class StatusProviderError(RuntimeError):
+    """Raised when a provider cannot answer."""
+
+
+class StatusProvider(Protocol):
+    async def flight_status(self, flight_number: str, flight_date: str) -> Dict[str, Any]:
+        """Returns {"state": "on time" | "delayed" | "cancelled", "delay_minutes": int}."""
+        ...
+
+    async def event_status(self, event_name: str, event_date: str, event_location: str) -> Dict[str, Any]:
+        """Returns {"state": "open" | "closed"}."""
+        ...
+
+    async def weather_forecast(self, location: str, date: str) -> Dict[str, Any]:
+        """Returns {"forecast": str, "outdoor_ok": bool}."""
+        ...
+
+
+def _entity_key(value: str) -> str:
+    return " ".join(value.casefold().split())
+
+
+class CachingStatusProvider:
+    """
+    Wraps a StatusProvider, reusing its answers by (kind, entity, date).
+
+    Answers are kept for `ttl` seconds, up to `max_entries` of them; failures
+    are never kept. Identical lookups made while one is in progress wait for
+    it instead of asking the provider again, e.g. the same flight checked for
+    every session of a trip. Each lookup is given `timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        provider: StatusProvider,
+        ttl: float = STATUS_CACHE_TTL,
+        max_entries: int = STATUS_CACHE_SIZE,
+        timeout: float = STATUS_LOOKUP_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.provider = provider
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._clock = clock
+        self._entries: collections.OrderedDict[StatusKey, tuple[float, Dict[str, Any]]] = collections.OrderedDict()
+        self._in_flight: Dict[StatusKey, asyncio.Task] = {}
+
+    async def flight_status(self, flight_number: str, flight_date: str) -> Dict[str, Any]:
+        return await self._lookup(
+            ("flight", _entity_key(flight_number), flight_date),
+            lambda: self.provider.flight_status(flight_number, flight_date),
+        )
+
+    async def event_status(self, event_name: str, event_date: str, event_location: str) -> Dict[str, Any]:
+        return await self._lookup(
+            ("event", _entity_key(f"{event_name} @ {event_location}"), event_date),
+            lambda: self.provider.event_status(event_name, event_date, event_location),
+        )
+
+    async def weather_forecast(self, location: str, date: str) -> Dict[str, Any]:
+        return await self._lookup(
+            ("weather", _entity_key(location), date),
+            lambda: self.provider.weather_forecast(location, date),
+        )
+
+    def cache_clear(self):
+        self._entries.clear()
+
+    def _cached(self, key: StatusKey) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _remember(self, key: StatusKey, answer: Dict[str, Any]):
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (self._clock() + self.ttl, answer)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries > 0:
+            self._entries.popitem(last=False)
+
+    async def _lookup(self, key: StatusKey, ask: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        kind = key[0]
+        cached = self._cached(key)
+        if cached is not None:
+            status_lookups.labels(kind=kind, result="hit").inc()
+            return dict(cached)
+
+        task = self._in_flight.get(key)
+        # A task of another event loop, e.g. a finished test's, cannot be awaited here.
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            status_lookups.labels(kind=kind, result="coalesced").inc()
+        else:
+            task = asyncio.ensure_future(self._ask(key, ask))
+            self._in_flight[key] = task
+
+            def forget(done: asyncio.Task):
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+                if not done.cancelled():
+                    done.exception()  # Retrieved, even if every caller gave up on it.
+
+            task.add_done_callback(forget)
+        # Shielded, so a caller giving up does not cancel the lookup for the others.
+        return dict(await asyncio.shield(task))
+
+    async def _ask(self, key: StatusKey, ask: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        kind = key[0]
+        started = time.perf_counter()
+        try:
+            answer = await asyncio.wait_for(ask(), self.timeout)
+        except asyncio.TimeoutError as e:
+            status_lookups.labels(kind=kind, result="error").inc()
+            raise StatusProviderError(f"No {kind} status for {key[1]} within {self.timeout}s") from e
+        except Exception:
+            status_lookups.labels(kind=kind, result="error").inc()
+            raise
+        finally:
+            status_provider_duration.labels(kind=kind).observe(time.perf_counter() - started)
+        status_lookups.labels(kind=kind, result="miss").inc()
+        self._remember(key, answer)
+        return answer